@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.services.clustering import (
     run_clustering,
     get_clustering_points,
@@ -71,7 +71,7 @@ async def run_clustering_get(
 
 @router.get("/points", response_model=List[ClusterPoint])
 async def get_points(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     group: Optional[str] = Query(None, description="Filter by group"),
 ):
     """Get 2D clustering points for visualization."""
@@ -80,6 +80,6 @@ async def get_points(
 
 
 @router.get("/summary")
-async def get_summary(db: Session = Depends(get_db)):
+async def get_summary(db: Session = Depends(get_read_db)):
     """Get summary of current clustering state."""
     return get_cluster_summary(db)
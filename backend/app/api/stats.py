@@ -1,16 +1,25 @@
 """Statistics API endpoints."""
 
 from typing import Optional, List, Dict, Any
-from collections import defaultdict
 
-from fastapi import APIRouter, Depends, Query
+import numpy as np
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from pydantic import BaseModel
 
-from app.core.db import get_db
-from app.core.config import settings, PANEL_CHANNELS
+from app.core.db import get_read_db
+from app.core.config import settings
+from app.models.features import resolve_feature_value
 from app.models.thumbnail import Thumbnail
+from app.services.cache import cached_endpoint
+from app.services.feature_store import get_feature_snapshot
+from app.services.likeness import (
+    THUMBNAIL_CRITERIA_NAMES,
+    derive_feature_weights,
+    score_thumbnails,
+)
+from app.utils.math import group_positions
 
 
 router = APIRouter()
@@ -45,7 +54,8 @@ class CompareResponse(BaseModel):
 
 
 @router.get("/overview", response_model=OverviewResponse)
-async def get_overview(db: Session = Depends(get_db)):
+@cached_endpoint("overview")
+async def get_overview(request: Request, db: Session = Depends(get_read_db)):
     """Get overview statistics of the dataset."""
     total = db.query(Thumbnail).count()
 
@@ -85,47 +95,47 @@ async def get_overview(db: Session = Depends(get_db)):
 
 def _resolve_feature_value(features: dict, feature_path: str):
     """Resolve a dotted feature path like 'face.emotion_proxies.smile_score'."""
-    parts = feature_path.split(".")
-    if len(parts) < 2:
-        return None
-    category = parts[0]
-    if category not in features:
-        return None
-    value = features[category]
-    for part in parts[1:]:
-        if isinstance(value, dict) and part in value:
-            value = value[part]
-        else:
-            return None
-    if isinstance(value, bool):
-        return 1.0 if value else 0.0
-    if isinstance(value, (int, float)):
-        return float(value)
-    return None
+    return resolve_feature_value(features, feature_path)
+
+
+def _feature_values(
+    db: Session, feature_path: str, group: Optional[str] = None
+) -> List[float]:
+    """
+    Collect one feature's values for processed thumbnails.
+
+    Reads the columnar feature store when the path is materialized there
+    and only falls back to parsing features_json for other paths.
+    """
+    snapshot = get_feature_snapshot(db)
+    if snapshot.has_feature(feature_path):
+        values = snapshot.column(feature_path)[snapshot.mask(group=group)]
+        return values[~np.isnan(values)].tolist()
+
+    query = db.query(Thumbnail).filter(Thumbnail.features_extracted == True)
+    if group:
+        query = query.filter(Thumbnail.group == group)
+
+    values = []
+    for thumb in query.all():
+        value = _resolve_feature_value(thumb.get_features(), feature_path)
+        if value is not None:
+            values.append(value)
+    return values
 
 
 @router.get("/distributions")
+@cached_endpoint("distributions")
 async def get_distribution(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     feature: str = Query(..., description="Feature path (e.g., 'color.avg_saturation')"),
     group: Optional[str] = Query(None, description="Filter by group"),
     bins: int = Query(20, ge=5, le=100, description="Number of histogram bins"),
 ):
     """Get distribution of a specific feature."""
-    # Query thumbnails
-    query = db.query(Thumbnail).filter(Thumbnail.features_extracted == True)
-    if group:
-        query = query.filter(Thumbnail.group == group)
-
-    thumbnails = query.all()
-
     # Extract feature values
-    values = []
-    for thumb in thumbnails:
-        features = thumb.get_features()
-        value = _resolve_feature_value(features, feature)
-        if value is not None:
-            values.append(value)
+    values = _feature_values(db, feature, group)
 
     if not values:
         return {
@@ -137,8 +147,6 @@ async def get_distribution(
         }
 
     # Calculate histogram
-    import numpy as np
-
     values_np = np.array(values)
     hist, bin_edges = np.histogram(values_np, bins=bins)
 
@@ -172,28 +180,18 @@ async def get_distribution(
 
 
 @router.get("/compare")
+@cached_endpoint("compare")
 async def compare_groups(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     feature: str = Query(..., description="Feature path (e.g., 'color.avg_saturation')"),
 ):
     """Compare a feature across all groups."""
-    import numpy as np
-
     # Get values per group
     groups_data = {}
 
     for group in settings.VALID_GROUPS:
-        thumbnails = db.query(Thumbnail).filter(
-            Thumbnail.group == group,
-            Thumbnail.features_extracted == True,
-        ).all()
-
-        values = []
-        for thumb in thumbnails:
-            features = thumb.get_features()
-            value = _resolve_feature_value(features, feature)
-            if value is not None:
-                values.append(value)
+        values = _feature_values(db, feature, group)
 
         if values:
             values_np = np.array(values)
@@ -221,58 +219,11 @@ async def compare_groups(
     }
 
 
-def _compute_likeness_score(f: dict) -> int:
-    """Compute 0-8 MrBeast-likeness score from extracted features."""
-    score = 0
-    if f.get("color", {}).get("avg_brightness", 0) >= 0.60:
-        score += 1
-    if f.get("face", {}).get("face_count", 0) >= 1:
-        score += 1
-    if f.get("text", {}).get("text_area_ratio", 1) <= 0.005:
-        score += 1
-    if f.get("face", {}).get("emotion_proxies", {}).get("smile_score", 0) >= 0.40:
-        score += 1
-    if f.get("face", {}).get("emotion_proxies", {}).get("mouth_open_score", 0) >= 0.15:
-        score += 1
-    if f.get("pose", {}).get("body_coverage", 0) >= 0.30:
-        score += 1
-    if f.get("face", {}).get("emotion_proxies", {}).get("brow_raise_score", 0) >= 0.30:
-        score += 1
-    if f.get("face", {}).get("largest_face_area_ratio", 0) >= 0.06:
-        score += 1
-    return score
-
-
-def _compute_title_likeness_score(f: dict) -> int:
-    """Compute 0-9 MrBeast title-likeness score from extracted features."""
-    title = f.get("title", {})
-    if not title:
-        return 0
-    score = 0
-    if title.get("word_count", 99) <= 8:
-        score += 1
-    if title.get("char_count", 999) <= 50:
-        score += 1
-    if title.get("has_number", False):
-        score += 1
-    if title.get("has_large_number", False):
-        score += 1
-    if title.get("has_money_reference", False):
-        score += 1
-    if title.get("first_person", False):
-        score += 1
-    if title.get("has_superlative", False):
-        score += 1
-    if title.get("has_challenge_framing", False):
-        score += 1
-    if title.get("avg_word_length", 99) <= 5.0:
-        score += 1
-    return score
-
-
 @router.get("/mrbeast-likeness")
+@cached_endpoint("mrbeast-likeness")
 async def mrbeast_likeness(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
 ):
     """Compute per-group MrBeast-likeness scores using trait thresholds.
@@ -287,26 +238,14 @@ async def mrbeast_likeness(
       +1 brow_raise_score >= 0.30
       +1 largest_face_area_ratio >= 0.06
     """
-    import numpy as np
-
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
-
-    groups_data = defaultdict(list)
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        score = _compute_likeness_score(f)
-        groups_data[thumb.group].append(score)
+    snapshot = get_feature_snapshot(db)
+    scores = score_thumbnails(snapshot, snapshot.mask(panel_only=panel_only))
 
     result = {}
-    for group, scores in groups_data.items():
-        arr = np.array(scores)
+    for group, rows in group_positions(scores.groups).items():
+        arr = scores.thumbnail[rows]
         result[group] = {
-            "count": len(scores),
+            "count": len(arr),
             "mean_score": round(float(np.mean(arr)), 3),
             "median_score": float(np.median(arr)),
             "pct_4plus": round(float(np.mean(arr >= 4) * 100), 1),
@@ -315,7 +254,7 @@ async def mrbeast_likeness(
             "pct_7plus": round(float(np.mean(arr >= 7) * 100), 1),
             "pct_8": round(float(np.mean(arr >= 8) * 100), 1),
             "score_distribution": {
-                str(i): int(np.sum(arr == i)) for i in range(9)
+                str(i): int(count) for i, count in enumerate(np.bincount(arr, minlength=9)[:9])
             },
         }
 
@@ -336,8 +275,10 @@ async def mrbeast_likeness(
 
 
 @router.get("/channel-evolution")
+@cached_endpoint("channel-evolution")
 async def channel_evolution(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     min_years: int = Query(2, ge=2, description="Minimum number of year groups a channel must appear in"),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
 ):
@@ -346,45 +287,31 @@ async def channel_evolution(
     Returns per-channel, per-year likeness scores for channels that span
     multiple year groups.
     """
-    import numpy as np
-
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True,
-        Thumbnail.channel != None,
-        Thumbnail.channel != "",
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
-
-    # group by channel -> year -> (thumbnail_scores, title_scores)
-    channel_year_scores: Dict[str, Dict[str, List]] = defaultdict(lambda: defaultdict(list))
-    channel_year_title_scores: Dict[str, Dict[str, List]] = defaultdict(lambda: defaultdict(list))
-
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        score = _compute_likeness_score(f)
-        title_score = _compute_title_likeness_score(f)
-        channel_year_scores[thumb.channel][thumb.group].append(score)
-        channel_year_title_scores[thumb.channel][thumb.group].append(title_score)
+    snapshot = get_feature_snapshot(db)
+    mask = snapshot.mask(panel_only=panel_only)
+    mask &= np.array([bool(ch) for ch in snapshot.channels], dtype=bool)
+    scores = score_thumbnails(snapshot, mask)
 
     # Filter to channels with enough year groups (exclude mrbeast group)
     channels = {}
-    for ch, year_data in channel_year_scores.items():
-        year_groups = {y: scores for y, scores in year_data.items() if y != "mrbeast"}
-        if len(year_groups) >= min_years:
+    for ch, ch_rows in group_positions(scores.channels).items():
+        year_rows = {
+            y: ch_rows[rows]
+            for y, rows in group_positions(scores.groups[ch_rows]).items()
+            if y != "mrbeast"
+        }
+        if len(year_rows) >= min_years:
             years_summary = {}
-            for y, scores in sorted(year_groups.items()):
-                arr = np.array(scores)
-                title_arr = np.array(channel_year_title_scores[ch][y])
+            for y, rows in sorted(year_rows.items()):
+                arr = scores.thumbnail[rows]
                 years_summary[y] = {
-                    "count": len(scores),
+                    "count": len(arr),
                     "mean_score": round(float(np.mean(arr)), 3),
                     "pct_4plus": round(float(np.mean(arr >= 4) * 100), 1),
-                    "title_mean_score": round(float(np.mean(title_arr)), 3),
+                    "title_mean_score": round(float(np.mean(scores.title[rows])), 3),
                 }
             channels[ch] = {
-                "num_years": len(year_groups),
+                "num_years": len(year_rows),
                 "years": years_summary,
             }
 
@@ -439,8 +366,10 @@ async def channel_evolution(
 
 
 @router.get("/title-likeness")
+@cached_endpoint("title-likeness")
 async def title_likeness(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
 ):
     """Compute per-group MrBeast title-likeness scores using trait thresholds.
@@ -456,26 +385,14 @@ async def title_likeness(
       +1 has_challenge_framing
       +1 avg_word_length <= 5.0
     """
-    import numpy as np
-
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
-
-    groups_data = defaultdict(list)
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        score = _compute_title_likeness_score(f)
-        groups_data[thumb.group].append(score)
+    snapshot = get_feature_snapshot(db)
+    scores = score_thumbnails(snapshot, snapshot.mask(panel_only=panel_only))
 
     result = {}
-    for group, scores in groups_data.items():
-        arr = np.array(scores)
+    for group, rows in group_positions(scores.groups).items():
+        arr = scores.title[rows]
         result[group] = {
-            "count": len(scores),
+            "count": len(arr),
             "mean_score": round(float(np.mean(arr)), 3),
             "median_score": float(np.median(arr)),
             "pct_4plus": round(float(np.mean(arr >= 4) * 100), 1),
@@ -484,7 +401,7 @@ async def title_likeness(
             "pct_7plus": round(float(np.mean(arr >= 7) * 100), 1),
             "pct_8": round(float(np.mean(arr >= 8) * 100), 1),
             "score_distribution": {
-                str(i): int(np.sum(arr == i)) for i in range(10)
+                str(i): int(count) for i, count in enumerate(np.bincount(arr, minlength=10)[:10])
             },
         }
 
@@ -506,44 +423,26 @@ async def title_likeness(
 
 
 @router.get("/combined-likeness")
+@cached_endpoint("combined-likeness")
 async def combined_likeness(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
 ):
     """Compute per-group combined thumbnail + title likeness scores.
 
     Returns thumbnail (0-8), title (0-9), and combined (0-17) scores.
     """
-    import numpy as np
-
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
-
-    groups_data: Dict[str, Dict[str, list]] = defaultdict(lambda: {
-        "thumbnail": [], "title": [], "combined": []
-    })
-
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        t_score = _compute_likeness_score(f)
-        ti_score = _compute_title_likeness_score(f)
-        groups_data[thumb.group]["thumbnail"].append(t_score)
-        groups_data[thumb.group]["title"].append(ti_score)
-        groups_data[thumb.group]["combined"].append(t_score + ti_score)
+    snapshot = get_feature_snapshot(db)
+    scores = score_thumbnails(snapshot, snapshot.mask(panel_only=panel_only))
 
     result = {}
-    for group, scores in groups_data.items():
-        t_arr = np.array(scores["thumbnail"])
-        ti_arr = np.array(scores["title"])
-        c_arr = np.array(scores["combined"])
+    for group, rows in group_positions(scores.groups).items():
+        c_arr = scores.combined[rows]
         result[group] = {
-            "count": len(scores["thumbnail"]),
-            "thumbnail_mean": round(float(np.mean(t_arr)), 3),
-            "title_mean": round(float(np.mean(ti_arr)), 3),
+            "count": len(rows),
+            "thumbnail_mean": round(float(np.mean(scores.thumbnail[rows])), 3),
+            "title_mean": round(float(np.mean(scores.title[rows])), 3),
             "combined_mean": round(float(np.mean(c_arr)), 3),
             "combined_median": float(np.median(c_arr)),
             "combined_pct_8plus": round(float(np.mean(c_arr >= 8) * 100), 1),
@@ -558,8 +457,10 @@ async def combined_likeness(
 
 
 @router.get("/mrbeast-similarity")
+@cached_endpoint("mrbeast-similarity")
 async def mrbeast_similarity(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
 ):
     """Compute continuous 0-100 MrBeast similarity score per thumbnail.
@@ -567,96 +468,64 @@ async def mrbeast_similarity(
     Uses z-score distance from MrBeast centroid across the 10 most
     discriminative features, converted to a percentage via exponential decay.
     """
-    import numpy as np
-
-    # 10 most discriminative features and their extraction paths
+    # 10 most discriminative features and their feature paths
     FEATURE_DEFS = [
-        ("avg_brightness",         ("color", "avg_brightness")),
-        ("face_count",             ("face", "face_count")),
-        ("largest_face_area_ratio",("face", "largest_face_area_ratio")),
-        ("smile_score",            ("face", "emotion_proxies", "smile_score")),
-        ("mouth_open_score",       ("face", "emotion_proxies", "mouth_open_score")),
-        ("brow_raise_score",       ("face", "emotion_proxies", "brow_raise_score")),
-        ("body_coverage",          ("pose", "body_coverage")),
-        ("text_box_count",         ("text", "text_box_count")),
-        ("text_area_ratio",        ("text", "text_area_ratio")),
-        ("avg_saturation",         ("color", "avg_saturation")),
+        ("avg_brightness",          "color.avg_brightness"),
+        ("face_count",              "face.face_count"),
+        ("largest_face_area_ratio", "face.largest_face_area_ratio"),
+        ("smile_score",             "face.emotion_proxies.smile_score"),
+        ("mouth_open_score",        "face.emotion_proxies.mouth_open_score"),
+        ("brow_raise_score",        "face.emotion_proxies.brow_raise_score"),
+        ("body_coverage",           "pose.body_coverage"),
+        ("text_box_count",          "text.text_box_count"),
+        ("text_area_ratio",         "text.text_area_ratio"),
+        ("avg_saturation",          "color.avg_saturation"),
     ]
     FEATURE_NAMES = [name for name, _ in FEATURE_DEFS]
-    NUM_FEATURES = len(FEATURE_NAMES)
 
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
-
-    def _extract_vector(thumb):
-        f = thumb.get_features()
-        values = []
-        for _, path in FEATURE_DEFS:
-            val = f
-            for key in path:
-                if isinstance(val, dict) and key in val:
-                    val = val[key]
-                else:
-                    val = None
-                    break
-            if val is not None and isinstance(val, (int, float)):
-                values.append(float(val))
-            else:
-                values.append(float("nan"))
-        return values
-
-    # Separate MrBeast vs year groups
-    mrbeast_vectors = []
-    group_thumbs: Dict[str, list] = defaultdict(list)
-
-    for thumb in thumbnails:
-        vec = _extract_vector(thumb)
-        group_thumbs[thumb.group].append(vec)
-        if thumb.group == "mrbeast":
-            mrbeast_vectors.append(vec)
-
-    if not mrbeast_vectors:
-        return {"error": "No MrBeast thumbnails found"}
+    snapshot = get_feature_snapshot(db)
+    mask = snapshot.mask(panel_only=panel_only)
+    X = snapshot.matrix([path for _, path in FEATURE_DEFS])[mask]
+    groups = snapshot.groups[mask]
 
     # MrBeast centroid (mean + std per feature)
-    mb_array = np.array(mrbeast_vectors, dtype=float)
-    mb_mean = np.nanmean(mb_array, axis=0)
-    mb_std = np.nanstd(mb_array, axis=0)
+    mb_array = X[groups == "mrbeast"]
+    if len(mb_array) == 0:
+        return {"error": "No MrBeast thumbnails found"}
+
+    with np.errstate(invalid="ignore"):
+        mb_mean = np.nanmean(mb_array, axis=0)
+        mb_std = np.nanstd(mb_array, axis=0)
     mb_std = np.where(mb_std < 1e-6, 1e-6, mb_std)  # avoid /0
 
-    def _similarity(vec):
-        arr = np.array(vec, dtype=float)
-        z = np.abs((arr - mb_mean) / mb_std)
-        valid = ~np.isnan(z)
-        if not np.any(valid):
-            return None
-        avg_z = float(np.mean(z[valid]))
-        return round(100.0 * float(np.exp(-avg_z / 2)), 1)
+    # Per-thumbnail similarity: mean |z| over the features that are present
+    z = np.abs((X - mb_mean) / mb_std)
+    valid = ~np.isnan(z)
+    valid_count = valid.sum(axis=1)
+    avg_z = np.where(valid, z, 0.0).sum(axis=1) / np.maximum(valid_count, 1)
+    similarity = np.round(100.0 * np.exp(-avg_z / 2), 1)
+    has_score = valid_count > 0
 
     # Per-group similarity stats
     groups_result = {}
-    for group, vecs in group_thumbs.items():
-        scores = [s for s in (_similarity(v) for v in vecs) if s is not None]
-        if scores:
-            arr = np.array(scores)
+    feature_trends: Dict[str, Dict[str, float]] = {fname: {} for fname in FEATURE_NAMES}
+    for group in dict.fromkeys(groups.tolist()):
+        in_group = groups == group
+        arr = similarity[in_group & has_score]
+        if len(arr):
             groups_result[group] = {
-                "count": len(scores),
+                "count": len(arr),
                 "mean_similarity": round(float(np.mean(arr)), 1),
                 "median_similarity": round(float(np.median(arr)), 1),
                 "std_similarity": round(float(np.std(arr)), 1),
             }
 
-    # Per-feature means by group
-    feature_trends: Dict[str, Dict[str, float]] = {}
-    for i, fname in enumerate(FEATURE_NAMES):
-        feature_trends[fname] = {}
-        for group, vecs in group_thumbs.items():
-            vals = [v[i] for v in vecs if not np.isnan(v[i])]
-            if vals:
+        # Per-feature means by group
+        group_X = X[in_group]
+        for i, fname in enumerate(FEATURE_NAMES):
+            vals = group_X[:, i]
+            vals = vals[~np.isnan(vals)]
+            if len(vals):
                 feature_trends[fname][group] = round(float(np.mean(vals)), 4)
 
     return {
@@ -671,12 +540,13 @@ async def mrbeast_similarity(
 
 
 @router.get("/correlations")
+@cached_endpoint("correlations")
 async def get_correlations(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     target: str = Query("views", description="Target variable (views or ctr)"),
 ):
     """Get correlation between features and target variable (views/CTR)."""
-    import numpy as np
     from scipy import stats as scipy_stats
 
     # Define features to correlate
@@ -694,52 +564,34 @@ async def get_correlations(
     ]
 
     # Get thumbnails with target variable
-    query = db.query(Thumbnail).filter(Thumbnail.features_extracted == True)
-
-    if target == "views":
-        query = query.filter(Thumbnail.views != None)
-    elif target == "ctr":
-        query = query.filter(Thumbnail.ctr != None)
-    else:
+    if target not in ("views", "ctr"):
         return {"error": "Target must be 'views' or 'ctr'"}
 
-    thumbnails = query.all()
+    snapshot = get_feature_snapshot(db)
+    target_all = snapshot.views if target == "views" else snapshot.ctr
+    mask = snapshot.mask() & ~np.isnan(target_all)
+    total_samples = int(mask.sum())
 
-    if len(thumbnails) < 10:
+    if total_samples < 10:
         return {
             "error": "Not enough data points for correlation",
-            "count": len(thumbnails),
+            "count": total_samples,
         }
 
     # Build data arrays
     correlations = []
 
-    target_values = []
-    for thumb in thumbnails:
-        if target == "views":
-            target_values.append(float(thumb.views))
-        else:
-            target_values.append(float(thumb.ctr))
-
-    target_np = np.array(target_values)
+    target_np = target_all[mask]
 
     for category, feature_name in feature_paths:
-        feature_values = []
-        valid_indices = []
-
-        for i, thumb in enumerate(thumbnails):
-            features = thumb.get_features()
-            if category in features and feature_name in features[category]:
-                value = features[category][feature_name]
-                if isinstance(value, (int, float)):
-                    feature_values.append(float(value))
-                    valid_indices.append(i)
-
-        if len(feature_values) < 10:
+        column = snapshot.column(f"{category}.{feature_name}")[mask]
+        valid = ~np.isnan(column)
+
+        if int(valid.sum()) < 10:
             continue
 
-        feature_np = np.array(feature_values)
-        target_subset = target_np[valid_indices]
+        feature_np = column[valid]
+        target_subset = target_np[valid]
 
         # Calculate Pearson correlation
         corr, p_value = scipy_stats.pearsonr(feature_np, target_subset)
@@ -748,7 +600,7 @@ async def get_correlations(
             "feature": f"{category}.{feature_name}",
             "correlation": round(corr, 4),
             "p_value": round(p_value, 6),
-            "sample_size": len(feature_values),
+            "sample_size": len(feature_np),
             "significant": p_value < 0.05,
         })
 
@@ -757,125 +609,48 @@ async def get_correlations(
 
     return {
         "target": target,
-        "total_samples": len(thumbnails),
+        "total_samples": total_samples,
         "correlations": correlations,
     }
 
 
-# ──────────────────────────────────────────────────────────────
-# Likeness criteria feature paths for weighted scoring
-# ──────────────────────────────────────────────────────────────
-_LIKENESS_CRITERIA = [
-    ("avg_brightness",          lambda f: f.get("color", {}).get("avg_brightness", 0)),
-    ("face_count",              lambda f: f.get("face", {}).get("face_count", 0)),
-    ("text_area_ratio",         lambda f: f.get("text", {}).get("text_area_ratio", 1)),
-    ("smile_score",             lambda f: f.get("face", {}).get("emotion_proxies", {}).get("smile_score", 0)),
-    ("mouth_open_score",        lambda f: f.get("face", {}).get("emotion_proxies", {}).get("mouth_open_score", 0)),
-    ("body_coverage",           lambda f: f.get("pose", {}).get("body_coverage", 0)),
-    ("brow_raise_score",        lambda f: f.get("face", {}).get("emotion_proxies", {}).get("brow_raise_score", 0)),
-    ("largest_face_area_ratio", lambda f: f.get("face", {}).get("largest_face_area_ratio", 0)),
-]
-
-_LIKENESS_THRESHOLDS = {
-    "avg_brightness": (">=", 0.60),
-    "face_count": (">=", 1),
-    "text_area_ratio": ("<=", 0.005),
-    "smile_score": (">=", 0.40),
-    "mouth_open_score": (">=", 0.15),
-    "body_coverage": (">=", 0.30),
-    "brow_raise_score": (">=", 0.30),
-    "largest_face_area_ratio": (">=", 0.06),
-}
-
-
-def _passes_threshold(name: str, value: float) -> bool:
-    op, thresh = _LIKENESS_THRESHOLDS[name]
-    if op == ">=":
-        return value >= thresh
-    return value <= thresh
-
-
-def _derive_feature_weights(thumbnails) -> Dict[str, float]:
-    """Compute |mrbeast_mean - panel_mean| / panel_std for each criterion feature."""
-    import numpy as np
-
-    mb_vals: Dict[str, list] = {name: [] for name, _ in _LIKENESS_CRITERIA}
-    panel_vals: Dict[str, list] = {name: [] for name, _ in _LIKENESS_CRITERIA}
-
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        bucket = mb_vals if thumb.group == "mrbeast" else panel_vals
-        for name, extractor in _LIKENESS_CRITERIA:
-            val = extractor(f)
-            if isinstance(val, (int, float)):
-                bucket[name].append(float(val))
-
-    weights = {}
-    for name in mb_vals:
-        mb = np.array(mb_vals[name]) if mb_vals[name] else np.array([0.0])
-        pa = np.array(panel_vals[name]) if panel_vals[name] else np.array([0.0])
-        pa_std = float(np.std(pa)) if len(pa) > 1 else 1.0
-        if pa_std < 1e-6:
-            pa_std = 1e-6
-        weights[name] = round(abs(float(np.mean(mb)) - float(np.mean(pa))) / pa_std, 4)
-
-    return weights
-
-
-def _compute_weighted_likeness_score(f: dict, weights: Dict[str, float]) -> float:
-    """Same 8 criteria as binary score, but adds weight[feature] instead of 1."""
-    score = 0.0
-    for name, extractor in _LIKENESS_CRITERIA:
-        val = extractor(f)
-        if isinstance(val, (int, float)) and _passes_threshold(name, float(val)):
-            score += weights.get(name, 1.0)
-    return score
-
-
 @router.get("/convergence-tests")
+@cached_endpoint("convergence-tests")
 async def convergence_tests(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
     early_years: str = Query("2015,2016,2017", description="Comma-separated early year groups"),
     late_years: str = Query("2024,2025", description="Comma-separated late year groups"),
 ):
     """Run hypothesis tests on whether likeness scores increase over time."""
-    import numpy as np
     from scipy import stats as sp_stats
 
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
+    snapshot = get_feature_snapshot(db)
+    mask = snapshot.mask(panel_only=panel_only) & (snapshot.groups != "mrbeast")
+    scores = score_thumbnails(snapshot, mask)
 
     early_set = set(early_years.split(","))
     late_set = set(late_years.split(","))
 
     # Collect scores per year group
-    year_scores: Dict[str, list] = defaultdict(list)
-    for thumb in thumbnails:
-        if thumb.group == "mrbeast":
-            continue
-        f = thumb.get_features()
-        score = _compute_likeness_score(f)
-        year_scores[thumb.group].append(score)
-
-    early_scores = []
-    late_scores = []
-    for y, scores in year_scores.items():
-        if y in early_set:
-            early_scores.extend(scores)
-        if y in late_set:
-            late_scores.extend(scores)
+    year_scores: Dict[str, np.ndarray] = {
+        y: scores.thumbnail[rows] for y, rows in group_positions(scores.groups).items()
+    }
+
+    early_scores = np.concatenate(
+        [arr for y, arr in year_scores.items() if y in early_set] or [np.empty(0)]
+    )
+    late_scores = np.concatenate(
+        [arr for y, arr in year_scores.items() if y in late_set] or [np.empty(0)]
+    )
 
     result: Dict[str, Any] = {}
 
     # T-test
     if len(early_scores) >= 2 and len(late_scores) >= 2:
-        early_arr = np.array(early_scores, dtype=float)
-        late_arr = np.array(late_scores, dtype=float)
+        early_arr = early_scores.astype(float)
+        late_arr = late_scores.astype(float)
         t_stat, t_p = sp_stats.ttest_ind(early_arr, late_arr, equal_var=False)
         result["ttest"] = {
             "t_statistic": round(float(t_stat), 4),
@@ -910,7 +685,7 @@ async def convergence_tests(
     anova_groups = []
     for y in sorted(year_scores.keys()):
         if len(year_scores[y]) >= 2:
-            group_arrays.append(np.array(year_scores[y], dtype=float))
+            group_arrays.append(year_scores[y].astype(float))
             anova_groups.append(y)
     if len(group_arrays) >= 2:
         f_stat, f_p = sp_stats.f_oneway(*group_arrays)
@@ -925,17 +700,16 @@ async def convergence_tests(
     # Linear regression: score ~ year
     all_x = []
     all_y = []
-    for y, scores in year_scores.items():
+    for y, arr in year_scores.items():
         try:
             year_num = int(y)
         except ValueError:
             continue
-        for s in scores:
-            all_x.append(year_num)
-            all_y.append(s)
-    if len(all_x) >= 3:
-        x_arr = np.array(all_x, dtype=float)
-        y_arr = np.array(all_y, dtype=float)
+        all_x.append(np.full(len(arr), year_num, dtype=float))
+        all_y.append(arr.astype(float))
+    x_arr = np.concatenate(all_x) if all_x else np.empty(0)
+    y_arr = np.concatenate(all_y) if all_y else np.empty(0)
+    if len(x_arr) >= 3:
         slope, intercept, r_value, p_value, std_err = sp_stats.linregress(x_arr, y_arr)
         result["linear_regression"] = {
             "slope": round(float(slope), 6),
@@ -944,15 +718,14 @@ async def convergence_tests(
             "p_value": float(p_value),
             "significant": float(p_value) < 0.05,
             "std_err": round(float(std_err), 6),
-            "n": len(all_x),
+            "n": len(x_arr),
         }
 
     # Per-year 95% CIs
     year_cis = {}
     for y in sorted(year_scores.keys()):
-        scores = year_scores[y]
-        if len(scores) >= 2:
-            arr = np.array(scores, dtype=float)
+        if len(year_scores[y]) >= 2:
+            arr = year_scores[y].astype(float)
             mean = float(np.mean(arr))
             sem = float(sp_stats.sem(arr))
             ci_low, ci_high = sp_stats.t.interval(0.95, len(arr) - 1, loc=mean, scale=sem)
@@ -960,7 +733,7 @@ async def convergence_tests(
                 "mean": round(mean, 4),
                 "ci_low": round(float(ci_low), 4),
                 "ci_high": round(float(ci_high), 4),
-                "n": len(scores),
+                "n": len(arr),
                 "sem": round(sem, 4),
             }
 
@@ -970,40 +743,31 @@ async def convergence_tests(
 
 
 @router.get("/weighted-likeness")
+@cached_endpoint("weighted-likeness")
 async def weighted_likeness(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     panel_only: bool = Query(False, description="Filter to panel channels only"),
     use_dynamic_weights: bool = Query(True, description="Compute weights from data vs equal weights"),
 ):
     """Compute weighted MrBeast-likeness scores using data-derived feature weights."""
-    import numpy as np
-
-    thumbnails = db.query(Thumbnail).filter(
-        Thumbnail.features_extracted == True
-    ).all()
-
-    if panel_only:
-        thumbnails = [t for t in thumbnails if t.group == "mrbeast" or t.channel in PANEL_CHANNELS]
+    snapshot = get_feature_snapshot(db)
+    mask = snapshot.mask(panel_only=panel_only)
 
     if use_dynamic_weights:
-        weights = _derive_feature_weights(thumbnails)
+        weights = derive_feature_weights(snapshot, mask)
     else:
-        weights = {name: 1.0 for name, _ in _LIKENESS_CRITERIA}
+        weights = {name: 1.0 for name in THUMBNAIL_CRITERIA_NAMES}
 
     max_possible = sum(weights.values())
-
-    groups_data: Dict[str, list] = defaultdict(list)
-    for thumb in thumbnails:
-        f = thumb.get_features()
-        score = _compute_weighted_likeness_score(f, weights)
-        groups_data[thumb.group].append(score)
+    scores = score_thumbnails(snapshot, mask, weights=weights)
 
     groups_result = {}
-    for group, scores in groups_data.items():
-        arr = np.array(scores)
+    for group, rows in group_positions(scores.groups).items():
+        arr = scores.weighted[rows]
         mean_val = float(np.mean(arr))
         groups_result[group] = {
-            "count": len(scores),
+            "count": len(arr),
             "mean_score": round(mean_val, 4),
             "median_score": round(float(np.median(arr)), 4),
             "normalized_mean": round(mean_val / max_possible, 4) if max_possible > 0 else 0,
@@ -1,18 +1,34 @@
 """Thumbnail API endpoints."""
 
-from typing import Optional, List
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, List, Tuple
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from sqlalchemy import desc, asc, and_, or_
+from sqlalchemy.orm import contains_eager
 from pydantic import BaseModel
 
 from app.core.db import get_db
 from app.core.config import settings
+from app.models.features import ThumbnailFeatures
 from app.models.thumbnail import Thumbnail
+from app.services.cache import cached_count
+from app.services.dedup import MAX_HAMMING_DISTANCE, find_near_duplicates
 from app.services.ingest import ingest_all_groups
-from app.services.pipeline import run_pipeline, get_pipeline_status, ALL_FEATURES
+from app.services.jobs import (
+    JobStateError,
+    cancel_job,
+    create_job,
+    get_job,
+    list_jobs,
+    resume_job,
+)
+from app.services.pipeline import get_pipeline_status, ALL_FEATURES
 
 
 router = APIRouter()
@@ -41,9 +57,10 @@ class ThumbnailListResponse(BaseModel):
     """Response model for thumbnail list."""
 
     items: List[ThumbnailResponse]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class PipelineRunRequest(BaseModel):
@@ -55,6 +72,110 @@ class PipelineRunRequest(BaseModel):
     limit: Optional[int] = None
 
 
+def _feature_column(feature_path: str):
+    """Resolve a dotted feature path to its columnar feature column or 400."""
+    column = ThumbnailFeatures.column_for(feature_path)
+    if column is None:
+        raise HTTPException(status_code=400, detail=f"Unknown feature: {feature_path}")
+    return column
+
+
+def _parse_feature_range(spec: str):
+    """
+    Parse a 'path:min:max' range filter; either bound may be empty.
+
+    Returns:
+        Tuple of (column, min or None, max or None)
+    """
+    parts = spec.split(":")
+    if len(parts) != 3:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid feature range '{spec}', expected path:min:max",
+        )
+    path, low, high = parts
+    try:
+        low_val = float(low) if low else None
+        high_val = float(high) if high else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid bounds in feature range '{spec}'")
+    return _feature_column(path), low_val, high_val
+
+
+def _sort_column(sort: str):
+    """Resolve a sort field: a thumbnail column or a dotted feature path."""
+    if "." in sort:
+        return _feature_column(sort)
+    return Thumbnail.__table__.c.get(sort, Thumbnail.id)
+
+
+def _encode_cursor(sort: str, order: str, value: Any, thumb_id: int) -> str:
+    """Opaque cursor for the row after which the next page starts."""
+    if isinstance(value, datetime):
+        payload = [sort, order, "dt", value.isoformat(), thumb_id]
+    else:
+        payload = [sort, order, None, value, thumb_id]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by _encode_cursor for the same sort and order.
+
+    Returns:
+        Tuple of (last sort value, last id)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort, c_order, kind, value, thumb_id = json.loads(raw)
+        if kind not in (None, "dt"):
+            raise ValueError(f"unknown cursor value kind {kind!r}")
+        if kind == "dt":
+            value = datetime.fromisoformat(value)
+        if not isinstance(thumb_id, int) or isinstance(thumb_id, bool):
+            raise ValueError("cursor id is not an integer")
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if c_sort != sort or c_order != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+    return value, thumb_id
+
+
+def _keyset_condition(sort_column, descending: bool, value: Any, thumb_id: int):
+    """
+    Rows strictly after (value, id) in (sort_column, id) order.
+
+    SQLite sorts NULLs first ascending and last descending, so NULL sort
+    values need their own branches to keep pages gap-free.
+    """
+    if descending:
+        if value is None:
+            return and_(sort_column == None, Thumbnail.id < thumb_id)
+        return or_(
+            sort_column < value,
+            and_(sort_column == value, Thumbnail.id < thumb_id),
+            sort_column == None,
+        )
+    if value is None:
+        return or_(
+            and_(sort_column == None, Thumbnail.id > thumb_id),
+            sort_column != None,
+        )
+    return or_(
+        sort_column > value,
+        and_(sort_column == value, Thumbnail.id > thumb_id),
+    )
+
+
+def _row_sort_value(thumb: Thumbnail, sort_column) -> Any:
+    """Value of the sort column for a loaded thumbnail."""
+    if sort_column.table is ThumbnailFeatures.__table__:
+        row = thumb.feature_values
+        return getattr(row, sort_column.name) if row is not None else None
+    return getattr(thumb, sort_column.name)
+
+
 @router.get("", response_model=ThumbnailListResponse)
 async def list_thumbnails(
     db: Session = Depends(get_db),
@@ -63,13 +184,27 @@ async def list_thumbnails(
     year_max: Optional[int] = Query(None, description="Maximum year"),
     has_text: Optional[bool] = Query(None, description="Filter by text presence"),
     min_faces: Optional[int] = Query(None, description="Minimum face count"),
-    sort: str = Query("id", description="Sort field"),
+    feature_range: Optional[List[str]] = Query(
+        None, description="Feature range filter 'path:min:max' (repeatable, bounds optional)"
+    ),
+    sort: str = Query("id", description="Sort field or dotted feature path"),
     order: str = Query("asc", description="Sort order (asc/desc)"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset pagination)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    pagination: str = Query("offset", description="Pagination mode (offset/cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (cursor pagination)"),
+    include_total: bool = Query(True, description="Include the (cached) total row count"),
 ):
-    """List thumbnails with filters and pagination."""
-    query = db.query(Thumbnail)
+    """
+    List thumbnails with filters and pagination.
+
+    Offset pagination uses page/page_size. Cursor pagination resumes after
+    the (sort value, id) encoded in the previous response's next_cursor,
+    so deep pages cost the same as the first one.
+    """
+    query = db.query(Thumbnail).outerjoin(
+        ThumbnailFeatures, ThumbnailFeatures.thumbnail_id == Thumbnail.id
+    ).options(contains_eager(Thumbnail.feature_values))
 
     # Apply filters
     if group:
@@ -81,43 +216,57 @@ async def list_thumbnails(
     if year_max is not None:
         query = query.filter(Thumbnail.year <= year_max)
 
-    # Note: has_text and min_faces require feature inspection
-    # For MVP, we'll do this post-query (not ideal for large datasets)
-
-    # Get total count before pagination
-    total = query.count()
+    # Feature filters run against the indexed columnar feature table.
+    # Missing features count as "no text" and zero faces.
+    if has_text is not None:
+        has_text_col = _feature_column("text.has_text")
+        if has_text:
+            query = query.filter(has_text_col == 1)
+        else:
+            query = query.filter(or_(has_text_col == 0, has_text_col == None))
+
+    if min_faces is not None and min_faces > 0:
+        query = query.filter(_feature_column("face.face_count") >= min_faces)
+
+    for spec in feature_range or []:
+        column, low, high = _parse_feature_range(spec)
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+
+    # Total count before pagination, cached per dataset version
+    total = None
+    if include_total:
+        count_key = (
+            "thumbnails", group, year_min, year_max, has_text, min_faces,
+            tuple(feature_range or ()),
+        )
+        total = cached_count(db, count_key, query)
+
+    # Apply sorting (id breaks ties so pages are stable)
+    sort_column = _sort_column(sort)
+    descending = order == "desc"
+    direction = desc if descending else asc
+    query = query.order_by(direction(sort_column), direction(Thumbnail.id))
 
-    # Apply sorting
-    sort_column = getattr(Thumbnail, sort, Thumbnail.id)
-    if order == "desc":
-        query = query.order_by(desc(sort_column))
+    # Apply pagination
+    next_cursor = None
+    if pagination == "cursor":
+        if cursor:
+            value, last_id = _decode_cursor(cursor, sort, order)
+            query = query.filter(_keyset_condition(sort_column, descending, value, last_id))
+        thumbnails = query.limit(page_size + 1).all()
+        if len(thumbnails) > page_size:
+            thumbnails = thumbnails[:page_size]
+            last = thumbnails[-1]
+            next_cursor = _encode_cursor(sort, order, _row_sort_value(last, sort_column), last.id)
     else:
-        query = query.order_by(asc(sort_column))
+        offset = (page - 1) * page_size
+        thumbnails = query.offset(offset).limit(page_size).all()
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    thumbnails = query.offset(offset).limit(page_size).all()
-
-    # Filter by features (post-query for MVP)
-    filtered_items = []
-    for thumb in thumbnails:
-        features = thumb.get_features()
-
-        # Filter by has_text
-        if has_text is not None:
-            text_features = features.get("text", {})
-            thumb_has_text = text_features.get("has_text", False)
-            if has_text != thumb_has_text:
-                continue
-
-        # Filter by min_faces
-        if min_faces is not None:
-            face_features = features.get("face", {})
-            face_count = face_features.get("face_count", 0)
-            if face_count < min_faces:
-                continue
-
-        filtered_items.append(ThumbnailResponse(
+    items = [
+        ThumbnailResponse(
             id=thumb.id,
             group=thumb.group,
             file_path=thumb.file_path,
@@ -127,18 +276,39 @@ async def list_thumbnails(
             views=thumb.views,
             ctr=thumb.ctr,
             features_extracted=thumb.features_extracted,
-            features=features,
+            features=thumb.get_features(),
             cluster_id=thumb.cluster_id,
-        ))
+        )
+        for thumb in thumbnails
+    ]
 
     return ThumbnailListResponse(
-        items=filtered_items,
+        items=items,
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
 
+@router.get("/duplicates")
+def near_duplicates(
+    db: Session = Depends(get_db),
+    max_distance: int = Query(
+        4, ge=0, le=MAX_HAMMING_DISTANCE, description="Max dHash Hamming distance"
+    ),
+    group: Optional[str] = Query(None, description="Filter by group"),
+    limit: int = Query(100, ge=1, le=1000, description="Max clusters returned"),
+):
+    """
+    Report clusters of identical or perceptually near-identical thumbnails.
+
+    Declared sync so the CPU-bound clustering runs in the threadpool
+    instead of on the event loop.
+    """
+    return find_near_duplicates(db, max_distance=max_distance, group=group, limit=limit)
+
+
 @router.get("/{thumbnail_id}", response_model=ThumbnailResponse)
 async def get_thumbnail(
     thumbnail_id: int,
@@ -175,26 +345,61 @@ async def ingest_thumbnails(
     return {"status": "completed", "results": results}
 
 
+def _get_job_or_404(db: Session, job_id: int):
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.post("/pipeline/run")
 async def run_extraction_pipeline(
     request: PipelineRunRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    """Run the feature extraction pipeline."""
-    features = set(request.features) if request.features else None
-
-    # For small datasets, run synchronously
-    # For larger datasets, could run in background
-    stats = run_pipeline(
-        db,
-        group=request.group,
-        features=features,
-        force=request.force,
-        limit=request.limit,
-    )
-
-    return {"status": "completed", "stats": stats}
+    """Queue a feature extraction run; poll /pipeline/jobs/{id} for progress."""
+    job = create_job(db, {
+        "group": request.group,
+        "features": sorted(request.features) if request.features else None,
+        "force": request.force,
+        "limit": request.limit,
+    })
+    return {"status": "queued", "job": job.to_dict()}
+
+
+@router.get("/pipeline/jobs")
+async def list_pipeline_jobs(
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100, description="Max jobs returned"),
+):
+    """List recent pipeline jobs, newest first."""
+    return {"jobs": [job.to_dict() for job in list_jobs(db, limit=limit)]}
+
+
+@router.get("/pipeline/jobs/{job_id}")
+async def get_pipeline_job(job_id: int, db: Session = Depends(get_db)):
+    """Get a pipeline job's state and progress."""
+    return _get_job_or_404(db, job_id).to_dict()
+
+
+@router.post("/pipeline/jobs/{job_id}/cancel")
+async def cancel_pipeline_job(job_id: int, db: Session = Depends(get_db)):
+    """Cancel a queued job, or stop a running one after its current chunk."""
+    job = _get_job_or_404(db, job_id)
+    try:
+        return cancel_job(db, job).to_dict()
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/pipeline/jobs/{job_id}/resume")
+async def resume_pipeline_job(job_id: int, db: Session = Depends(get_db)):
+    """Re-queue a stopped job; it continues after its last finished thumbnail."""
+    job = _get_job_or_404(db, job_id)
+    try:
+        return resume_job(db, job).to_dict()
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.get("/pipeline/status")
@@ -2,6 +2,8 @@
 
 import json as _json
 from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +12,14 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./thumbnail_analyzer.db"
+    # SQLite connection pragmas (applied to every new connection)
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsync at checkpoints only
+    SQLITE_BUSY_TIMEOUT_MS: int = 30000  # Wait this long on a locked database
+    SQLITE_CACHE_SIZE_KB: int = 65536  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the DB file to memory-map
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_READ_ONLY_ENGINE: bool = True  # Serve stats/clustering reads from a read-only engine
 
     # Paths
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
@@ -24,15 +34,57 @@ class Settings(BaseSettings):
     COLLECTION_STATE_FILE: Path = DATA_DIR / "collection_state.json"
     METADATA_DIR: Path = DATA_DIR / "metadata"
 
+    # Ingestion
+    PROCESS_ON_STARTUP: bool = True  # Ingest + extract the backlog in the background at boot
+    INGEST_BATCH_SIZE: int = 500  # Rows per bulk-ingest transaction
+    SCAN_MANIFEST_PATH: Optional[Path] = None  # Default: next to the SQLite DB
+
     # Image processing
     MAX_IMAGE_SIZE: int = 1280  # Max dimension for processing
     DEPTH_IMAGE_SIZE: int = 384  # Size for MiDaS processing
+    MODEL_POOL_SIZE: int = 4  # Max pooled instances per MediaPipe task
+    DEPTH_BATCH_SIZE: int = 8  # Images per MiDaS forward pass
+    DEPTH_TORCH_THREADS: int = 0  # Torch intra-op threads (0 = torch default)
+    # Local MiDaS_small export (TorchScript, or ONNX if the suffix is .onnx)
+    DEPTH_MODEL_PATH: Path = BASE_DIR / "models" / "midas_small.pt"
+    DEPTH_ALLOW_HUB_DOWNLOAD: bool = True  # Fall back to torch.hub if file is missing
+
+    # File watcher
+    WATCHER_WORKERS: int = 2  # Threads ingesting/processing watched files
+    WATCHER_SETTLE_SECONDS: float = 1.0  # Quiet period before a file is read
+
+    # Pipeline jobs
+    PIPELINE_JOB_WORKER: bool = True  # Run queued pipeline jobs in this process
+    PIPELINE_JOB_CHUNK_SIZE: int = 32  # Thumbnails per job checkpoint
+    PIPELINE_JOB_LEASE_SECONDS: float = 600.0  # Reclaim running jobs silent this long (> one chunk)
+    PIPELINE_COMMIT_BATCH: int = 32  # Thumbnails written per transaction
 
     # Feature extraction
+    PIPELINE_REUSE_PERCEPTUAL: bool = False  # Also reuse features on identical dHash
     COLOR_KMEANS_CLUSTERS: int = 5
+    COLOR_PALETTE_BACKEND: str = "minibatch"  # kmeans, minibatch, median_cut or warm_start
+    COLOR_PALETTE_SAMPLE_SIZE: int = 4096  # Pixels clustered per image (kmeans uses 10k)
+    COLOR_PALETTE_SEED: int = 42  # Fixed seed so palettes are reproducible
+    COLOR_PALETTE_MAX_ITER: int = 20  # Lloyd iterations for warm_start
     HUE_HISTOGRAM_BINS: int = 36
+    COLOR_ANALYSIS_SIZE: int = 320  # Max dimension for color statistics
+    FACE_CROP_MARGIN: float = 0.5  # Context around a face box for the landmarker, per side
+    FACE_MAX_LANDMARK_FACES: int = 5  # Largest faces that get landmarks/emotion proxies
+    OCR_ENGINE: str = "auto"  # auto, tesserocr (in-process) or pytesseract (CLI)
+    OCR_LANG: str = "eng"
+    OCR_PSM: int = 3  # Tesseract page segmentation mode
+    OCR_OEM: int = 3  # Tesseract engine mode (3 = default, 1 = LSTM only)
+    OCR_IMAGE_SIZE: int = 960  # Max dimension of the OCR input
+    OCR_GRAYSCALE: bool = True  # Feed Tesseract a single-channel image
+    OCR_WORKERS: int = 4  # Concurrent OCR calls per batch (and pooled APIs)
+    OCR_TEXT_DETECTION: bool = True  # OCR only detected text regions; skip text-free images
+    OCR_REGION_PSM: int = 6  # Page segmentation mode for region crops (6 = single block)
+    OCR_MAX_REGIONS: int = 12  # More candidate regions than this: OCR the whole image
+    OCR_MAX_REGION_COVERAGE: float = 0.5  # Same when regions cover more of the image
 
     # API
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256  # Cached /stats responses (LRU)
+    JSON_BACKEND: str = "auto"  # auto, orjson, msgspec or json
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:3001", "http://127.0.0.1:3001"]
@@ -1,7 +1,14 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from app.core.config import settings
 
@@ -12,13 +19,78 @@ class Base(DeclarativeBase):
     pass
 
 
+_url = make_url(settings.DATABASE_URL)
+_is_sqlite = _url.get_backend_name() == "sqlite"
+_sqlite_file = _url.database if _is_sqlite and _url.database not in (None, "", ":memory:") else None
+
+
+def _apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    """Configure a new SQLite connection from settings."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        if not read_only:
+            # journal_mode is persisted in the file; set it from a writer
+            cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size = {-int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+        cursor.execute("PRAGMA foreign_keys = ON")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
+    connect_args={
+        "check_same_thread": False,  # Needed for SQLite
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+    } if _is_sqlite else {},
     echo=False,
 )
 
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection)
+
+
+def _create_read_engine():
+    """
+    Engine whose connections open the SQLite file read-only.
+
+    Falls back to the main engine for non-file databases or when
+    SQLITE_READ_ONLY_ENGINE is disabled.
+    """
+    if not (_sqlite_file and settings.SQLITE_READ_ONLY_ENGINE):
+        return engine
+
+    uri = f"file:{Path(_sqlite_file).resolve().as_posix()}?mode=ro"
+
+    def connect():
+        return sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        )
+
+    read_engine = create_engine("sqlite://", creator=connect, echo=False)
+
+    @event.listens_for(read_engine, "connect")
+    def _on_read_connect(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, read_only=True)
+
+    return read_engine
+
+
+read_engine = _create_read_engine()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db():
@@ -30,6 +102,104 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency that provides a read-only session for analytics endpoints."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _sql_literal(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _add_missing_columns():
+    """
+    Add columns declared on models but missing from existing tables.
+
+    Scalar Python defaults become the column's SQL DEFAULT so existing
+    rows get the same value new rows would.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = (
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" '
+                    f"{column.type.compile(dialect=engine.dialect)}"
+                )
+                if column.default is not None and column.default.is_scalar:
+                    ddl += f" DEFAULT {_sql_literal(column.default.arg)}"
+                conn.execute(text(ddl))
+
+
+def _ensure_indexes():
+    """
+    Create indexes declared on models that predate their table.
+
+    create_all() skips tables that already exist, so indexes added to an
+    existing model would otherwise never reach older databases.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _ensure_triggers():
+    """
+    Create triggers declared in a table's info["triggers"].
+
+    Each entry is a CREATE TRIGGER IF NOT EXISTS statement, so this is
+    safe to run on every start.
+    """
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for ddl in table.info.get("triggers", ()):
+                conn.execute(text(ddl))
+
+
+_DATABASE_ID_KEY = "database_id"
+
+
+def _ensure_database_id():
+    """Give the database a random identity the first time it is initialized."""
+    from app.models.dataset import DatabaseMeta
+
+    db = SessionLocal()
+    try:
+        if db.get(DatabaseMeta, _DATABASE_ID_KEY) is None:
+            db.add(DatabaseMeta(key=_DATABASE_ID_KEY, value=uuid.uuid4().hex))
+            db.commit()
+    except IntegrityError:
+        # Another process initialized it first
+        db.rollback()
+    finally:
+        db.close()
+
+
+def get_database_id(db: Session) -> Optional[str]:
+    """Identity written by init_db, or None for a database it never ran on."""
+    from app.models.dataset import DatabaseMeta
+
+    row = db.get(DatabaseMeta, _DATABASE_ID_KEY)
+    return row.value if row is not None else None
+
+
 def init_db():
     """Initialize the database by creating all tables."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _ensure_indexes()
+    _ensure_triggers()
+    _ensure_database_id()
@@ -0,0 +1,113 @@
+"""
+JSON serialization backends.
+
+orjson or msgspec is used when installed (in that order), with the stdlib
+json module as fallback; settings.JSON_BACKEND can pin one explicitly.
+Every backend accepts numpy scalars/arrays, datetimes, sets, paths and
+pydantic models, and always produces UTF-8 bytes.
+"""
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert values the JSON backends do not handle natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _select_backend(requested: str) -> str:
+    available = {
+        "orjson": orjson is not None,
+        "msgspec": msgspec is not None,
+        "json": True,
+    }
+    if requested != "auto":
+        if not available.get(requested):
+            raise ValueError(f"JSON backend '{requested}' is not installed")
+        return requested
+    for name in ("orjson", "msgspec", "json"):
+        if available[name]:
+            return name
+    return "json"
+
+
+BACKEND = _select_backend(settings.JSON_BACKEND)
+
+if BACKEND == "orjson":
+    # Non-string keys (e.g. year buckets) are stringified like stdlib json
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+elif BACKEND == "msgspec":
+    _encoder = msgspec.json.Encoder(enc_hook=_default)
+    _decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        try:
+            return _decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Match json/orjson, whose decode errors are ValueErrors
+            raise ValueError(str(e)) from e
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+dumps.__doc__ = "Serialize an object to compact JSON bytes."
+loads.__doc__ = "Parse JSON from a str or bytes."
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize an object to a compact JSON string (for Text columns)."""
+    return dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the configured serialization backend."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
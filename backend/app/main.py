@@ -6,10 +6,17 @@ from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
 from app.core.db import init_db, SessionLocal
+from app.core.serialization import FastJSONResponse
 from app.api import thumbnails, stats, clustering
 from app.services.watcher import start_watcher, stop_watcher
-from app.services.ingest import ingest_all_groups
-from app.services.pipeline import run_pipeline
+from app.services import model_registry
+from app.services.backlog import (
+    get_backlog_status,
+    start_backlog_processing,
+    stop_backlog_processing,
+)
+from app.services.jobs import start_job_worker, stop_job_worker
+from app.services.pipeline import get_pipeline_status
 
 
 # Initialize FastAPI app
@@ -17,6 +24,7 @@ app = FastAPI(
     title="Thumbnail Analyzer API",
     description="API for analyzing YouTube thumbnail visual features",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -51,48 +59,44 @@ app.include_router(clustering.router, prefix="/clustering", tags=["clustering"])
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database, ingest existing thumbnails, and start file watcher."""
-    import logging
-    logger = logging.getLogger(__name__)
-
+    """Initialize the database, queue the backlog job, and start file watcher."""
     init_db()
 
-    # Ingest any existing thumbnails from all group folders
-    db = SessionLocal()
-    try:
-        logger.info("Scanning for existing thumbnails...")
-        results = ingest_all_groups(db, settings.THUMBNAILS_DIR)
-
-        total_created = sum(r["created"] for r in results.values())
-        total_found = sum(r["total_found"] for r in results.values())
-
-        if total_created > 0:
-            logger.info(f"Ingested {total_created} new thumbnails out of {total_found} found")
-
-        # Process any unprocessed thumbnails
-        logger.info("Processing unprocessed thumbnails...")
-        pipeline_stats = run_pipeline(db, force=False, save_depth_maps=True)
-
-        if pipeline_stats["processed"] > 0:
-            logger.info(f"Processed {pipeline_stats['processed']} thumbnails in {pipeline_stats['total_time']}s")
-    except Exception as e:
-        logger.error(f"Error during startup ingestion: {e}")
-    finally:
-        db.close()
+    # Ingestion and feature extraction run in the background so the API
+    # serves requests immediately; /health reports their progress
+    start_backlog_processing()
+    start_job_worker()
 
     start_watcher()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Stop file watcher on shutdown."""
+    """Stop background work and release pooled models on shutdown."""
     stop_watcher()
+    stop_backlog_processing(timeout=5.0)
+    stop_job_worker(timeout=5.0)
+    model_registry.close_all()
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "version": "1.0.0"}
+    """Health check endpoint with backlog processing status."""
+    db = SessionLocal()
+    try:
+        pipeline = get_pipeline_status(db)
+    finally:
+        db.close()
+
+    return {
+        "status": "healthy",
+        "version": "1.0.0",
+        "backlog": {
+            **get_backlog_status(),
+            "unprocessed": pipeline["unprocessed"],
+            "completion_percentage": pipeline["completion_percentage"],
+        },
+    }
 
 
 @app.get("/")
@@ -1,5 +1,16 @@
 """Database models."""
 
+from app.models.dataset import DatabaseMeta, DatasetVersion
+from app.models.features import ThumbnailFeatures
+from app.models.pipeline_job import PipelineJob
 from app.models.thumbnail import Thumbnail, ThumbnailGroup, ThumbnailSource
 
-__all__ = ["Thumbnail", "ThumbnailGroup", "ThumbnailSource"]
+__all__ = [
+    "DatabaseMeta",
+    "DatasetVersion",
+    "PipelineJob",
+    "Thumbnail",
+    "ThumbnailFeatures",
+    "ThumbnailGroup",
+    "ThumbnailSource",
+]
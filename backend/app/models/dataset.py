@@ -0,0 +1,48 @@
+"""Dataset version and database identity models."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, String
+
+from app.core.db import Base
+
+
+# SQL expression for the current dataset version, used by the triggers that
+# stamp changed thumbnails with the version they were written at
+CURRENT_VERSION_SQL = "(SELECT COALESCE(MAX(version), 0) FROM dataset_version)"
+
+
+class DatasetVersion(Base):
+    """
+    Single-row counter bumped whenever thumbnail data changes.
+
+    Shared through the database so writes from any process (API, watcher,
+    CLI scripts) invalidate cached responses everywhere.
+    """
+
+    __tablename__ = "dataset_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DatasetVersion(version={self.version})>"
+
+
+class DatabaseMeta(Base):
+    """
+    Key/value facts about the database file itself.
+
+    Holds the random database_id written by init_db, which lets on-disk
+    state kept outside the database (the scan manifest) detect that the
+    database was deleted, recreated or swapped for another one.
+    """
+
+    __tablename__ = "database_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
+
+    def __repr__(self):
+        return f"<DatabaseMeta({self.key}={self.value})>"
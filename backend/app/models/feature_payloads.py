@@ -0,0 +1,130 @@
+"""
+Typed schemas for the per-extractor feature payloads.
+
+The structs describe what each extractor writes into features_json. They
+need msgspec; without it validation is skipped. Unknown fields are
+allowed so older blobs and newer extractor fields still validate.
+"""
+
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+FEATURE_PAYLOAD_TYPES: Dict[str, type] = {}
+
+if msgspec is not None:
+
+    class ColorFeatures(msgspec.Struct):
+        avg_saturation: float = 0.0
+        avg_brightness: float = 0.0
+        hue_hist: List[float] = []
+        dominant_palette: List[str] = []
+        warm_cool_score: float = 0.0
+        error: Optional[str] = None
+
+    class TextPositionHeat(msgspec.Struct):
+        top: float = 0.0
+        middle: float = 0.0
+        bottom: float = 0.0
+
+    class TextFeatures(msgspec.Struct):
+        has_text: bool = False
+        text_area_ratio: float = 0.0
+        text_box_count: int = 0
+        text_position_heat: TextPositionHeat = msgspec.field(default_factory=TextPositionHeat)
+        detected_text: List[str] = []
+        error: Optional[str] = None
+
+    class EmotionProxies(msgspec.Struct):
+        smile_score: float = 0.0
+        mouth_open_score: float = 0.0
+        brow_raise_score: float = 0.0
+
+    class FaceDetail(msgspec.Struct):
+        x: float = 0.0
+        y: float = 0.0
+        width: float = 0.0
+        height: float = 0.0
+        area_ratio: float = 0.0
+        confidence: float = 0.0
+        emotion_proxies: Optional[EmotionProxies] = None
+
+    class FaceFeatures(msgspec.Struct):
+        face_count: int = 0
+        largest_face_area_ratio: float = 0.0
+        avg_face_area_ratio: float = 0.0
+        emotion_proxies: EmotionProxies = msgspec.field(default_factory=EmotionProxies)
+        faces: List[FaceDetail] = []
+        error: Optional[str] = None
+
+    class PoseFeatures(msgspec.Struct):
+        people_count: int = 0
+        hand_visible_count: int = 0
+        pose_orientation: str = "unknown"
+        body_coverage: float = 0.0
+        error: Optional[str] = None
+
+    class DepthCenter(msgspec.Struct):
+        x: float = 0.5
+        y: float = 0.5
+
+    class DepthFeatures(msgspec.Struct):
+        depth_contrast: float = 0.0
+        foreground_ratio: float = 0.0
+        subject_depth_center: DepthCenter = msgspec.field(default_factory=DepthCenter)
+        depth_range: float = 0.0
+        depth_map_path: Optional[str] = None
+        error: Optional[str] = None
+
+    class TitleFeatures(msgspec.Struct):
+        cleaned_title: str = ""
+        is_filename_derived: bool = True
+        char_count: int = 0
+        word_count: int = 0
+        has_number: bool = False
+        number_count: int = 0
+        has_large_number: bool = False
+        has_money_reference: bool = False
+        first_person: bool = False
+        has_superlative: bool = False
+        has_challenge_framing: bool = False
+        uppercase_ratio: float = 0.0
+        exclamation_count: int = 0
+        question_mark: bool = False
+        avg_word_length: float = 0.0
+        error: Optional[str] = None
+
+    FEATURE_PAYLOAD_TYPES.update({
+        "color": ColorFeatures,
+        "text": TextFeatures,
+        "face": FaceFeatures,
+        "pose": PoseFeatures,
+        "depth": DepthFeatures,
+        "title": TitleFeatures,
+    })
+
+
+def validate_feature_payload(name: str, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Check an extractor payload against its schema.
+
+    Args:
+        name: Feature type (e.g. "color")
+        payload: Dictionary returned by the extractor
+
+    Returns:
+        A description of the mismatch, or None if the payload is valid
+        (or cannot be checked)
+    """
+    payload_type = FEATURE_PAYLOAD_TYPES.get(name)
+    if payload_type is None:
+        return None
+    try:
+        msgspec.convert(payload, type=payload_type)
+    except msgspec.ValidationError as e:
+        return str(e)
+    return None
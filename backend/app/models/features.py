@@ -0,0 +1,153 @@
+"""Columnar numeric feature model."""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, Float, ForeignKey, Integer, Table
+
+from app.core.db import Base
+from app.models.dataset import CURRENT_VERSION_SQL
+
+
+# Numeric feature paths materialized as one typed column each.
+# Booleans are stored as 1.0/0.0; missing or non-numeric values are NULL.
+NUMERIC_FEATURE_PATHS: List[str] = [
+    # Color features
+    "color.avg_saturation",
+    "color.avg_brightness",
+    "color.warm_cool_score",
+    # Text features
+    "text.has_text",
+    "text.text_area_ratio",
+    "text.text_box_count",
+    # Face features
+    "face.face_count",
+    "face.largest_face_area_ratio",
+    "face.avg_face_area_ratio",
+    "face.emotion_proxies.smile_score",
+    "face.emotion_proxies.mouth_open_score",
+    "face.emotion_proxies.brow_raise_score",
+    # Pose features
+    "pose.people_count",
+    "pose.hand_visible_count",
+    "pose.body_coverage",
+    # Depth features
+    "depth.depth_contrast",
+    "depth.foreground_ratio",
+    "depth.depth_range",
+    "depth.subject_depth_center.x",
+    "depth.subject_depth_center.y",
+    # Title features
+    "title.is_filename_derived",
+    "title.char_count",
+    "title.word_count",
+    "title.has_number",
+    "title.number_count",
+    "title.has_large_number",
+    "title.has_money_reference",
+    "title.first_person",
+    "title.has_superlative",
+    "title.has_challenge_framing",
+    "title.uppercase_ratio",
+    "title.exclamation_count",
+    "title.question_mark",
+    "title.avg_word_length",
+]
+
+
+# Paths used for browsing filters and sorts; their columns are indexed.
+INDEXED_FEATURE_PATHS: List[str] = [
+    "color.avg_brightness",
+    "color.avg_saturation",
+    "text.has_text",
+    "text.text_area_ratio",
+    "face.face_count",
+    "face.largest_face_area_ratio",
+    "face.emotion_proxies.smile_score",
+    "pose.body_coverage",
+    "depth.depth_contrast",
+]
+
+
+def feature_column_name(feature_path: str) -> str:
+    """Column name for a dotted feature path ('face.face_count' -> 'face__face_count')."""
+    return feature_path.replace(".", "__")
+
+
+def resolve_feature_value(features: Dict[str, Any], feature_path: str) -> Optional[float]:
+    """
+    Resolve a dotted feature path like 'face.emotion_proxies.smile_score'.
+
+    Args:
+        features: Parsed features dictionary
+        feature_path: Dotted path (category first)
+
+    Returns:
+        Numeric value as float (booleans as 1.0/0.0), or None
+    """
+    parts = feature_path.split(".")
+    if len(parts) < 2:
+        return None
+    value: Any = features
+    for part in parts:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def flatten_numeric_features(features: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Map a features dictionary to {column_name: value} for every numeric path."""
+    return {
+        feature_column_name(path): resolve_feature_value(features, path)
+        for path in NUMERIC_FEATURE_PATHS
+    }
+
+
+class ThumbnailFeatures(Base):
+    """One typed column per numeric feature path, one row per thumbnail."""
+
+    __table__ = Table(
+        "thumbnail_features",
+        Base.metadata,
+        Column(
+            "thumbnail_id",
+            Integer,
+            ForeignKey("thumbnails.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *[
+            Column(
+                feature_column_name(path),
+                Float,
+                nullable=True,
+                index=path in INDEXED_FEATURE_PATHS,
+            )
+            for path in NUMERIC_FEATURE_PATHS
+        ],
+        info={"triggers": [
+            # A changed feature row marks its thumbnail as changed
+            f"CREATE TRIGGER IF NOT EXISTS trg_thumbnail_features_version_{event.lower()} "
+            f"AFTER {event} ON thumbnail_features BEGIN "
+            f"UPDATE thumbnails SET data_version = {CURRENT_VERSION_SQL} "
+            "WHERE id = NEW.thumbnail_id; END"
+            for event in ("INSERT", "UPDATE")
+        ]},
+    )
+
+    @classmethod
+    def column_for(cls, feature_path: str):
+        """Table column for a dotted feature path, or None if not materialized."""
+        return cls.__table__.c.get(feature_column_name(feature_path))
+
+    def update_from_features(self, features: Dict[str, Any]):
+        """Overwrite every column from a features dictionary."""
+        for name, value in flatten_numeric_features(features).items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"<ThumbnailFeatures(thumbnail_id={self.thumbnail_id})>"
@@ -0,0 +1,91 @@
+"""Pipeline job model."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+
+from app.core.db import Base
+from app.core.serialization import dumps_str, loads
+
+
+class PipelineJob(Base):
+    """
+    A queued or executed feature-extraction run.
+
+    Jobs walk thumbnails in id order and record the last id they finished,
+    so an interrupted or cancelled job can resume where it stopped.
+    """
+
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    params_json = Column(Text, nullable=False, default="{}")
+    # queued, running, completed, failed, cancelled, interrupted
+    state = Column(String(20), nullable=False, default="queued", index=True)
+    cancel_requested = Column(Boolean, default=False)
+
+    # Progress
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    reused = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    error_details_json = Column(Text, nullable=True)
+    last_thumbnail_id = Column(Integer, nullable=False, default=0)
+
+    # Timings
+    elapsed_seconds = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Refreshed by the worker after every chunk; a running job whose
+    # heartbeat is older than PIPELINE_JOB_LEASE_SECONDS is reclaimed
+    heartbeat_at = Column(DateTime, nullable=True)
+    # "host:pid" of the worker running the job, so a restarted process can
+    # reclaim jobs its dead predecessor left running without waiting
+    owner = Column(String(100), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_params(self) -> dict:
+        """Parse and return the run parameters."""
+        return loads(self.params_json) if self.params_json else {}
+
+    def set_params(self, params: dict):
+        """Set run parameters from a dictionary."""
+        self.params_json = dumps_str(params)
+
+    def get_error_details(self) -> list:
+        """Parse and return recorded error details."""
+        return loads(self.error_details_json) if self.error_details_json else []
+
+    def set_error_details(self, details: list):
+        """Set error details from a list."""
+        self.error_details_json = dumps_str(details)
+
+    def to_dict(self) -> dict:
+        """Serialize the job for API responses."""
+        return {
+            "id": self.id,
+            "state": self.state,
+            "params": self.get_params(),
+            "total": self.total,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "reused": self.reused,
+            "errors": self.errors,
+            "error_details": self.get_error_details(),
+            "last_thumbnail_id": self.last_thumbnail_id,
+            "progress_percentage": (
+                round((self.processed + self.skipped + self.errors) / self.total * 100, 1)
+                if self.total else 0
+            ),
+            "elapsed_seconds": round(self.elapsed_seconds or 0.0, 2),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "heartbeat_at": self.heartbeat_at,
+            "owner": self.owner,
+        }
+
+    def __repr__(self):
+        return f"<PipelineJob(id={self.id}, state={self.state})>"
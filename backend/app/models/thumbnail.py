@@ -2,13 +2,15 @@
 
 from datetime import datetime
 from typing import Optional
-import json
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
 from app.core.db import Base
+from app.core.serialization import dumps_str, loads
+from app.models.dataset import CURRENT_VERSION_SQL
+from app.models.features import ThumbnailFeatures
 
 
 class ThumbnailGroup(str, enum.Enum):
@@ -39,12 +41,33 @@ class Thumbnail(Base):
     """Thumbnail record with metadata."""
 
     __tablename__ = "thumbnails"
+    __table_args__ = (
+        # Composite (sort key, id) indexes back keyset pagination
+        Index("ix_thumbnails_group_year_id", "group", "year", "id"),
+        Index("ix_thumbnails_year_id", "year", "id"),
+        Index("ix_thumbnails_views_id", "views", "id"),
+        Index("ix_thumbnails_ctr_id", "ctr", "id"),
+        Index("ix_thumbnails_publish_date_id", "publish_date", "id"),
+        {"info": {"triggers": [
+            # Stamp rows with the dataset version whenever a column the
+            # feature store reads changes (see FeatureStore.snapshot)
+            "CREATE TRIGGER IF NOT EXISTS trg_thumbnails_version_insert "
+            "AFTER INSERT ON thumbnails BEGIN "
+            f"UPDATE thumbnails SET data_version = {CURRENT_VERSION_SQL} WHERE id = NEW.id; END",
+            "CREATE TRIGGER IF NOT EXISTS trg_thumbnails_version_update "
+            'AFTER UPDATE OF "group", channel, year, views, ctr, features_extracted '
+            "ON thumbnails BEGIN "
+            f"UPDATE thumbnails SET data_version = {CURRENT_VERSION_SQL} WHERE id = NEW.id; END",
+        ]}},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     group = Column(String(20), nullable=False, index=True)
     source = Column(String(10), default="local")
     file_path = Column(String(500), nullable=False, unique=True)
     url = Column(String(500), nullable=True)
+    content_hash = Column(String(32), nullable=True, index=True)  # BLAKE2b of file bytes
+    phash = Column(String(16), nullable=True, index=True)  # 64-bit dHash, hex
 
     # Metadata
     title = Column(String(500), nullable=True)
@@ -56,31 +79,63 @@ class Thumbnail(Base):
 
     # Processing status
     features_extracted = Column(Boolean, default=False)
+    is_stale = Column(Boolean, default=False, index=True)  # Source file no longer on disk
     features_json = Column(Text, nullable=True)  # JSON blob for all features
     cluster_id = Column(Integer, nullable=True)
     cluster_x = Column(Float, nullable=True)  # 2D projection X
     cluster_y = Column(Float, nullable=True)  # 2D projection Y
 
+    # Typed numeric columns mirroring features_json (for vectorized stats)
+    feature_values = relationship(
+        "ThumbnailFeatures",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # Dataset version of the last change the feature store reads (set by triggers)
+    data_version = Column(Integer, nullable=False, default=0, index=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def get_features(self) -> dict:
-        """Parse and return features as a dictionary."""
-        if self.features_json:
-            return json.loads(self.features_json)
-        return {}
+        """
+        Return features as a dictionary.
+
+        The parsed blob is cached on the instance and reused until
+        features_json changes, so repeated reads and merges skip parsing.
+        A shallow copy is returned: top-level keys may be added or replaced,
+        but nested dicts are shared with the cache and must not be edited
+        in place (build a new dict and pass it to set_features instead).
+        """
+        if not self.features_json:
+            return {}
+        cached = self.__dict__.get("_parsed_features")
+        if cached is None or cached[0] is not self.features_json:
+            cached = (self.features_json, loads(self.features_json))
+            self.__dict__["_parsed_features"] = cached
+        return dict(cached[1])
 
     def set_features(self, features: dict):
         """Set features from a dictionary."""
-        self.features_json = json.dumps(features)
+        self.features_json = dumps_str(features)
+        # Cache a parsed copy so later edits to the caller's (possibly
+        # shared) nested dicts cannot drift from features_json
+        self.__dict__["_parsed_features"] = (self.features_json, loads(self.features_json))
         self.features_extracted = True
 
+        # Keep the columnar copy in step with the JSON blob
+        if self.feature_values is None:
+            self.feature_values = ThumbnailFeatures()
+        self.feature_values.update_from_features(features)
+
     def update_features(self, new_features: dict):
-        """Update existing features with new ones."""
-        current = self.get_features()
-        current.update(new_features)
-        self.set_features(current)
+        """Merge new features into the existing ones."""
+        merged = self.get_features()
+        merged.update(new_features)
+        self.set_features(merged)
 
     def __repr__(self):
         return f"<Thumbnail(id={self.id}, group={self.group}, file_path={self.file_path})>"
@@ -0,0 +1,185 @@
+"""Background processing of the boot-time ingest and extraction backlog."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.serialization import dumps_str
+from app.models.pipeline_job import PipelineJob
+from app.services.feature_store import backfill_feature_rows
+from app.services.ingest import ingest_all_groups
+from app.services.jobs import create_job
+from app.services.pipeline import run_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+# run_pipeline arguments of the backlog extraction when queued as a job
+BACKLOG_JOB_PARAMS: Dict[str, Any] = {"force": False, "save_depth_maps": True}
+
+# Seconds between progress polls of a queued backlog job
+_JOB_POLL_SECONDS = 2.0
+
+# Global runner state
+_thread: Optional[threading.Thread] = None
+_stop_event = threading.Event()
+_state_lock = threading.Lock()
+_state: Dict[str, Any] = {
+    "state": "idle",
+    "phase": None,
+    "processed": 0,
+    "total": 0,
+    "ingested": 0,
+    "started_at": None,
+    "finished_at": None,
+    "error": None,
+    "job_id": None,
+}
+
+
+def _update(**values):
+    with _state_lock:
+        _state.update(values)
+
+
+def _on_progress(done: int, total: int):
+    _update(processed=done, total=total)
+
+
+def _queue_backlog_job(db: Session) -> PipelineJob:
+    """Queue the backlog extraction as a pipeline job, reusing an unfinished one."""
+    existing = db.query(PipelineJob).filter(
+        PipelineJob.state.in_(["queued", "running", "interrupted"]),
+        PipelineJob.params_json == dumps_str(BACKLOG_JOB_PARAMS),
+    ).order_by(PipelineJob.id).first()
+    if existing is not None:
+        return existing
+    logger.info("Queueing unprocessed thumbnails for the pipeline job worker...")
+    return create_job(db, BACKLOG_JOB_PARAMS)
+
+
+def _wait_for_job(db: Session, job: PipelineJob):
+    """Mirror a pipeline job's progress into the backlog state until it ends."""
+    _update(job_id=job.id)
+    while True:
+        db.refresh(job)
+        _update(processed=job.processed + job.skipped, total=job.total)
+        if job.state in ("completed", "failed", "cancelled"):
+            _update(
+                state="completed" if job.state == "completed" else "stopped",
+                finished_at=time.time(),
+            )
+            return
+        if _stop_event.wait(_JOB_POLL_SECONDS):
+            # The job worker checkpoints the job itself on shutdown
+            _update(state="stopped", finished_at=time.time())
+            return
+
+
+def _run_backlog():
+    """
+    Ingest new files, then extract features for anything unprocessed.
+
+    With the job worker enabled, extraction is queued as a pipeline job
+    instead of run here, so the two never process the same rows.
+    """
+    db = SessionLocal()
+    try:
+        _update(phase="backfill")
+        # Browsing filters read the columnar feature table, so fill it in
+        # for databases that only have features_json blobs
+        backfill_feature_rows(db)
+
+        _update(phase="ingest")
+        logger.info("Scanning for existing thumbnails...")
+        results = ingest_all_groups(db, settings.THUMBNAILS_DIR)
+
+        total_created = sum(r["created"] for r in results.values())
+        total_found = sum(r["total_found"] for r in results.values())
+        _update(ingested=total_created)
+
+        if total_created > 0:
+            logger.info(f"Ingested {total_created} new thumbnails out of {total_found} found")
+
+        if _stop_event.is_set():
+            _update(state="stopped", finished_at=time.time())
+            return
+
+        # Process any unprocessed thumbnails
+        _update(phase="pipeline")
+        if settings.PIPELINE_JOB_WORKER:
+            # The job worker owns extraction; running it here as well would
+            # process the same rows twice
+            _wait_for_job(db, _queue_backlog_job(db))
+            return
+
+        logger.info("Processing unprocessed thumbnails...")
+        pipeline_stats = run_pipeline(
+            db,
+            force=False,
+            save_depth_maps=True,
+            progress=_on_progress,
+            should_stop=_stop_event.is_set,
+        )
+
+        if pipeline_stats["processed"] > 0:
+            logger.info(f"Processed {pipeline_stats['processed']} thumbnails in {pipeline_stats['total_time']}s")
+
+        _update(
+            state="stopped" if pipeline_stats["cancelled"] else "completed",
+            processed=pipeline_stats["processed"] + pipeline_stats["skipped"],
+            total=pipeline_stats["total"],
+            finished_at=time.time(),
+        )
+    except Exception as e:
+        logger.error(f"Error during startup ingestion: {e}")
+        _update(state="failed", error=str(e), finished_at=time.time())
+    finally:
+        db.close()
+
+
+def start_backlog_processing() -> bool:
+    """
+    Start the boot-time backlog job in a daemon thread.
+
+    Does nothing when settings.PROCESS_ON_STARTUP is False (e.g. replicas
+    serving a database another instance maintains).
+
+    Returns:
+        True if a job was started
+    """
+    global _thread
+
+    if not settings.PROCESS_ON_STARTUP:
+        _update(state="disabled")
+        return False
+
+    if _thread is not None and _thread.is_alive():
+        return False
+
+    _stop_event.clear()
+    _update(
+        state="running", phase=None, processed=0, total=0, ingested=0,
+        started_at=time.time(), finished_at=None, error=None, job_id=None,
+    )
+    _thread = threading.Thread(target=_run_backlog, name="backlog", daemon=True)
+    _thread.start()
+    return True
+
+
+def stop_backlog_processing(timeout: Optional[float] = None):
+    """Ask the backlog job to stop after its current chunk and wait for it."""
+    _stop_event.set()
+    if _thread is not None:
+        _thread.join(timeout)
+
+
+def get_backlog_status() -> Dict[str, Any]:
+    """Snapshot of the backlog job's state and progress."""
+    with _state_lock:
+        return dict(_state)
@@ -0,0 +1,157 @@
+"""Dataset versioning and server-side response caching for read endpoints."""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import dumps
+from app.models.dataset import DatasetVersion
+
+
+# Row id of the single dataset version counter
+_VERSION_ROW_ID = 1
+
+
+def get_dataset_version(db: Session) -> int:
+    """Return the current dataset version (0 if nothing was ever written)."""
+    version = db.query(DatasetVersion.version).filter(
+        DatasetVersion.id == _VERSION_ROW_ID
+    ).scalar()
+    return version or 0
+
+
+def bump_dataset_version(db: Session):
+    """
+    Increment the dataset version inside the caller's transaction.
+
+    Call this from any code path that changes thumbnail data; the bump
+    becomes visible when the caller commits.
+    """
+    result = db.execute(
+        update(DatasetVersion)
+        .where(DatasetVersion.id == _VERSION_ROW_ID)
+        .values(version=DatasetVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        db.add(DatasetVersion(id=_VERSION_ROW_ID, version=1))
+
+
+class VersionedCache:
+    """
+    Thread-safe LRU cache whose entries are tied to a dataset version.
+
+    An entry is only served while the dataset version it was computed at
+    is still current.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, version: int) -> Optional[Any]:
+        """Return the value for key if cached at this version."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Tuple, version: int, value: Any):
+        """Store a value, evicting the least recently used."""
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global caches: serialized (body, etag) responses and query row counts
+response_cache = VersionedCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+count_cache = VersionedCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cached_count(db: Session, key: Tuple, query) -> int:
+    """
+    Row count of a query, cached until the dataset version changes.
+
+    Args:
+        db: Database session
+        key: Hashable description of the query's filters
+        query: SQLAlchemy ORM query to count
+
+    Returns:
+        Number of rows the query matches
+    """
+    version = get_dataset_version(db)
+    total = count_cache.get(key, version)
+    if total is None:
+        total = query.count()
+        count_cache.put(key, version, total)
+    return total
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def cached_endpoint(name: str):
+    """
+    Cache a read-only JSON endpoint by name and query parameters.
+
+    The decorated endpoint must declare ``request: Request`` and
+    ``db: Session`` parameters. Responses carry an ETag derived from the
+    body; a matching If-None-Match yields 304 Not Modified.
+
+    Args:
+        name: Cache namespace for the endpoint
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            db: Session = kwargs["db"]
+
+            key = (name,) + tuple(sorted(
+                (k, repr(v)) for k, v in kwargs.items() if k not in ("request", "db")
+            ))
+            version = get_dataset_version(db)
+
+            cached = response_cache.get(key, version)
+            if cached is None:
+                payload = await func(*args, **kwargs)
+                # Serialized straight from the payload; the backend handles
+                # numpy scalars and pydantic models without jsonable_encoder
+                body = dumps(payload)
+                etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+                response_cache.put(key, version, (body, etag))
+            else:
+                body, etag = cached
+
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        return wrapper
+
+    return decorator
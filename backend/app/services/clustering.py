@@ -9,6 +9,8 @@ from sklearn.decomposition import PCA
 from sqlalchemy.orm import Session
 
 from app.models.thumbnail import Thumbnail
+from app.services.cache import bump_dataset_version
+from app.services.feature_store import get_feature_snapshot
 
 
 # Features to use for clustering (numeric features only)
@@ -35,6 +37,9 @@ CLUSTERING_FEATURES = [
     ("depth", "foreground_ratio"),
 ]
 
+# Same features as dotted paths into the columnar feature store
+CLUSTERING_FEATURE_PATHS = [f"{cat}.{name}" for cat, name in CLUSTERING_FEATURES]
+
 
 def extract_feature_vector(features: Dict[str, Any]) -> Optional[List[float]]:
     """
@@ -94,30 +99,21 @@ def build_feature_matrix(
     Returns:
         Tuple of (feature matrix, thumbnail IDs, group labels)
     """
-    query = db.query(Thumbnail).filter(Thumbnail.features_extracted == True)
-
-    if group:
-        query = query.filter(Thumbnail.group == group)
+    snapshot = get_feature_snapshot(db)
+    mask = snapshot.mask(group=group)
 
-    thumbnails = query.all()
-
-    vectors = []
-    ids = []
-    groups = []
-
-    for thumb in thumbnails:
-        features = thumb.get_features()
-        vector = extract_feature_vector(features)
+    # Rows with every clustering feature present (see extract_feature_vector)
+    X = snapshot.matrix(CLUSTERING_FEATURE_PATHS)[mask]
+    complete = ~np.isnan(X).any(axis=1)
 
-        if vector is not None:
-            vectors.append(vector)
-            ids.append(thumb.id)
-            groups.append(thumb.group)
+    vectors = X[complete]
+    ids = snapshot.ids[mask][complete].tolist()
+    groups = snapshot.groups[mask][complete].tolist()
 
-    if not vectors:
+    if len(vectors) == 0:
         return np.array([]), [], []
 
-    return np.array(vectors), ids, groups
+    return vectors, ids, groups
 
 
 def run_clustering(
@@ -175,6 +171,7 @@ def run_clustering(
             thumb.cluster_x = float(X_2d[i, 0])
             thumb.cluster_y = float(X_2d[i, 1])
 
+    bump_dataset_version(db)
     db.commit()
 
     # Calculate cluster statistics
@@ -0,0 +1,179 @@
+"""Duplicate and near-duplicate thumbnail detection from stored image hashes."""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.thumbnail import Thumbnail
+
+
+_HASH_BITS = 64
+
+# Above this the 64 bits split into bands too narrow to bucket selectively
+# (10 -> 11 bands of 5-6 bits)
+MAX_HAMMING_DISTANCE = 10
+
+# Rows of the pairwise XOR computed at once, bounding memory per bucket
+_BLOCK_ROWS = 1024
+
+# Set bits in every byte value
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array."""
+    as_bytes = np.ascontiguousarray(values).view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def _close_pairs(values: np.ndarray, max_distance: int):
+    """Yield (i, j) index pairs, i < j, within max_distance bits."""
+    for start in range(0, len(values), _BLOCK_ROWS):
+        block = values[start:start + _BLOCK_ROWS]
+        distances = _popcount(block[:, None] ^ values[None, :])
+        rows, cols = np.nonzero(distances <= max_distance)
+        rows = rows + start
+        upper = cols > rows
+        yield from zip(rows[upper].tolist(), cols[upper].tolist())
+
+
+def _max_pairwise_distance(values: np.ndarray) -> int:
+    """Largest Hamming distance between any two of the given hashes."""
+    best = 0
+    for start in range(0, len(values), _BLOCK_ROWS):
+        block = values[start:start + _BLOCK_ROWS]
+        best = max(best, int(_popcount(block[:, None] ^ values[None, :]).max()))
+    return best
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self._parent[x] != x:
+            self._parent[x] = self._parent[self._parent[x]]
+            x = self._parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self._parent[rb] = ra
+
+
+def _band_masks(max_distance: int) -> List[tuple]:
+    """
+    Split the 64 hash bits into max_distance + 1 bands.
+
+    Two hashes within max_distance bits must agree exactly on at least one
+    band (pigeonhole), so bucketing on each band finds every candidate pair.
+    """
+    bands = max_distance + 1
+    width = _HASH_BITS // bands
+    masks = []
+    for i in range(bands):
+        start = i * width
+        end = _HASH_BITS if i == bands - 1 else start + width
+        masks.append((start, ((1 << (end - start)) - 1) << start))
+    return masks
+
+
+def find_near_duplicates(
+    db: Session,
+    max_distance: int = 4,
+    group: Optional[str] = None,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Cluster thumbnails whose perceptual hashes are within max_distance bits.
+
+    Args:
+        db: Database session
+        max_distance: Maximum Hamming distance between dHashes
+            (0 to MAX_HAMMING_DISTANCE)
+        group: Only consider thumbnails in this group
+        limit: Maximum number of clusters to return (largest first)
+
+    Returns:
+        Dictionary with cluster list and summary counts; each cluster's
+        max_distance is the largest distance between any two members
+
+    Raises:
+        ValueError: If max_distance is out of range
+    """
+    if not 0 <= max_distance <= MAX_HAMMING_DISTANCE:
+        raise ValueError(f"max_distance must be between 0 and {MAX_HAMMING_DISTANCE}")
+
+    query = db.query(
+        Thumbnail.id,
+        Thumbnail.group,
+        Thumbnail.channel,
+        Thumbnail.title,
+        Thumbnail.file_path,
+        Thumbnail.content_hash,
+        Thumbnail.phash,
+    ).filter(Thumbnail.phash != None, Thumbnail.is_stale == False)
+    if group:
+        query = query.filter(Thumbnail.group == group)
+    rows = query.all()
+
+    # Identical hashes collapse first, so buckets hold distinct values only
+    by_hash: Dict[str, list] = defaultdict(list)
+    for row in rows:
+        by_hash[row.phash].append(row)
+
+    hashes = list(by_hash)
+    values = np.array([int(h, 16) for h in hashes], dtype=np.uint64)
+    uf = _UnionFind(len(hashes))
+
+    if max_distance > 0 and len(hashes) > 1:
+        for shift, mask in _band_masks(max_distance):
+            keys = (values & np.uint64(mask)) >> np.uint64(shift)
+            order = np.argsort(keys, kind="stable")
+            boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+            for members in np.split(order, boundaries):
+                if len(members) < 2:
+                    continue
+                for i, j in _close_pairs(values[members], max_distance):
+                    uf.union(int(members[i]), int(members[j]))
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(hashes)):
+        clusters[uf.find(index)].append(index)
+
+    result = []
+    for indices in clusters.values():
+        members = [row for index in indices for row in by_hash[hashes[index]]]
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda r: r.id)
+        result.append({
+            "size": len(members),
+            "exact": len({m.content_hash for m in members}) == 1,
+            # Union-find chains members, so measure the true spread
+            "max_distance": _max_pairwise_distance(values[indices]),
+            "thumbnails": [
+                {
+                    "id": m.id,
+                    "group": m.group,
+                    "channel": m.channel,
+                    "title": m.title,
+                    "file_path": m.file_path,
+                    "phash": m.phash,
+                }
+                for m in members
+            ],
+        })
+
+    result.sort(key=lambda c: (-c["size"], c["thumbnails"][0]["id"]))
+
+    return {
+        "hashed_thumbnails": len(rows),
+        "max_distance": max_distance,
+        "total_clusters": len(result),
+        "duplicate_thumbnails": sum(c["size"] for c in result),
+        "clusters": result[:limit],
+    }
@@ -0,0 +1,284 @@
+"""In-memory columnar feature store for vectorized analytics."""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import PANEL_CHANNELS
+from app.models.features import (
+    NUMERIC_FEATURE_PATHS,
+    ThumbnailFeatures,
+    feature_column_name,
+)
+from app.models.thumbnail import Thumbnail
+from app.services.cache import bump_dataset_version, get_dataset_version
+
+
+logger = logging.getLogger(__name__)
+
+_BACKFILL_CHUNK_SIZE = 500
+
+
+class FeatureSnapshot:
+    """
+    Immutable view of every thumbnail's numeric features as NumPy arrays.
+
+    Row i of every array describes the same thumbnail. Missing feature
+    values are NaN.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        groups: np.ndarray,
+        channels: np.ndarray,
+        years: np.ndarray,
+        views: np.ndarray,
+        ctr: np.ndarray,
+        extracted: np.ndarray,
+        columns: Dict[str, np.ndarray],
+    ):
+        self.ids = ids
+        self.groups = groups
+        self.channels = channels
+        self.years = years
+        self.views = views
+        self.ctr = ctr
+        self.extracted = extracted
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def has_feature(self, feature_path: str) -> bool:
+        """Whether a dotted feature path is stored as a column."""
+        return feature_path in self.columns
+
+    def column(self, feature_path: str) -> np.ndarray:
+        """Float vector for a dotted feature path (NaN where missing)."""
+        return self.columns[feature_path]
+
+    def matrix(self, feature_paths: List[str]) -> np.ndarray:
+        """Stack several feature columns into an (N, len(paths)) matrix."""
+        if not feature_paths:
+            return np.empty((len(self), 0))
+        return np.column_stack([self.columns[p] for p in feature_paths])
+
+    def mask(
+        self,
+        group: Optional[str] = None,
+        extracted_only: bool = True,
+        panel_only: bool = False,
+    ) -> np.ndarray:
+        """
+        Boolean row mask for the common endpoint filters.
+
+        Args:
+            group: Keep only this group
+            extracted_only: Keep only thumbnails with features extracted
+            panel_only: Keep only MrBeast and panel-channel thumbnails
+
+        Returns:
+            Boolean array of length N
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if extracted_only:
+            mask &= self.extracted
+        if group:
+            mask &= self.groups == group
+        if panel_only:
+            mask &= (self.groups == "mrbeast") | np.isin(self.channels, PANEL_CHANNELS)
+        return mask
+
+
+def _empty_snapshot() -> FeatureSnapshot:
+    return FeatureSnapshot(
+        ids=np.empty(0, dtype=np.int64),
+        groups=np.empty(0, dtype=object),
+        channels=np.empty(0, dtype=object),
+        years=np.empty(0, dtype=float),
+        views=np.empty(0, dtype=float),
+        ctr=np.empty(0, dtype=float),
+        extracted=np.empty(0, dtype=bool),
+        columns={p: np.empty(0, dtype=float) for p in NUMERIC_FEATURE_PATHS},
+    )
+
+
+def _as_float(values: List[Any]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def backfill_feature_rows(db: Session) -> int:
+    """
+    Create columnar rows for thumbnails that only have a features_json blob.
+
+    Databases created before the columnar store existed have no rows in
+    thumbnail_features; this parses each blob once and fills them in.
+
+    Args:
+        db: Writable database session
+
+    Returns:
+        Number of rows created
+    """
+    created = 0
+    while True:
+        missing = (
+            db.query(Thumbnail)
+            .outerjoin(ThumbnailFeatures, ThumbnailFeatures.thumbnail_id == Thumbnail.id)
+            .filter(
+                Thumbnail.features_json != None,
+                ThumbnailFeatures.thumbnail_id == None,
+            )
+            .limit(_BACKFILL_CHUNK_SIZE)
+            .all()
+        )
+        if not missing:
+            break
+
+        for thumb in missing:
+            row = ThumbnailFeatures(thumbnail_id=thumb.id)
+            row.update_from_features(thumb.get_features())
+            db.add(row)
+        bump_dataset_version(db)
+        db.commit()
+        created += len(missing)
+
+    if created:
+        logger.info(f"Backfilled {created} columnar feature rows")
+    return created
+
+
+class FeatureStore:
+    """
+    Process-wide cache of the columnar feature table as NumPy arrays.
+
+    The cache is keyed on the dataset version counter, which every write
+    path bumps in the same transaction as its changes. Database triggers
+    stamp each changed thumbnail with the version it was written at, so
+    when the version moves only those rows are re-read and patched into
+    the arrays; a full reload happens only if rows were deleted.
+
+    The columnar rows themselves are filled in by backfill_feature_rows
+    (run by the boot backlog), never from here, so read-only sessions stay
+    read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[FeatureSnapshot] = None
+        self._version: Optional[int] = None
+
+    def _select(self):
+        columns = [
+            Thumbnail.id,
+            Thumbnail.group,
+            Thumbnail.channel,
+            Thumbnail.year,
+            Thumbnail.views,
+            Thumbnail.ctr,
+            Thumbnail.features_extracted,
+        ] + [
+            ThumbnailFeatures.__table__.c[feature_column_name(p)]
+            for p in NUMERIC_FEATURE_PATHS
+        ]
+        return select(*columns).select_from(Thumbnail).outerjoin(
+            ThumbnailFeatures, ThumbnailFeatures.thumbnail_id == Thumbnail.id
+        )
+
+    def _build(self, rows) -> FeatureSnapshot:
+        if not rows:
+            return _empty_snapshot()
+
+        cols = list(zip(*rows))
+        return FeatureSnapshot(
+            ids=np.array(cols[0], dtype=np.int64),
+            groups=np.array(cols[1], dtype=object),
+            channels=np.array(cols[2], dtype=object),
+            years=_as_float(cols[3]),
+            views=_as_float(cols[4]),
+            ctr=_as_float(cols[5]),
+            extracted=np.array([bool(v) for v in cols[6]], dtype=bool),
+            columns={
+                path: _as_float(cols[7 + i])
+                for i, path in enumerate(NUMERIC_FEATURE_PATHS)
+            },
+        )
+
+    def _patch(self, base: FeatureSnapshot, changed: FeatureSnapshot) -> FeatureSnapshot:
+        """Overwrite changed rows and append new ones."""
+        index = {int(tid): i for i, tid in enumerate(base.ids)}
+        positions = np.array([index.get(int(tid), -1) for tid in changed.ids], dtype=np.int64)
+        existing = positions >= 0
+        new = ~existing
+
+        def merge(old: np.ndarray, upd: np.ndarray) -> np.ndarray:
+            merged = old.copy()
+            merged[positions[existing]] = upd[existing]
+            return np.concatenate([merged, upd[new]])
+
+        return FeatureSnapshot(
+            ids=merge(base.ids, changed.ids),
+            groups=merge(base.groups, changed.groups),
+            channels=merge(base.channels, changed.channels),
+            years=merge(base.years, changed.years),
+            views=merge(base.views, changed.views),
+            ctr=merge(base.ctr, changed.ctr),
+            extracted=merge(base.extracted, changed.extracted),
+            columns={p: merge(base.columns[p], changed.columns[p]) for p in base.columns},
+        )
+
+    def snapshot(self, db: Session) -> FeatureSnapshot:
+        """
+        Return an up-to-date snapshot, refreshing it if the table changed.
+
+        Args:
+            db: Database session (read access is enough)
+
+        Returns:
+            FeatureSnapshot covering every thumbnail
+        """
+        version = get_dataset_version(db)
+        if self._snapshot is not None and version == self._version:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is not None and version == self._version:
+                return self._snapshot
+
+            # The version is read before the rows, so a write committing in
+            # between leaves the snapshot tagged older than its data and the
+            # next call refreshes; it is never tagged newer than its data.
+            snapshot = None
+            if self._snapshot is not None:
+                # Rows are stamped with the version current when they were
+                # written, which is never below the version of the snapshot
+                # that missed them, so >= catches every unseen change
+                count = db.query(func.count(Thumbnail.id)).scalar()
+                changed = db.execute(
+                    self._select().where(Thumbnail.data_version >= self._version)
+                ).all()
+                snapshot = self._patch(self._snapshot, self._build(changed))
+                if len(snapshot) != count:
+                    # Rows were deleted (or inserted mid-refresh): start over
+                    snapshot = None
+
+            if snapshot is None:
+                snapshot = self._build(db.execute(self._select().order_by(Thumbnail.id)).all())
+
+            self._snapshot = snapshot
+            self._version = version
+            return snapshot
+
+
+# Global store instance
+feature_store = FeatureStore()
+
+
+def get_feature_snapshot(db: Session) -> FeatureSnapshot:
+    """Convenience accessor for the global feature store."""
+    return feature_store.snapshot(db)
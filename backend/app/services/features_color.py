@@ -1,16 +1,128 @@
 """Color feature extraction module."""
 
-from typing import List, Tuple, Dict, Any
+import functools
+from typing import List, Tuple, Dict, Any, Optional
 import numpy as np
 import cv2
-from sklearn.cluster import KMeans
 
 from app.core.config import settings
-from app.utils.images import load_image, convert_to_hsv
-from app.utils.math import rgb_to_hex
+from app.services.palette import compute_palette, palette_to_hex
+from app.utils.images import ImageSource, as_image_context
 
 
-def extract_color_features(image_path: str) -> Dict[str, Any]:
+# OpenCV stores hue as 0-179 (degrees / 2)
+_HUE_VALUES = 180
+_HUES = np.arange(_HUE_VALUES)
+
+# Warm: 0-30 (red-yellow) and 150-179 (red-magenta)
+# Cool: 31-149 (yellow-green-cyan-blue-purple)
+_WARM_HUES = (_HUES <= 30) | (_HUES >= 150)
+
+
+@functools.lru_cache(maxsize=8)
+def _hue_fold_matrix(bins: int) -> np.ndarray:
+    """One-hot (180, bins) matrix folding per-hue counts into uniform bins."""
+    fold = np.zeros((_HUE_VALUES, bins))
+    fold[_HUES, (_HUES * bins) // _HUE_VALUES] = 1.0
+    return fold
+
+
+def _summarize_color_counts(
+    hue_counts: np.ndarray,
+    saturation_means: np.ndarray,
+    brightness_means: np.ndarray,
+    bins: int,
+) -> List[Dict[str, Any]]:
+    """
+    Turn per-hue pixel counts and channel means into color statistics.
+
+    Args:
+        hue_counts: (n, 180) pixel counts per OpenCV hue value
+        saturation_means: (n,) mean saturation on the 0-255 scale
+        brightness_means: (n,) mean value on the 0-255 scale
+        bins: Number of hue histogram bins
+
+    Returns:
+        One statistics dictionary per image
+    """
+    totals = hue_counts.sum(axis=1)
+    safe_totals = np.where(totals > 0, totals, 1)
+    hue_hist = (hue_counts @ _hue_fold_matrix(bins)) / safe_totals[:, None]
+    warm = hue_counts[:, _WARM_HUES].sum(axis=1)
+    warm_cool = (2 * warm - totals) / safe_totals
+
+    return [
+        {
+            "avg_saturation": round(float(saturation_means[i]) / 255.0, 4),
+            "avg_brightness": round(float(brightness_means[i]) / 255.0, 4),
+            "hue_hist": [round(float(v), 4) for v in hue_hist[i]],
+            "warm_cool_score": round(float(warm_cool[i]), 4),
+        }
+        for i in range(len(totals))
+    ]
+
+
+def color_statistics(hsv: np.ndarray, bins: int = 36) -> Dict[str, Any]:
+    """
+    Saturation/brightness means, hue histogram and warm/cool score of an image.
+
+    One 180-bin hue histogram provides both the binned histogram and the
+    warm/cool counts, and cv2.mean averages all channels in place, so no
+    per-channel copies or full-image masks are made.
+
+    Args:
+        hsv: HSV image (OpenCV ranges)
+        bins: Number of hue histogram bins
+
+    Returns:
+        Dictionary with avg_saturation, avg_brightness, hue_hist and
+        warm_cool_score
+    """
+    hue_counts = cv2.calcHist([hsv], [0], None, [_HUE_VALUES], [0, _HUE_VALUES])
+    _, saturation, brightness, _ = cv2.mean(hsv)
+    return _summarize_color_counts(
+        hue_counts.reshape(1, -1),
+        np.array([saturation]),
+        np.array([brightness]),
+        bins,
+    )[0]
+
+
+def color_statistics_batch(
+    hsv_images: List[np.ndarray], bins: int = 36
+) -> List[Dict[str, Any]]:
+    """
+    color_statistics for several images at once.
+
+    All pixels are stacked into one array and every image's hue counts
+    and channel sums come out of a single bincount each.
+
+    Args:
+        hsv_images: HSV images (any sizes)
+        bins: Number of hue histogram bins
+
+    Returns:
+        One statistics dictionary per image, in input order
+    """
+    if not hsv_images:
+        return []
+
+    sizes = np.array([img.shape[0] * img.shape[1] for img in hsv_images])
+    pixels = np.concatenate([img.reshape(-1, 3) for img in hsv_images])
+    owner = np.repeat(np.arange(len(hsv_images)), sizes)
+
+    hue_counts = np.bincount(
+        owner * _HUE_VALUES + pixels[:, 0],
+        minlength=len(hsv_images) * _HUE_VALUES,
+    ).reshape(len(hsv_images), _HUE_VALUES)
+    safe_sizes = np.where(sizes > 0, sizes, 1)
+    saturation = np.bincount(owner, weights=pixels[:, 1], minlength=len(sizes)) / safe_sizes
+    brightness = np.bincount(owner, weights=pixels[:, 2], minlength=len(sizes)) / safe_sizes
+
+    return _summarize_color_counts(hue_counts, saturation, brightness, bins)
+
+
+def extract_color_features(image: ImageSource) -> Dict[str, Any]:
     """
     Extract color-related features from an image.
 
@@ -21,41 +133,65 @@ def extract_color_features(image_path: str) -> Dict[str, Any]:
     - dominant_palette: List of dominant colors (RGB hex)
     - warm_cool_score: Ratio of warm to cool colors (-1 to 1)
 
+    Statistics are computed at settings.COLOR_ANALYSIS_SIZE; the palette
+    uses the regular processing size.
+
     Args:
-        image_path: Path to the image file
+        image: ImageContext (or path) for the thumbnail
 
     Returns:
         Dictionary of color features
     """
-    img = load_image(image_path, max_size=settings.MAX_IMAGE_SIZE)
+    ctx = as_image_context(image)
+    img = ctx.bgr_at(settings.MAX_IMAGE_SIZE)
     if img is None:
         return {}
 
-    # Convert to HSV
-    hsv = convert_to_hsv(img)
-    h, s, v = cv2.split(hsv)
+    stats = color_statistics(
+        ctx.hsv_at(settings.COLOR_ANALYSIS_SIZE), bins=settings.HUE_HISTOGRAM_BINS
+    )
+    return _with_palette(stats, img)
+
 
-    # Calculate average saturation and brightness (normalized to 0-1)
-    avg_saturation = float(np.mean(s) / 255.0)
-    avg_brightness = float(np.mean(v) / 255.0)
+def extract_color_features_batch(images: List[ImageSource]) -> List[Dict[str, Any]]:
+    """
+    Extract color features for several images, batching the statistics.
+
+    Args:
+        images: ImageContexts (or paths) for the thumbnails
+
+    Returns:
+        List of color feature dictionaries, in input order. Images that
+        cannot be decoded get an empty dictionary.
+    """
+    contexts = [as_image_context(image) for image in images]
+    results: List[Dict[str, Any]] = [{} for _ in contexts]
 
-    # Calculate hue histogram (36 bins for 10-degree increments)
-    hue_hist = calculate_hue_histogram(h, bins=settings.HUE_HISTOGRAM_BINS)
+    decoded = []
+    for i, ctx in enumerate(contexts):
+        img = ctx.bgr_at(settings.MAX_IMAGE_SIZE)
+        if img is not None:
+            decoded.append((i, img, ctx.hsv_at(settings.COLOR_ANALYSIS_SIZE)))
 
-    # Extract dominant colors using k-means
-    dominant_palette = extract_dominant_colors(
-        img, k=settings.COLOR_KMEANS_CLUSTERS
+    stats_list = color_statistics_batch(
+        [hsv for _, _, hsv in decoded], bins=settings.HUE_HISTOGRAM_BINS
     )
+    for (i, img, _), stats in zip(decoded, stats_list):
+        results[i] = _with_palette(stats, img)
 
-    # Calculate warm/cool score
-    warm_cool_score = calculate_warm_cool_score(h)
+    return results
 
+
+def _with_palette(stats: Dict[str, Any], img: np.ndarray) -> Dict[str, Any]:
+    """Add the dominant palette to color statistics, in payload key order."""
     return {
-        "avg_saturation": round(avg_saturation, 4),
-        "avg_brightness": round(avg_brightness, 4),
-        "hue_hist": [round(v, 4) for v in hue_hist],
-        "dominant_palette": dominant_palette,
-        "warm_cool_score": round(warm_cool_score, 4),
+        "avg_saturation": stats["avg_saturation"],
+        "avg_brightness": stats["avg_brightness"],
+        "hue_hist": stats["hue_hist"],
+        "dominant_palette": extract_dominant_colors(
+            img, k=settings.COLOR_KMEANS_CLUSTERS
+        ),
+        "warm_cool_score": stats["warm_cool_score"],
     }
 
 
@@ -72,10 +208,8 @@ def calculate_hue_histogram(
     Returns:
         Normalized histogram as list of floats
     """
-    # OpenCV hue is 0-179, scale bins accordingly
-    # Use cv2.calcHist to avoid numpy 2.x histogram broadcasting bug
-    hist = cv2.calcHist([hue_channel], [0], None, [bins], [0, 180])
-    hist = hist.flatten().astype(float)
+    hue_counts = cv2.calcHist([hue_channel], [0], None, [_HUE_VALUES], [0, _HUE_VALUES])
+    hist = hue_counts.reshape(-1) @ _hue_fold_matrix(bins)
 
     # Normalize
     total = hist.sum()
@@ -86,46 +220,23 @@ def calculate_hue_histogram(
 
 
 def extract_dominant_colors(
-    img: np.ndarray, k: int = 5
+    img: np.ndarray, k: int = 5, backend: Optional[str] = None
 ) -> List[str]:
     """
-    Extract dominant colors using k-means clustering.
+    Extract dominant colors with a palette backend (see app.services.palette).
 
     Args:
         img: BGR image array
         k: Number of clusters/colors
+        backend: Palette backend (default: settings.COLOR_PALETTE_BACKEND)
 
     Returns:
         List of hex color strings sorted by frequency
     """
-    # Reshape to list of pixels (BGR)
-    pixels = img.reshape(-1, 3).astype(np.float32)
-
-    # Subsample for performance (max 10k pixels)
-    if len(pixels) > 10000:
-        indices = np.random.choice(len(pixels), 10000, replace=False)
-        pixels = pixels[indices]
-
-    # Run k-means
-    kmeans = KMeans(n_clusters=k, n_init=10, max_iter=100, random_state=42)
-    kmeans.fit(pixels)
-
-    # Get cluster centers and counts
-    centers = kmeans.cluster_centers_
-    labels = kmeans.labels_
-    counts = np.bincount(labels, minlength=k)
-
-    # Sort by frequency (most common first)
-    sorted_indices = np.argsort(-counts)
-
-    # Convert to hex colors (BGR -> RGB -> hex)
-    colors = []
-    for idx in sorted_indices:
-        bgr = centers[idx].astype(int)
-        rgb = (int(bgr[2]), int(bgr[1]), int(bgr[0]))  # BGR to RGB
-        colors.append(rgb_to_hex(rgb))
-
-    return colors
+    centers, counts = compute_palette(
+        img, k, backend or settings.COLOR_PALETTE_BACKEND
+    )
+    return palette_to_hex(centers, counts)
 
 
 def calculate_warm_cool_score(hue_channel: np.ndarray) -> float:
@@ -141,28 +252,17 @@ def calculate_warm_cool_score(hue_channel: np.ndarray) -> float:
     Returns:
         Score from -1 (all cool) to 1 (all warm)
     """
-    # OpenCV hue is 0-179 (0-360 degrees / 2)
-    # Warm: 0-30 (red-yellow) and 150-179 (red-magenta)
-    # Cool: 30-150 (yellow-green-cyan-blue-purple)
-
-    h_flat = hue_channel.flatten()
+    hue_counts = cv2.calcHist(
+        [hue_channel], [0], None, [_HUE_VALUES], [0, _HUE_VALUES]
+    ).reshape(-1)
 
-    # Count warm pixels
-    warm_mask = (h_flat <= 30) | (h_flat >= 150)
-    warm_count = np.sum(warm_mask)
-
-    # Count cool pixels
-    cool_mask = (h_flat > 30) & (h_flat < 150)
-    cool_count = np.sum(cool_mask)
-
-    total = warm_count + cool_count
+    total = hue_counts.sum()
     if total == 0:
         return 0.0
 
     # Score: (warm - cool) / total -> range [-1, 1]
-    score = (warm_count - cool_count) / total
-
-    return float(score)
+    warm_count = hue_counts[_WARM_HUES].sum()
+    return float((2 * warm_count - total) / total)
 
 
 def get_color_stats(features: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,173 +1,418 @@
 """Depth feature extraction module using MiDaS."""
 
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+import importlib.util
+import logging
+import threading
 import numpy as np
 import cv2
 
-try:
-    import torch
-
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
-
 from app.core.config import settings
-from app.utils.images import load_image_rgb
+from app.utils.images import ImageSource, as_image_context
 from app.utils.math import calculate_center_of_mass, safe_divide
 
 
+logger = logging.getLogger(__name__)
+
 # Global model cache to avoid reloading
 _midas_model = None
-_midas_transform = None
-_midas_device = None
+_midas_lock = threading.Lock()
+
+# torch is imported on first use so API processes that never run depth
+# do not pay its import cost
+_torch = None
+
+# MiDaS_small input preprocessing (mirrors the hub "small_transform")
+MIDAS_INPUT_SIZE = 256
+MIDAS_SIZE_MULTIPLE = 32
+MIDAS_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+MIDAS_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def _default_depth_features(error: Optional[str] = None) -> Dict[str, Any]:
+    """Neutral depth features returned when depth cannot be computed."""
+    result = {
+        "depth_contrast": 0.0,
+        "foreground_ratio": 0.0,
+        "subject_depth_center": {"x": 0.5, "y": 0.5},
+        "depth_range": 0.0,
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def _import_torch():
+    """Import torch on first use and cache the module."""
+    global _torch
+
+    if _torch is None:
+        try:
+            import torch
+        except ImportError:
+            raise RuntimeError("torch not available")
+        _torch = torch
+    return _torch
+
+
+def _depth_backend_error() -> Optional[str]:
+    """
+    Check whether the configured depth backend is installed, without importing it.
+
+    Returns:
+        None if the backend is available, else a message naming the
+        backend that is missing
+    """
+    path = settings.DEPTH_MODEL_PATH
+    if path.suffix == ".onnx" and path.exists():
+        if importlib.util.find_spec("onnxruntime") is None:
+            return f"onnxruntime not available (required by ONNX depth model {path})"
+        return None
+    if importlib.util.find_spec("torch") is None:
+        return "torch not available"
+    return None
+
+
+class _TorchDepthModel:
+    """MiDaS running under torch (TorchScript file or torch.hub module)."""
+
+    def __init__(self, module, device):
+        self.module = module
+        self.device = device
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        torch = _import_torch()
+        with torch.no_grad():
+            prediction = self.module(torch.from_numpy(batch).to(self.device))
+        return prediction.cpu().numpy()
+
+
+class _OnnxDepthModel:
+    """MiDaS exported to ONNX, running under onnxruntime."""
+
+    def __init__(self, session):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+def _load_onnx_model(path: Path) -> _OnnxDepthModel:
+    """Create an onnxruntime session for an exported MiDaS model."""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise RuntimeError("onnxruntime not available")
+
+    options = ort.SessionOptions()
+    if settings.DEPTH_TORCH_THREADS > 0:
+        options.intra_op_num_threads = settings.DEPTH_TORCH_THREADS
+    session = ort.InferenceSession(
+        str(path), sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    return _OnnxDepthModel(session)
+
+
+def _load_torch_model(path: Path) -> _TorchDepthModel:
+    """Load a TorchScript MiDaS model, falling back to torch.hub if allowed."""
+    torch = _import_torch()
+
+    if settings.DEPTH_TORCH_THREADS > 0:
+        torch.set_num_threads(settings.DEPTH_TORCH_THREADS)
+
+    # Determine device
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    if path.exists():
+        module = torch.jit.load(str(path), map_location=device)
+    elif settings.DEPTH_ALLOW_HUB_DOWNLOAD:
+        logger.warning(
+            f"MiDaS weights not found at {path}, loading from torch.hub "
+            "(run scripts/export_midas.py to package them locally)"
+        )
+        # Load MiDaS model (using smaller model for speed)
+        # Options: "MiDaS_small", "DPT_Hybrid", "DPT_Large"
+        module = torch.hub.load("intel-isl/MiDaS", "MiDaS_small", trust_repo=True)
+    else:
+        raise RuntimeError(f"MiDaS weights not found at {path}")
+
+    module.to(device)
+    module.eval()
+    return _TorchDepthModel(module, device)
 
 
 def get_midas_model():
     """
     Load and cache the MiDaS model.
 
+    Loads DEPTH_MODEL_PATH from disk: an ``.onnx`` file runs under
+    onnxruntime, anything else is treated as a TorchScript export. torch.hub
+    is only used when the file is missing and DEPTH_ALLOW_HUB_DOWNLOAD is set.
+
     Returns:
-        Tuple of (model, transform, device)
+        Model object with a ``predict(batch) -> depth`` method
+
+    Raises:
+        RuntimeError: If the backend cannot load the model; the message
+            names the backend and the underlying error
     """
-    global _midas_model, _midas_transform, _midas_device
+    global _midas_model
 
     if _midas_model is not None:
-        return _midas_model, _midas_transform, _midas_device
+        return _midas_model
+
+    with _midas_lock:
+        if _midas_model is None:
+            path = settings.DEPTH_MODEL_PATH
+            if path.suffix == ".onnx" and path.exists():
+                backend, loader = "onnxruntime", _load_onnx_model
+            else:
+                backend, loader = "torch", _load_torch_model
+            try:
+                _midas_model = loader(path)
+            except Exception as e:
+                raise RuntimeError(
+                    f"{backend} failed to load depth model {path}: {e}"
+                ) from e
+
+    return _midas_model
+
+
+def _constrain_to_multiple(value: float, max_val: int) -> int:
+    """Round to a multiple of MIDAS_SIZE_MULTIPLE without exceeding max_val."""
+    m = MIDAS_SIZE_MULTIPLE
+    result = int(np.round(value / m) * m)
+    if result > max_val:
+        result = int(np.floor(value / m) * m)
+    return max(result, m)
+
+
+def _midas_input_shape(height: int, width: int) -> Tuple[int, int]:
+    """
+    Network input size for an image, keeping aspect ratio.
 
-    if not TORCH_AVAILABLE:
-        return None, None, None
+    Fits the image inside MIDAS_INPUT_SIZE x MIDAS_INPUT_SIZE and snaps both
+    sides to multiples of 32, as the MiDaS small transform does.
+    """
+    scale = min(MIDAS_INPUT_SIZE / height, MIDAS_INPUT_SIZE / width)
+    new_height = _constrain_to_multiple(scale * height, MIDAS_INPUT_SIZE)
+    new_width = _constrain_to_multiple(scale * width, MIDAS_INPUT_SIZE)
+    return new_height, new_width
 
-    # Determine device
-    _midas_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-    # Load MiDaS model (using smaller model for speed)
-    # Options: "MiDaS_small", "DPT_Hybrid", "DPT_Large"
-    _midas_model = torch.hub.load("intel-isl/MiDaS", "MiDaS_small", trust_repo=True)
-    _midas_model.to(_midas_device)
-    _midas_model.eval()
+def prepare_midas_input(img: np.ndarray) -> np.ndarray:
+    """
+    Resize and normalize an RGB image into a CHW float32 network input.
+
+    Args:
+        img: RGB image array (uint8)
 
-    # Load transforms
-    midas_transforms = torch.hub.load("intel-isl/MiDaS", "transforms", trust_repo=True)
-    _midas_transform = midas_transforms.small_transform
+    Returns:
+        Array of shape (3, H, W)
+    """
+    new_height, new_width = _midas_input_shape(*img.shape[:2])
+    resized = cv2.resize(
+        img.astype(np.float32) / 255.0,
+        (new_width, new_height),
+        interpolation=cv2.INTER_CUBIC,
+    )
+    normalized = (resized - MIDAS_MEAN) / MIDAS_STD
+    return np.ascontiguousarray(normalized.transpose(2, 0, 1), dtype=np.float32)
 
-    return _midas_model, _midas_transform, _midas_device
 
+def _letterbox_batch(inputs: List[np.ndarray]) -> np.ndarray:
+    """
+    Stack CHW inputs of different sizes into one zero-padded batch.
 
-def extract_depth_features(
-    image_path: str, save_depth_map: bool = False
-) -> Dict[str, Any]:
+    Each input is placed in the top-left corner of a canvas as large as the
+    biggest input in the batch. Thumbnails mostly share an aspect ratio,
+    so in practice little or no padding is added.
     """
-    Extract depth-related features from an image using MiDaS.
+    max_h = max(x.shape[1] for x in inputs)
+    max_w = max(x.shape[2] for x in inputs)
+    batch = np.zeros((len(inputs), 3, max_h, max_w), dtype=np.float32)
+    for i, x in enumerate(inputs):
+        batch[i, :, : x.shape[1], : x.shape[2]] = x
+    return batch
 
-    Features:
-    - depth_contrast: Standard deviation of depth map (normalized)
-    - foreground_ratio: Fraction of pixels in foreground (closer than median)
-    - subject_depth_center: Center of mass of closest region (x, y normalized)
-    - depth_range: Range of depth values (max - min, normalized)
+
+def predict_depth_maps(images: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Run MiDaS on a list of RGB images in batches.
+
+    Images are letterboxed to a common size, run through the network
+    DEPTH_BATCH_SIZE at a time, then cropped back to their own region and
+    resized to their original resolution.
+
+    Args:
+        images: RGB image arrays (any sizes)
+
+    Returns:
+        Raw (unnormalized) depth maps, one per input, at input resolution
+    """
+    model = get_midas_model()
+
+    batch_size = max(1, settings.DEPTH_BATCH_SIZE)
+    depth_maps: List[np.ndarray] = []
+
+    for start in range(0, len(images), batch_size):
+        chunk = images[start:start + batch_size]
+        inputs = [prepare_midas_input(img) for img in chunk]
+        batch = _letterbox_batch(inputs)
+
+        prediction = model.predict(batch)
+        if prediction.ndim == 4:
+            prediction = prediction[:, 0]
+
+        out_h, out_w = prediction.shape[1:]
+        in_h, in_w = batch.shape[2:]
+
+        for img, x, depth in zip(chunk, inputs, prediction):
+            # Crop away the letterbox padding, scaled to output resolution
+            crop_h = max(1, int(round(out_h * x.shape[1] / in_h)))
+            crop_w = max(1, int(round(out_w * x.shape[2] / in_w)))
+            depth = np.ascontiguousarray(depth[:crop_h, :crop_w])
+
+            # Resize to original image size
+            depth_maps.append(cv2.resize(
+                depth,
+                (img.shape[1], img.shape[0]),
+                interpolation=cv2.INTER_CUBIC,
+            ))
+
+    return depth_maps
+
+
+def compute_depth_features(
+    depth_np: np.ndarray,
+    image_path: Optional[str] = None,
+    save_depth_map: bool = False,
+) -> Dict[str, Any]:
+    """
+    Derive depth features from a raw MiDaS depth map.
 
     Args:
-        image_path: Path to the image file
+        depth_np: Raw depth map (higher = closer)
+        image_path: Original image path (used to name the saved depth map)
         save_depth_map: If True, save the depth map to outputs directory
 
     Returns:
         Dictionary of depth features
     """
-    if not TORCH_AVAILABLE:
-        return {
-            "depth_contrast": 0.0,
-            "foreground_ratio": 0.0,
-            "subject_depth_center": {"x": 0.5, "y": 0.5},
-            "depth_range": 0.0,
-            "error": "torch not available",
-        }
+    # Normalize depth map to 0-1
+    depth_min = depth_np.min()
+    depth_max = depth_np.max()
+    if depth_max > depth_min:
+        depth_normalized = (depth_np - depth_min) / (depth_max - depth_min)
+    else:
+        depth_normalized = np.zeros_like(depth_np)
+
+    # Calculate features
+    depth_contrast = float(np.std(depth_normalized))
+    depth_range = float(depth_max - depth_min) / float(max(depth_max, 1e-6))
+
+    # Foreground ratio (pixels closer than median)
+    # In MiDaS, higher values = closer to camera
+    median_depth = np.median(depth_normalized)
+    foreground_mask = depth_normalized > median_depth
+    foreground_ratio = float(np.mean(foreground_mask))
+
+    # Subject center (center of mass of closest 20% pixels)
+    threshold = np.percentile(depth_normalized, 80)  # Top 20% = closest
+    close_mask = depth_normalized > threshold
+    subject_center = calculate_center_of_mass(close_mask)
+
+    # Optionally save depth map
+    depth_map_path = None
+    if save_depth_map and image_path:
+        depth_map_path = save_depth_map_image(image_path, depth_normalized)
+
+    result = {
+        "depth_contrast": round(depth_contrast, 4),
+        "foreground_ratio": round(foreground_ratio, 4),
+        "subject_depth_center": {
+            "x": round(subject_center[0], 4),
+            "y": round(subject_center[1], 4),
+        },
+        "depth_range": round(depth_range, 4),
+    }
 
-    img = load_image_rgb(image_path, max_size=settings.DEPTH_IMAGE_SIZE)
-    if img is None:
-        return {}
+    if depth_map_path:
+        result["depth_map_path"] = depth_map_path
 
-    try:
-        model, transform, device = get_midas_model()
-        if model is None:
-            return {
-                "depth_contrast": 0.0,
-                "foreground_ratio": 0.0,
-                "subject_depth_center": {"x": 0.5, "y": 0.5},
-                "depth_range": 0.0,
-                "error": "MiDaS model not available",
-            }
-
-        # Prepare input
-        input_batch = transform(img).to(device)
-
-        # Run inference
-        with torch.no_grad():
-            depth_map = model(input_batch)
+    return result
 
-            # Resize to original image size
-            depth_map = torch.nn.functional.interpolate(
-                depth_map.unsqueeze(1),
-                size=img.shape[:2],
-                mode="bicubic",
-                align_corners=False,
-            ).squeeze()
-
-        # Convert to numpy
-        depth_np = depth_map.cpu().numpy()
-
-        # Normalize depth map to 0-1
-        depth_min = depth_np.min()
-        depth_max = depth_np.max()
-        if depth_max > depth_min:
-            depth_normalized = (depth_np - depth_min) / (depth_max - depth_min)
-        else:
-            depth_normalized = np.zeros_like(depth_np)
-
-        # Calculate features
-        depth_contrast = float(np.std(depth_normalized))
-        depth_range = float(depth_max - depth_min) / float(max(depth_max, 1e-6))
-
-        # Foreground ratio (pixels closer than median)
-        # In MiDaS, higher values = closer to camera
-        median_depth = np.median(depth_normalized)
-        foreground_mask = depth_normalized > median_depth
-        foreground_ratio = float(np.mean(foreground_mask))
-
-        # Subject center (center of mass of closest 20% pixels)
-        threshold = np.percentile(depth_normalized, 80)  # Top 20% = closest
-        close_mask = depth_normalized > threshold
-        subject_center = calculate_center_of_mass(close_mask)
-
-        # Optionally save depth map
-        depth_map_path = None
-        if save_depth_map:
-            depth_map_path = save_depth_map_image(
-                image_path, depth_normalized
-            )
 
-        result = {
-            "depth_contrast": round(depth_contrast, 4),
-            "foreground_ratio": round(foreground_ratio, 4),
-            "subject_depth_center": {
-                "x": round(subject_center[0], 4),
-                "y": round(subject_center[1], 4),
-            },
-            "depth_range": round(depth_range, 4),
-        }
+def extract_depth_features_batch(
+    images: List[ImageSource], save_depth_map: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Extract depth features for several images with batched MiDaS inference.
+
+    Args:
+        images: ImageContexts (or paths) for the thumbnails
+        save_depth_map: If True, save each depth map to outputs directory
+
+    Returns:
+        List of depth feature dictionaries, in input order. Images that
+        cannot be decoded get an empty dictionary.
+    """
+    backend_error = _depth_backend_error()
+    if backend_error:
+        return [_default_depth_features(backend_error) for _ in images]
+
+    contexts = [as_image_context(image) for image in images]
+    results: List[Dict[str, Any]] = [{} for _ in contexts]
 
-        if depth_map_path:
-            result["depth_map_path"] = depth_map_path
+    decoded = []
+    for i, ctx in enumerate(contexts):
+        img = ctx.rgb_at(settings.DEPTH_IMAGE_SIZE)
+        if img is not None:
+            decoded.append((i, img))
 
-        return result
+    if not decoded:
+        return results
 
+    try:
+        depth_maps = predict_depth_maps([img for _, img in decoded])
     except Exception as e:
-        return {
-            "depth_contrast": 0.0,
-            "foreground_ratio": 0.0,
-            "subject_depth_center": {"x": 0.5, "y": 0.5},
-            "depth_range": 0.0,
-            "error": str(e),
-        }
+        for i, _ in decoded:
+            results[i] = _default_depth_features(str(e))
+        return results
+
+    for (i, _), depth_np in zip(decoded, depth_maps):
+        try:
+            results[i] = compute_depth_features(
+                depth_np, contexts[i].path, save_depth_map=save_depth_map
+            )
+        except Exception as e:
+            results[i] = _default_depth_features(str(e))
+
+    return results
+
+
+def extract_depth_features(
+    image: ImageSource, save_depth_map: bool = False
+) -> Dict[str, Any]:
+    """
+    Extract depth-related features from an image using MiDaS.
+
+    Features:
+    - depth_contrast: Standard deviation of depth map (normalized)
+    - foreground_ratio: Fraction of pixels in foreground (closer than median)
+    - subject_depth_center: Center of mass of closest region (x, y normalized)
+    - depth_range: Range of depth values (max - min, normalized)
+
+    Args:
+        image: ImageContext (or path) for the thumbnail
+        save_depth_map: If True, save the depth map to outputs directory
+
+    Returns:
+        Dictionary of depth features
+    """
+    return extract_depth_features_batch([image], save_depth_map=save_depth_map)[0]
 
 
 def save_depth_map_image(
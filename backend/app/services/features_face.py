@@ -1,5 +1,6 @@
 """Face feature extraction module using MediaPipe Tasks API."""
 
+import logging
 from typing import Dict, Any, List, Tuple, Optional
 from pathlib import Path
 import numpy as np
@@ -14,9 +15,13 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
 
 from app.core.config import settings
-from app.utils.images import load_image_rgb, get_image_area
+from app.services import model_registry
+from app.utils.images import ImageSource, as_image_context, get_image_area
 from app.utils.math import euclidean_distance, safe_divide
 
+
+logger = logging.getLogger(__name__)
+
 # Model paths - relative to backend directory
 MODEL_DIR = Path(__file__).parent.parent.parent / "models"
 FACE_DETECTOR_MODEL = MODEL_DIR / "blaze_face_short_range.tflite"
@@ -40,7 +45,51 @@ LANDMARKS = {
 }
 
 
-def extract_face_features(image_path: str) -> Dict[str, Any]:
+def _create_face_detector():
+    """Build a FaceDetector task (called once per pool slot)."""
+    base_options = mp_tasks.BaseOptions(model_asset_path=str(FACE_DETECTOR_MODEL))
+    options = vision.FaceDetectorOptions(
+        base_options=base_options,
+        min_detection_confidence=0.5,
+    )
+    return vision.FaceDetector.create_from_options(options)
+
+
+def _create_face_landmarker():
+    """Build a FaceLandmarker task (called once per pool slot)."""
+    base_options = mp_tasks.BaseOptions(model_asset_path=str(FACE_LANDMARKER_MODEL))
+    options = vision.FaceLandmarkerOptions(
+        base_options=base_options,
+        num_faces=1,
+        min_face_detection_confidence=0.5,
+        min_face_presence_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+    return vision.FaceLandmarker.create_from_options(options)
+
+
+def _default_proxies() -> Dict[str, float]:
+    return {
+        "smile_score": 0.0,
+        "mouth_open_score": 0.0,
+        "brow_raise_score": 0.0,
+    }
+
+
+def _empty_face_features(error: Optional[str] = None) -> Dict[str, Any]:
+    result = {
+        "face_count": 0,
+        "largest_face_area_ratio": 0.0,
+        "avg_face_area_ratio": 0.0,
+        "emotion_proxies": _default_proxies(),
+        "faces": [],
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def extract_face_features(image: ImageSource) -> Dict[str, Any]:
     """
     Extract face-related features from an image.
 
@@ -49,41 +98,28 @@ def extract_face_features(image_path: str) -> Dict[str, Any]:
     - largest_face_area_ratio: Largest face bbox area / image area
     - avg_face_area_ratio: Average face area ratio
     - emotion_proxies: smile_score, mouth_open_score, brow_raise_score
+      of the largest face
+    - faces: Per-face boxes (as image fractions) and emotion proxies,
+      largest first
+
+    Faces are detected once; landmarks then run on a crop around each
+    detected box (see analyze_faces).
 
     Args:
-        image_path: Path to the image file
+        image: ImageContext (or path) for the thumbnail
 
     Returns:
         Dictionary of face features
     """
     if not MEDIAPIPE_AVAILABLE:
-        return {
-            "face_count": 0,
-            "largest_face_area_ratio": 0.0,
-            "avg_face_area_ratio": 0.0,
-            "emotion_proxies": {
-                "smile_score": 0.0,
-                "mouth_open_score": 0.0,
-                "brow_raise_score": 0.0,
-            },
-            "error": "mediapipe not available",
-        }
+        return _empty_face_features("mediapipe not available")
 
     # Check if model files exist
     if not FACE_DETECTOR_MODEL.exists():
-        return {
-            "face_count": 0,
-            "largest_face_area_ratio": 0.0,
-            "avg_face_area_ratio": 0.0,
-            "emotion_proxies": {
-                "smile_score": 0.0,
-                "mouth_open_score": 0.0,
-                "brow_raise_score": 0.0,
-            },
-            "error": f"face detector model not found at {FACE_DETECTOR_MODEL}",
-        }
-
-    img = load_image_rgb(image_path, max_size=settings.MAX_IMAGE_SIZE)
+        return _empty_face_features(f"face detector model not found at {FACE_DETECTOR_MODEL}")
+
+    ctx = as_image_context(image)
+    img = ctx.rgb_at(settings.MAX_IMAGE_SIZE)
     if img is None:
         return {}
 
@@ -95,30 +131,23 @@ def extract_face_features(image_path: str) -> Dict[str, Any]:
     face_count = len(face_boxes)
 
     if face_count == 0:
-        return {
-            "face_count": 0,
-            "largest_face_area_ratio": 0.0,
-            "avg_face_area_ratio": 0.0,
-            "emotion_proxies": {
-                "smile_score": 0.0,
-                "mouth_open_score": 0.0,
-                "brow_raise_score": 0.0,
-            },
-        }
+        return _empty_face_features()
 
     # Calculate face area ratios
     face_areas = [box["width"] * box["height"] for box in face_boxes]
     largest_face_area_ratio = safe_divide(max(face_areas), img_area)
     avg_face_area_ratio = safe_divide(sum(face_areas) / len(face_areas), img_area)
 
-    # Get emotion proxies from the largest face using FaceLandmarker
-    emotion_proxies = extract_emotion_proxies(image_path)
+    # Landmarks and emotion proxies for every face, from the same array
+    faces = analyze_faces(img, face_boxes)
+    largest = faces[0]["emotion_proxies"] if faces else None
 
     return {
         "face_count": face_count,
         "largest_face_area_ratio": round(largest_face_area_ratio, 4),
         "avg_face_area_ratio": round(avg_face_area_ratio, 4),
-        "emotion_proxies": emotion_proxies,
+        "emotion_proxies": largest or _default_proxies(),
+        "faces": faces,
     }
 
 
@@ -137,14 +166,8 @@ def detect_faces(img: np.ndarray, img_width: int, img_height: int) -> List[Dict]
     face_boxes = []
 
     try:
-        # Create FaceDetector
-        base_options = mp_tasks.BaseOptions(model_asset_path=str(FACE_DETECTOR_MODEL))
-        options = vision.FaceDetectorOptions(
-            base_options=base_options,
-            min_detection_confidence=0.5,
-        )
-
-        with vision.FaceDetector.create_from_options(options) as detector:
+        # Reuse a pooled FaceDetector
+        with model_registry.acquire("face_detector", _create_face_detector) as detector:
             # Create MediaPipe Image from numpy array
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img)
 
@@ -168,101 +191,181 @@ def detect_faces(img: np.ndarray, img_width: int, img_height: int) -> List[Dict]
     return face_boxes
 
 
-def extract_emotion_proxies(image_path: str) -> Dict[str, float]:
+def _crop_face(img: np.ndarray, box: Dict) -> Tuple[np.ndarray, int, int]:
+    """
+    Cut a face box out of an image with settings.FACE_CROP_MARGIN context.
+
+    The landmarker runs its own short-range detector on the crop, which
+    needs some background around the face.
+
+    Returns:
+        Tuple of (contiguous RGB crop, crop x offset, crop y offset)
+    """
+    img_height, img_width = img.shape[:2]
+    margin_x = int(box["width"] * settings.FACE_CROP_MARGIN)
+    margin_y = int(box["height"] * settings.FACE_CROP_MARGIN)
+    x1 = max(0, box["x"] - margin_x)
+    y1 = max(0, box["y"] - margin_y)
+    x2 = min(img_width, box["x"] + box["width"] + margin_x)
+    y2 = min(img_height, box["y"] + box["height"] + margin_y)
+    return np.ascontiguousarray(img[y1:y2, x1:x2]), x1, y1
+
+
+def _emotion_proxies_from_landmarks(
+    landmarks: List, crop_width: int, crop_height: int, face_height: float
+) -> Dict[str, float]:
     """
-    Extract emotion proxy scores using MediaPipe FaceLandmarker Tasks API.
+    Emotion proxy scores from FaceLandmarker landmarks.
 
     Args:
-        image_path: Path to the image file
+        landmarks: Normalized landmarks of one face
+        crop_width: Width of the image the landmarks refer to
+        crop_height: Height of the image the landmarks refer to
+        face_height: Detected face bbox height in pixels
 
     Returns:
         Dictionary with smile_score, mouth_open_score, brow_raise_score
     """
-    default_proxies = {
-        "smile_score": 0.0,
-        "mouth_open_score": 0.0,
-        "brow_raise_score": 0.0,
+
+    # Convert landmarks to pixel coordinates
+    def get_point(idx: int) -> Tuple[float, float]:
+        lm = landmarks[idx]
+        return (lm.x * crop_width, lm.y * crop_height)
+
+    # Calculate smile score (mouth corner distance / mouth width)
+    mouth_left = get_point(LANDMARKS["mouth_left"])
+    mouth_right = get_point(LANDMARKS["mouth_right"])
+    upper_lip = get_point(LANDMARKS["upper_lip"])
+    lower_lip = get_point(LANDMARKS["lower_lip"])
+
+    mouth_width = euclidean_distance(mouth_left, mouth_right)
+
+    # Smile: corners lifted relative to center
+    # Using vertical position of corners vs center of lips
+    lip_center_y = (upper_lip[1] + lower_lip[1]) / 2
+    corner_avg_y = (mouth_left[1] + mouth_right[1]) / 2
+
+    # If corners are above lip center, that's a smile
+    # Normalize by mouth width
+    smile_score = safe_divide(lip_center_y - corner_avg_y, mouth_width)
+    smile_score = max(0, min(1, smile_score + 0.5))  # Normalize to 0-1
+
+    # Mouth openness score
+    lip_gap = euclidean_distance(upper_lip, lower_lip)
+    mouth_open_score = safe_divide(lip_gap, mouth_width)
+    mouth_open_score = min(1.0, mouth_open_score)  # Cap at 1.0
+
+    # Brow raise score (eyebrow to eye distance)
+    left_brow = get_point(LANDMARKS["left_eyebrow"])
+    right_brow = get_point(LANDMARKS["right_eyebrow"])
+    left_eye = get_point(LANDMARKS["left_eye_top"])
+    right_eye = get_point(LANDMARKS["right_eye_top"])
+
+    left_brow_dist = abs(left_brow[1] - left_eye[1])
+    right_brow_dist = abs(right_brow[1] - right_eye[1])
+    avg_brow_dist = (left_brow_dist + right_brow_dist) / 2
+
+    # Normalize by the detected face height
+    brow_raise_score = safe_divide(avg_brow_dist, face_height)
+    brow_raise_score = min(1.0, brow_raise_score * 3)  # Scale up
+
+    return {
+        "smile_score": round(smile_score, 4),
+        "mouth_open_score": round(mouth_open_score, 4),
+        "brow_raise_score": round(brow_raise_score, 4),
     }
 
+
+def analyze_faces(img: np.ndarray, face_boxes: List[Dict]) -> List[Dict[str, Any]]:
+    """
+    Run FaceLandmarker on a crop around each detected face.
+
+    Only the settings.FACE_MAX_LANDMARK_FACES largest faces get
+    landmarks; smaller ones are listed with emotion_proxies set to None,
+    as are faces the landmarker does not confirm.
+
+    Args:
+        img: RGB image array the boxes were detected on
+        face_boxes: Boxes from detect_faces
+
+    Returns:
+        Per-face dictionaries, largest face first, with the box as
+        fractions of the image size, area_ratio, confidence and
+        emotion_proxies
+    """
+    img_height, img_width = img.shape[:2]
+    img_area = img_height * img_width
+    boxes = sorted(face_boxes, key=lambda b: b["width"] * b["height"], reverse=True)
+
+    faces = []
+    for box in boxes:
+        faces.append({
+            "x": round(safe_divide(box["x"], img_width), 4),
+            "y": round(safe_divide(box["y"], img_height), 4),
+            "width": round(safe_divide(box["width"], img_width), 4),
+            "height": round(safe_divide(box["height"], img_height), 4),
+            "area_ratio": round(safe_divide(box["width"] * box["height"], img_area), 4),
+            "confidence": round(float(box["confidence"]), 4),
+            "emotion_proxies": None,
+        })
+
     if not FACE_LANDMARKER_MODEL.exists():
-        return default_proxies
+        return faces
 
     try:
-        # Create FaceLandmarker
-        base_options = mp_tasks.BaseOptions(model_asset_path=str(FACE_LANDMARKER_MODEL))
-        options = vision.FaceLandmarkerOptions(
-            base_options=base_options,
-            num_faces=1,
-            min_face_detection_confidence=0.5,
-            min_face_presence_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-
-        with vision.FaceLandmarker.create_from_options(options) as landmarker:
-            # Load image using MediaPipe
-            mp_image = mp.Image.create_from_file(image_path)
-            img_width = mp_image.width
-            img_height = mp_image.height
-
-            # Detect face landmarks
-            result = landmarker.detect(mp_image)
-
-            if not result.face_landmarks:
-                return default_proxies
-
-            landmarks = result.face_landmarks[0]
-
-            # Convert landmarks to pixel coordinates
-            def get_point(idx: int) -> Tuple[float, float]:
-                lm = landmarks[idx]
-                return (lm.x * img_width, lm.y * img_height)
-
-            # Calculate smile score (mouth corner distance / mouth width)
-            mouth_left = get_point(LANDMARKS["mouth_left"])
-            mouth_right = get_point(LANDMARKS["mouth_right"])
-            upper_lip = get_point(LANDMARKS["upper_lip"])
-            lower_lip = get_point(LANDMARKS["lower_lip"])
-
-            mouth_width = euclidean_distance(mouth_left, mouth_right)
-
-            # Smile: corners lifted relative to center
-            # Using vertical position of corners vs center of lips
-            lip_center_y = (upper_lip[1] + lower_lip[1]) / 2
-            corner_avg_y = (mouth_left[1] + mouth_right[1]) / 2
-
-            # If corners are above lip center, that's a smile
-            # Normalize by mouth width
-            smile_score = safe_divide(lip_center_y - corner_avg_y, mouth_width)
-            smile_score = max(0, min(1, smile_score + 0.5))  # Normalize to 0-1
-
-            # Mouth openness score
-            lip_gap = euclidean_distance(upper_lip, lower_lip)
-            mouth_open_score = safe_divide(lip_gap, mouth_width)
-            mouth_open_score = min(1.0, mouth_open_score)  # Cap at 1.0
-
-            # Brow raise score (eyebrow to eye distance)
-            left_brow = get_point(LANDMARKS["left_eyebrow"])
-            right_brow = get_point(LANDMARKS["right_eyebrow"])
-            left_eye = get_point(LANDMARKS["left_eye_top"])
-            right_eye = get_point(LANDMARKS["right_eye_top"])
-
-            left_brow_dist = abs(left_brow[1] - left_eye[1])
-            right_brow_dist = abs(right_brow[1] - right_eye[1])
-            avg_brow_dist = (left_brow_dist + right_brow_dist) / 2
-
-            # Normalize by face height (approximate)
-            face_height = img_height * 0.3  # Rough estimate
-            brow_raise_score = safe_divide(avg_brow_dist, face_height)
-            brow_raise_score = min(1.0, brow_raise_score * 3)  # Scale up
-
-            return {
-                "smile_score": round(smile_score, 4),
-                "mouth_open_score": round(mouth_open_score, 4),
-                "brow_raise_score": round(brow_raise_score, 4),
-            }
-
-    except Exception:
-        return default_proxies
+        # One pooled landmarker serves every crop of this image
+        with model_registry.acquire("face_landmarker", _create_face_landmarker) as landmarker:
+            for index, (face, box) in enumerate(
+                zip(faces[:settings.FACE_MAX_LANDMARK_FACES], boxes)
+            ):
+                if box["width"] <= 0 or box["height"] <= 0:
+                    continue
+                try:
+                    crop, _, _ = _crop_face(img, box)
+                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=crop)
+                    result = landmarker.detect(mp_image)
+                    if not result.face_landmarks:
+                        continue
+                    face["emotion_proxies"] = _emotion_proxies_from_landmarks(
+                        result.face_landmarks[0],
+                        mp_image.width,
+                        mp_image.height,
+                        box["height"],
+                    )
+                except Exception as e:
+                    # Skip just this face; the others still get proxies
+                    logger.warning(f"Face landmarks failed for face {index}: {e}")
+    except Exception as e:
+        logger.warning(f"Face landmarker unavailable: {e}")
+
+    return faces
+
+
+def extract_emotion_proxies(image: ImageSource) -> Dict[str, float]:
+    """
+    Emotion proxy scores of the largest face in an image.
+
+    Args:
+        image: ImageContext (or path) for the thumbnail
+
+    Returns:
+        Dictionary with smile_score, mouth_open_score, brow_raise_score
+    """
+    if not MEDIAPIPE_AVAILABLE or not FACE_DETECTOR_MODEL.exists():
+        return _default_proxies()
+
+    img = as_image_context(image).rgb_at(settings.MAX_IMAGE_SIZE)
+    if img is None:
+        return _default_proxies()
+
+    img_height, img_width = img.shape[:2]
+    face_boxes = detect_faces(img, img_width, img_height)
+    if not face_boxes:
+        return _default_proxies()
+
+    largest = max(face_boxes, key=lambda b: b["width"] * b["height"])
+    faces = analyze_faces(img, [largest])
+    return faces[0]["emotion_proxies"] or _default_proxies()
 
 
 def get_face_stats(features: Dict[str, Any]) -> Dict[str, Any]:
@@ -14,7 +14,8 @@ except ImportError:
     MEDIAPIPE_AVAILABLE = False
 
 from app.core.config import settings
-from app.utils.images import load_image_rgb
+from app.services import model_registry
+from app.utils.images import ImageSource, as_image_context
 from app.utils.math import euclidean_distance, safe_divide
 
 # Model path
@@ -44,7 +45,20 @@ POSE_LANDMARKS = {
 }
 
 
-def extract_pose_features(image_path: str) -> Dict[str, Any]:
+def _create_pose_landmarker():
+    """Build a PoseLandmarker task (called once per pool slot)."""
+    base_options = mp_tasks.BaseOptions(model_asset_path=str(POSE_LANDMARKER_MODEL))
+    options = vision.PoseLandmarkerOptions(
+        base_options=base_options,
+        num_poses=1,
+        min_pose_detection_confidence=0.5,
+        min_pose_presence_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+    return vision.PoseLandmarker.create_from_options(options)
+
+
+def extract_pose_features(image: ImageSource) -> Dict[str, Any]:
     """
     Extract pose-related features from an image.
 
@@ -55,7 +69,7 @@ def extract_pose_features(image_path: str) -> Dict[str, Any]:
     - body_coverage: Ratio of body bbox to image area
 
     Args:
-        image_path: Path to the image file
+        image: ImageContext (or path) for the thumbnail
 
     Returns:
         Dictionary of pose features
@@ -78,20 +92,15 @@ def extract_pose_features(image_path: str) -> Dict[str, Any]:
             "error": f"pose landmarker model not found at {POSE_LANDMARKER_MODEL}",
         }
 
+    rgb = as_image_context(image).rgb
+    if rgb is None:
+        return {}
+
     try:
-        # Create PoseLandmarker
-        base_options = mp_tasks.BaseOptions(model_asset_path=str(POSE_LANDMARKER_MODEL))
-        options = vision.PoseLandmarkerOptions(
-            base_options=base_options,
-            num_poses=1,
-            min_pose_detection_confidence=0.5,
-            min_pose_presence_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-
-        with vision.PoseLandmarker.create_from_options(options) as landmarker:
-            # Load image using MediaPipe
-            mp_image = mp.Image.create_from_file(image_path)
+        # Reuse a pooled PoseLandmarker
+        with model_registry.acquire("pose_landmarker", _create_pose_landmarker) as landmarker:
+            # Wrap the already-decoded full-resolution image
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
             img_width = mp_image.width
             img_height = mp_image.height
 
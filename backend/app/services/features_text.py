@@ -1,22 +1,155 @@
-"""Text/OCR feature extraction module using pytesseract."""
+"""Text/OCR feature extraction module using Tesseract."""
 
-from typing import Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+import cv2
 import numpy as np
 
-try:
-    import pytesseract
-    from pytesseract import Output
-
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
-
 from app.core.config import settings
-from app.utils.images import load_image, get_image_area
+from app.services.ocr import OcrData, ocr_available, prepare_ocr_image, run_ocr
+from app.utils.images import ImageSource, as_image_context, get_image_area
 from app.utils.math import safe_divide
 
 
-def extract_text_features(image_path: str) -> Dict[str, Any]:
+# Text-region pre-detection thresholds (pixels at OCR resolution)
+_MIN_REGION_HEIGHT = 8
+_MIN_REGION_WIDTH = 10
+_MIN_EDGE_THRESHOLD = 32  # Floor for the Otsu threshold on flat images
+_MIN_EDGE_DENSITY = 0.35  # Edge pixels per box pixel for a text-like blob
+_REGION_PADDING = 4
+
+
+def _merge_boxes(boxes: List[List[int]]) -> List[List[int]]:
+    """Union overlapping (x1, y1, x2, y2) boxes until none overlap."""
+    merged = True
+    while merged:
+        merged = False
+        result: List[List[int]] = []
+        for box in boxes:
+            for other in result:
+                if (
+                    box[0] < other[2] and other[0] < box[2]
+                    and box[1] < other[3] and other[1] < box[3]
+                ):
+                    other[0] = min(other[0], box[0])
+                    other[1] = min(other[1], box[1])
+                    other[2] = max(other[2], box[2])
+                    other[3] = max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                result.append(list(box))
+        boxes = result
+    return boxes
+
+
+def detect_text_regions(gray: np.ndarray) -> Optional[List[Tuple[int, int, int, int]]]:
+    """
+    Find candidate text regions without running OCR.
+
+    Strokes give text a dense, horizontally connected edge pattern: the
+    morphological gradient is binarized (Otsu), closed horizontally so
+    characters join into lines, and connected components with enough
+    edge density are kept.
+
+    Args:
+        gray: Grayscale image at OCR resolution
+
+    Returns:
+        Padded, non-overlapping (x, y, width, height) regions; an empty
+        list when nothing looks like text; None when candidates are too
+        many or too large for cropping to pay off
+    """
+    img_height, img_width = gray.shape[:2]
+
+    ellipse = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, ellipse)
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, edges = cv2.threshold(
+        gradient, max(otsu, _MIN_EDGE_THRESHOLD), 255, cv2.THRESH_BINARY
+    )
+
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+    connected = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, line_kernel)
+    n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(connected, connectivity=8)
+    if n_labels <= 1:
+        return []
+
+    # Edge pixels per component, in one pass over the label image
+    edge_counts = np.bincount(labels[edges > 0], minlength=n_labels)
+    x, y, w, h = (stats[:, i] for i in range(4))
+    density = edge_counts / np.maximum(w * h, 1)
+    keep = (
+        (h >= _MIN_REGION_HEIGHT)
+        & (w >= _MIN_REGION_WIDTH)
+        & (h <= img_height // 2)
+        & (density >= _MIN_EDGE_DENSITY)
+    )
+    keep[0] = False  # Background
+
+    boxes = [
+        [
+            max(0, int(x[i]) - _REGION_PADDING),
+            max(0, int(y[i]) - _REGION_PADDING),
+            min(img_width, int(x[i] + w[i]) + _REGION_PADDING),
+            min(img_height, int(y[i] + h[i]) + _REGION_PADDING),
+        ]
+        for i in np.flatnonzero(keep)
+    ]
+    if not boxes:
+        return []
+
+    boxes = _merge_boxes(boxes)
+    covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in boxes)
+    if (
+        len(boxes) > settings.OCR_MAX_REGIONS
+        or covered > settings.OCR_MAX_REGION_COVERAGE * img_height * img_width
+    ):
+        return None
+
+    return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes]
+
+
+def _recognize(ocr_img: np.ndarray) -> OcrData:
+    """
+    OCR an image, restricted to detected text regions when enabled.
+
+    Regions are recognized as separate crops and their word boxes shifted
+    back into image coordinates; an image without candidate regions is
+    not OCR'd at all.
+    """
+    if not settings.OCR_TEXT_DETECTION:
+        return run_ocr(ocr_img)
+
+    gray = ocr_img if ocr_img.ndim == 2 else cv2.cvtColor(ocr_img, cv2.COLOR_BGR2GRAY)
+    regions = detect_text_regions(gray)
+    if regions is None:
+        return run_ocr(ocr_img)
+
+    data: OcrData = {key: [] for key in ("text", "conf", "left", "top", "width", "height")}
+    for x, y, w, h in regions:
+        crop = np.ascontiguousarray(ocr_img[y:y + h, x:x + w])
+        words = run_ocr(crop, psm=settings.OCR_REGION_PSM)
+        for key in data:
+            data[key].extend(words[key])
+        n_new = len(words["text"])
+        for i in range(len(data["left"]) - n_new, len(data["left"])):
+            data["left"][i] += x
+            data["top"][i] += y
+    return data
+
+
+def _empty_text_features(error: str) -> Dict[str, Any]:
+    return {
+        "has_text": False,
+        "text_area_ratio": 0.0,
+        "text_box_count": 0,
+        "text_position_heat": {"top": 0.0, "middle": 0.0, "bottom": 0.0},
+        "error": error,
+    }
+
+
+def extract_text_features(image: ImageSource) -> Dict[str, Any]:
     """
     Extract text-related features from an image using OCR.
 
@@ -27,31 +160,31 @@ def extract_text_features(image_path: str) -> Dict[str, Any]:
     - text_position_heat: Distribution of text (top/middle/bottom)
     - detected_text: List of detected text strings (for reference)
 
+    OCR runs on a grayscale copy downscaled to settings.OCR_IMAGE_SIZE;
+    all ratios are relative to that image, so they do not depend on the
+    OCR resolution. With settings.OCR_TEXT_DETECTION, only candidate text
+    regions are OCR'd (see detect_text_regions).
+
     Args:
-        image_path: Path to the image file
+        image: ImageContext (or path) for the thumbnail
 
     Returns:
         Dictionary of text features
     """
-    if not TESSERACT_AVAILABLE:
-        return {
-            "has_text": False,
-            "text_area_ratio": 0.0,
-            "text_box_count": 0,
-            "text_position_heat": {"top": 0.0, "middle": 0.0, "bottom": 0.0},
-            "error": "pytesseract not available",
-        }
+    if not ocr_available():
+        return _empty_text_features("no OCR engine available")
 
-    img = load_image(image_path, max_size=settings.MAX_IMAGE_SIZE)
+    img = as_image_context(image).bgr_at(settings.MAX_IMAGE_SIZE)
     if img is None:
         return {}
 
-    img_height, img_width = img.shape[:2]
-    img_area = img_height * img_width
-
     try:
+        ocr_img = prepare_ocr_image(img)
+        img_height, img_width = ocr_img.shape[:2]
+        img_area = img_height * img_width
+
         # Run OCR with bounding box data
-        ocr_data = pytesseract.image_to_data(img, output_type=Output.DICT)
+        ocr_data = _recognize(ocr_img)
 
         # Filter for confident text detections
         text_boxes = []
@@ -59,7 +192,7 @@ def extract_text_features(image_path: str) -> Dict[str, Any]:
 
         n_boxes = len(ocr_data["text"])
         for i in range(n_boxes):
-            conf = int(ocr_data["conf"][i])
+            conf = float(ocr_data["conf"][i])
             text = ocr_data["text"][i].strip()
 
             # Filter by confidence and non-empty text
@@ -99,13 +232,30 @@ def extract_text_features(image_path: str) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        return {
-            "has_text": False,
-            "text_area_ratio": 0.0,
-            "text_box_count": 0,
-            "text_position_heat": {"top": 0.0, "middle": 0.0, "bottom": 0.0},
-            "error": str(e),
-        }
+        return _empty_text_features(str(e))
+
+
+def extract_text_features_batch(images: List[ImageSource]) -> List[Dict[str, Any]]:
+    """
+    Extract text features for several images concurrently.
+
+    Tesseract releases the GIL while recognizing, so settings.OCR_WORKERS
+    threads keep that many OCR engines busy at once.
+
+    Args:
+        images: ImageContexts (or paths) for the thumbnails
+
+    Returns:
+        List of text feature dictionaries, in input order
+    """
+    if len(images) <= 1 or settings.OCR_WORKERS <= 1:
+        return [extract_text_features(image) for image in images]
+
+    with ThreadPoolExecutor(
+        max_workers=min(settings.OCR_WORKERS, len(images)),
+        thread_name_prefix="ocr",
+    ) as executor:
+        return list(executor.map(extract_text_features, images))
 
 
 def calculate_text_position_heat(
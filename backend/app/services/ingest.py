@@ -1,15 +1,35 @@
 """Thumbnail ingestion service."""
 
+import logging
+import os
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.thumbnail import Thumbnail
-from app.utils.images import is_image_file, get_image_dimensions
+from app.services.cache import bump_dataset_version
+from app.core.db import get_database_id
+from app.services.scan_manifest import (
+    ScanManifest,
+    get_scan_manifest,
+    state_files,
+    state_hashes,
+)
+from app.utils.images import (
+    compute_image_hashes,
+    get_image_dimensions,
+    is_image_file,
+    perceptual_hash,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 def scan_directory_for_images(directory: Path) -> List[Path]:
@@ -126,67 +146,374 @@ def ingest_thumbnail(
     if metadata:
         extracted.update({k: v for k, v in metadata.items() if v is not None})
 
+    extracted["content_hash"], extracted["phash"] = compute_image_hashes(file_path)
+
     if existing:
         # Update existing record
         for key, value in extracted.items():
             if hasattr(existing, key) and value is not None:
                 setattr(existing, key, value)
+        bump_dataset_version(db)
         db.commit()
         return existing, False
     else:
         # Create new record
         thumbnail = Thumbnail(**extracted)
         db.add(thumbnail)
+        bump_dataset_version(db)
         db.commit()
         db.refresh(thumbnail)
         return thumbnail, True
 
 
+# Columns every bulk-inserted row carries, so executemany can batch them
+_BULK_ROW_KEYS = (
+    "group", "source", "file_path", "title", "channel", "year", "content_hash", "phash",
+)
+
+
+def _empty_stats() -> dict:
+    return {
+        "total_found": 0,
+        "created": 0,
+        "skipped": 0,
+        "errors": 0,
+        "error_files": [],
+    }
+
+
+def _under_directory(directory: Path):
+    """Filter for thumbnails stored anywhere below a directory."""
+    # The separator keeps /thumbs/2015 from matching /thumbs/2015_old, and
+    # autoescape stops _ and % in paths acting as LIKE wildcards
+    prefix = os.path.join(str(Path(directory).resolve()), "")
+    return Thumbnail.file_path.startswith(prefix, autoescape=True)
+
+
+def _known_paths(db: Session, directory: Path) -> Dict[str, int]:
+    """Map file_path -> id for every thumbnail stored under a directory."""
+    rows = db.query(Thumbnail.file_path, Thumbnail.id).filter(
+        _under_directory(directory)
+    ).all()
+    return {path: thumb_id for path, thumb_id in rows}
+
+
+def _count_live_rows(db: Session, directory: Path) -> int:
+    """Count the non-stale thumbnails stored under a directory."""
+    return db.query(func.count(Thumbnail.id)).filter(
+        _under_directory(directory),
+        Thumbnail.is_stale == False,
+    ).scalar()
+
+
+def _write_chunk(db: Session, statement, rows: List[dict], stats: dict, counter: str):
+    """
+    Execute one chunk as a single transaction, falling back to row by row.
+
+    A failing row (e.g. a path inserted concurrently) only costs that row;
+    the rest of the chunk is retried individually.
+    """
+    try:
+        db.execute(statement, rows)
+        bump_dataset_version(db)
+        db.commit()
+        stats[counter] += len(rows)
+        return
+    except Exception:
+        db.rollback()
+
+    for row in rows:
+        try:
+            db.execute(statement, [row])
+            bump_dataset_version(db)
+            db.commit()
+            stats[counter] += 1
+        except Exception as e:
+            db.rollback()
+            stats["errors"] += 1
+            stats["error_files"].append({"path": row.get("file_path", ""), "error": str(e)})
+
+
+def bulk_ingest_paths(
+    db: Session,
+    image_paths: Iterable[Path],
+    group: str,
+    directory: Path,
+    force: bool = False,
+    batch_size: Optional[int] = None,
+    content_hashes: Optional[Dict[str, str]] = None,
+) -> dict:
+    """
+    Ingest many images with one lookup query and chunked bulk writes.
+
+    Args:
+        db: Database session
+        image_paths: Image files to ingest
+        group: Thumbnail group for all images
+        directory: Directory the images live under (bounds the lookup)
+        force: If True, update existing records with path-derived metadata
+        batch_size: Rows per transaction (default: settings.INGEST_BATCH_SIZE)
+        content_hashes: Already computed content hashes keyed by str(path)
+            (e.g. from the scan manifest); these files are not re-hashed
+
+    Returns:
+        Dictionary with ingestion statistics (same shape as ingest_directory)
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    content_hashes = content_hashes or {}
+    stats = _empty_stats()
+    known = _known_paths(db, directory)
+
+    new_rows = []
+    update_rows = []
+    for image_path in image_paths:
+        stats["total_found"] += 1
+        try:
+            metadata = extract_metadata_from_path(Path(image_path), group)
+        except Exception as e:
+            stats["errors"] += 1
+            stats["error_files"].append({"path": str(image_path), "error": str(e)})
+            continue
+
+        existing_id = known.get(metadata["file_path"])
+        if existing_id is None:
+            content_hash = content_hashes.get(str(image_path))
+            if content_hash is None:
+                metadata["content_hash"], metadata["phash"] = compute_image_hashes(image_path)
+            else:
+                metadata["content_hash"] = content_hash
+                metadata["phash"] = perceptual_hash(image_path)
+            new_rows.append({key: metadata.get(key) for key in _BULK_ROW_KEYS})
+            # Guard against the same file listed twice
+            known[metadata["file_path"]] = -1
+        elif force and existing_id > 0:
+            values = {k: v for k, v in metadata.items() if v is not None}
+            values["id"] = existing_id
+            values["updated_at"] = datetime.utcnow()
+            update_rows.append(values)
+        else:
+            stats["skipped"] += 1
+
+    for start in range(0, len(new_rows), batch_size):
+        _write_chunk(db, insert(Thumbnail), new_rows[start:start + batch_size], stats, "created")
+
+    # Updated rows count as skipped, matching ingest_thumbnail's was_created=False
+    for start in range(0, len(update_rows), batch_size):
+        _write_chunk(db, update(Thumbnail), update_rows[start:start + batch_size], stats, "skipped")
+
+    return stats
+
+
+# Metadata columns an upsert may fill in; existing values survive NULLs
+_UPSERT_COLUMNS = (
+    "group", "title", "channel", "year", "url", "views", "publish_date",
+    "content_hash", "phash",
+)
+
+
+def upsert_thumbnail_rows(db: Session, rows: List[dict], force: bool = False) -> Tuple[int, int, int]:
+    """
+    Insert or update a chunk of thumbnail rows in one statement and commit.
+
+    Uses SQLite's INSERT ... ON CONFLICT(file_path). With force, metadata
+    columns are overwritten by non-NULL incoming values; otherwise existing
+    rows are left untouched.
+
+    Args:
+        db: Database session
+        rows: Row dicts keyed by "file_path" plus any of _UPSERT_COLUMNS
+        force: If True, update existing records
+
+    Returns:
+        Tuple of (created, updated, skipped) counts
+    """
+    if not rows:
+        return 0, 0, 0
+
+    now = datetime.utcnow()
+    rows = [
+        {"file_path": row["file_path"], "source": "local", "updated_at": now,
+         **{col: row.get(col) for col in _UPSERT_COLUMNS}}
+        for row in rows
+    ]
+
+    paths = [row["file_path"] for row in rows]
+    existing = {
+        path for (path,) in db.query(Thumbnail.file_path).filter(Thumbnail.file_path.in_(paths))
+    }
+
+    # Only new files are read for hashing; existing hashes are kept
+    for row in rows:
+        if row["file_path"] not in existing and row["content_hash"] is None:
+            row["content_hash"], row["phash"] = compute_image_hashes(row["file_path"])
+
+    table = Thumbnail.__table__
+    stmt = sqlite_insert(table)
+    if force:
+        set_ = {col: func.coalesce(stmt.excluded[col], table.c[col]) for col in _UPSERT_COLUMNS}
+        set_["updated_at"] = stmt.excluded.updated_at
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.file_path], set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[table.c.file_path])
+
+    db.execute(stmt, rows)
+    bump_dataset_version(db)
+    db.commit()
+
+    # A path repeated within the chunk is only created once
+    created = len(set(paths) - existing)
+    matched = len(paths) - created
+    return (created, matched, 0) if force else (created, 0, matched)
+
+
+def _mark_files(db: Session, paths: List[Path], values: dict, only_stale: bool = False) -> int:
+    """Bulk-update thumbnails by file path in chunked transactions."""
+    resolved = [os.path.realpath(p) for p in paths]
+    values = dict(values, updated_at=datetime.utcnow())
+    batch_size = settings.INGEST_BATCH_SIZE
+
+    updated = 0
+    for start in range(0, len(resolved), batch_size):
+        query = db.query(Thumbnail).filter(
+            Thumbnail.file_path.in_(resolved[start:start + batch_size])
+        )
+        if only_stale:
+            query = query.filter(Thumbnail.is_stale == True)
+        count = query.update(values, synchronize_session=False)
+        if count:
+            bump_dataset_version(db)
+        db.commit()
+        updated += count
+    return updated
+
+
+def mark_files_modified(db: Session, paths: List[Path]) -> int:
+    """
+    Flag thumbnails whose image changed on disk for re-extraction.
+
+    Hashes are cleared so the pipeline recomputes them from the new bytes.
+
+    Returns:
+        Number of thumbnails updated
+    """
+    return _mark_files(
+        db, paths,
+        {"features_extracted": False, "is_stale": False, "content_hash": None, "phash": None},
+    )
+
+
+def mark_files_stale(db: Session, paths: List[Path]) -> int:
+    """
+    Mark thumbnails whose image was removed from disk as stale.
+
+    Returns:
+        Number of thumbnails updated
+    """
+    return _mark_files(db, paths, {"is_stale": True})
+
+
 def ingest_directory(
     db: Session,
     directory: Path,
     group: str,
     force: bool = False,
+    manifest: Optional[ScanManifest] = None,
 ) -> dict:
     """
-    Ingest all images from a directory.
+    Ingest new or changed images from a directory.
+
+    The directory is diffed against the scan manifest, so only files added,
+    modified or removed since the last scan touch the database. Modified
+    files are flagged for re-extraction; removed ones are marked stale.
+    The manifest is discarded and the group fully rescanned when it does
+    not match the database.
 
     Args:
         db: Database session
         directory: Directory containing images
         group: Thumbnail group for all images in directory
-        force: If True, update existing records
+        force: If True, update existing records (re-ingests every file)
+        manifest: Scan manifest (default: the process-wide one)
 
     Returns:
         Dictionary with ingestion statistics
     """
-    stats = {
-        "total_found": 0,
-        "created": 0,
-        "skipped": 0,
-        "errors": 0,
-        "error_files": [],
-    }
-
-    images = scan_directory_for_images(directory)
-    stats["total_found"] = len(images)
-
-    for image_path in images:
+    manifest = manifest or get_scan_manifest()
+
+    # A manifest built for another database, or listing files the database
+    # has lost (e.g. a rolled-back commit), would hide them from ingestion
+    manifest.bind_database(get_database_id(db))
+    known = manifest.file_count(group)
+    if known and _count_live_rows(db, directory) < known:
+        logger.warning(
+            f"Scan manifest lists {known} files for group '{group}' that the "
+            "database does not have; rescanning the group"
+        )
+        manifest.forget(group)
+
+    scan, state = manifest.scan(group, directory)
+
+    paths = state_files(state) if force else scan.added
+    stats = bulk_ingest_paths(
+        db, paths, group, directory, force=force, content_hashes=state_hashes(state)
+    )
+
+    # Files the manifest already accounted for were not looked at again
+    stats["total_found"] = scan.total_found
+    stats["skipped"] += scan.total_found - len(paths)
+
+    stats["restored"] = _mark_files(db, scan.added, {"is_stale": False}, only_stale=True)
+    stats["modified"] = mark_files_modified(db, scan.modified)
+    stats["removed"] = mark_files_stale(db, scan.removed)
+
+    # Leave the manifest alone on errors so the next scan retries those files
+    if stats["errors"] == 0:
+        manifest.commit(group, state)
         try:
-            thumbnail, was_created = ingest_thumbnail(
-                db, image_path, group, force=force
-            )
-            if was_created:
-                stats["created"] += 1
-            else:
-                stats["skipped"] += 1
-        except Exception as e:
-            stats["errors"] += 1
-            stats["error_files"].append({"path": str(image_path), "error": str(e)})
+            manifest.save()
+        except OSError as e:
+            logger.warning(f"Could not save scan manifest: {e}")
 
     return stats
 
 
+def backfill_image_hashes(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Compute content and perceptual hashes for thumbnails ingested without them.
+
+    Args:
+        db: Database session
+        batch_size: Rows per transaction (default: settings.INGEST_BATCH_SIZE)
+
+    Returns:
+        Number of thumbnails hashed
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    hashed = 0
+    last_id = 0
+    while True:
+        rows = db.query(Thumbnail.id, Thumbnail.file_path).filter(
+            Thumbnail.content_hash == None,
+            Thumbnail.is_stale == False,
+            Thumbnail.id > last_id,
+        ).order_by(Thumbnail.id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for thumb_id, file_path in rows:
+            content_hash, phash = compute_image_hashes(file_path)
+            if content_hash is not None:
+                updates.append({"id": thumb_id, "content_hash": content_hash, "phash": phash})
+        if updates:
+            db.execute(update(Thumbnail), updates)
+            db.commit()
+            hashed += len(updates)
+
+    return hashed
+
+
 def ingest_all_groups(db: Session, root_dir: Path, force: bool = False) -> dict:
     """
     Ingest images from all group directories.
@@ -212,13 +539,7 @@ def ingest_all_groups(db: Session, root_dir: Path, force: bool = False) -> dict:
         if group_dir.exists():
             results[group] = ingest_directory(db, group_dir, group, force=force)
         else:
-            results[group] = {
-                "total_found": 0,
-                "created": 0,
-                "skipped": 0,
-                "errors": 0,
-                "error_files": [],
-                "warning": f"Directory not found: {group_dir}",
-            }
+            results[group] = _empty_stats()
+            results[group]["warning"] = f"Directory not found: {group_dir}"
 
     return results
@@ -0,0 +1,316 @@
+"""Persistent pipeline job queue and its background worker."""
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.pipeline_job import PipelineJob
+from app.services.pipeline import pipeline_query, run_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+# Error details kept per job; the error count is always exact
+_MAX_ERROR_DETAILS = 100
+
+# Identifies this process as the owner of the jobs it runs
+_HOSTNAME = socket.gethostname()
+_OWNER = f"{_HOSTNAME}:{os.getpid()}"
+
+# Global worker state
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_wakeup = threading.Event()
+_stop = threading.Event()
+
+
+class JobStateError(Exception):
+    """Raised when a job cannot make the requested state transition."""
+
+
+def create_job(db: Session, params: Dict[str, Any]) -> PipelineJob:
+    """
+    Queue a pipeline run.
+
+    Args:
+        db: Database session
+        params: run_pipeline arguments (group, features, force, limit,
+            save_depth_maps)
+
+    Returns:
+        The queued PipelineJob
+    """
+    job = PipelineJob(state="queued")
+    job.set_params(params)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _wakeup.set()
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Optional[PipelineJob]:
+    """Fetch a job by id."""
+    return db.query(PipelineJob).filter(PipelineJob.id == job_id).first()
+
+
+def list_jobs(db: Session, limit: int = 20) -> List[PipelineJob]:
+    """Most recent jobs first."""
+    return db.query(PipelineJob).order_by(PipelineJob.id.desc()).limit(limit).all()
+
+
+def cancel_job(db: Session, job: PipelineJob) -> PipelineJob:
+    """
+    Cancel a queued job, or ask a running one to stop after its chunk.
+
+    Raises:
+        JobStateError: If the job already finished
+    """
+    if job.state == "queued":
+        job.state = "cancelled"
+        job.finished_at = datetime.utcnow()
+    elif job.state == "running":
+        job.cancel_requested = True
+    else:
+        raise JobStateError(f"Job {job.id} is {job.state}")
+    db.commit()
+    return job
+
+
+def resume_job(db: Session, job: PipelineJob) -> PipelineJob:
+    """
+    Re-queue a stopped job; it continues after its last finished thumbnail.
+
+    Raises:
+        JobStateError: If the job is still queued/running or completed
+    """
+    if job.state not in ("cancelled", "interrupted", "failed"):
+        raise JobStateError(f"Job {job.id} is {job.state}")
+    job.state = "queued"
+    job.cancel_requested = False
+    job.finished_at = None
+    db.commit()
+    _wakeup.set()
+    return job
+
+
+def _claim_next_job(db: Session) -> Optional[int]:
+    """Atomically move the oldest queued job to running."""
+    job_id = db.query(PipelineJob.id).filter(
+        PipelineJob.state == "queued"
+    ).order_by(PipelineJob.id).limit(1).scalar()
+    if job_id is None:
+        return None
+
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(PipelineJob)
+        .where(PipelineJob.id == job_id, PipelineJob.state == "queued")
+        .values(state="running", owner=_OWNER, started_at=now, heartbeat_at=now, updated_at=now)
+    ).rowcount
+    db.commit()
+    return job_id if claimed else None
+
+
+def _record_chunk(job: PipelineJob, stats: Dict[str, Any]):
+    """Fold one run_pipeline chunk into the job's progress."""
+    job.processed += stats["processed"]
+    job.skipped += stats["skipped"]
+    job.reused += stats["reused"]
+    job.errors += stats["errors"]
+    job.elapsed_seconds = (job.elapsed_seconds or 0.0) + stats["total_time"]
+    job.last_thumbnail_id = stats["last_thumbnail_id"] or job.last_thumbnail_id
+
+    if stats["error_details"]:
+        details = job.get_error_details()
+        room = _MAX_ERROR_DETAILS - len(details)
+        if room > 0:
+            job.set_error_details(details + stats["error_details"][:room])
+
+
+def _run_job(job_id: int):
+    """Run a claimed job chunk by chunk, checkpointing after each chunk."""
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+        params = job.get_params()
+        features = set(params["features"]) if params.get("features") else None
+        group = params.get("group")
+        force = params.get("force", False)
+        limit = params.get("limit")
+
+        if job.last_thumbnail_id == 0 and job.total == 0:
+            total = pipeline_query(db, group=group, force=force).count()
+            job.total = min(total, limit) if limit else total
+            db.commit()
+
+        while True:
+            db.refresh(job)
+            if job.state != "running" or job.owner != _OWNER:
+                # Lease expired and another worker reclaimed the job
+                logger.warning(f"Pipeline job {job_id} was reclaimed ({job.state}); abandoning it")
+                return
+            if job.cancel_requested:
+                job.state = "cancelled"
+                break
+            if _stop.is_set():
+                job.state = "interrupted"
+                break
+
+            done = job.processed + job.skipped + job.errors
+            batch = settings.PIPELINE_JOB_CHUNK_SIZE
+            if limit:
+                batch = min(batch, limit - done)
+                if batch <= 0:
+                    job.state = "completed"
+                    break
+
+            stats = run_pipeline(
+                db,
+                group=group,
+                features=features,
+                force=force,
+                limit=batch,
+                save_depth_maps=params.get("save_depth_maps", False),
+                after_id=job.last_thumbnail_id,
+                should_stop=_stop.is_set,
+            )
+            if stats["total"] == 0:
+                job.state = "completed"
+                break
+
+            _record_chunk(job, stats)
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Pipeline job {job_id} {job.state}: {job.processed} processed, {job.errors} errors")
+    except Exception as e:
+        logger.error(f"Pipeline job {job_id} failed: {e}")
+        db.rollback()
+        job = get_job(db, job_id)
+        if job is not None:
+            job.state = "failed"
+            job.finished_at = datetime.utcnow()
+            job.set_error_details(job.get_error_details() + [{"error": str(e)}])
+            db.commit()
+    finally:
+        db.close()
+
+
+def _owner_is_dead(owner: Optional[str]) -> bool:
+    """
+    Whether a job owner is a process on this host that no longer runs it.
+
+    Only called while this process's worker is between jobs, so a running
+    job owned by this very process is an orphan too (e.g. left by a worker
+    thread that stop_job_worker gave up waiting for).
+    """
+    if not owner:
+        return False
+    host, _, pid = owner.rpartition(":")
+    if host != _HOSTNAME or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # Exists but belongs to another user, or cannot be checked
+        return False
+    return False
+
+
+def _requeue_unfinished():
+    """
+    Re-queue interrupted jobs and running jobs whose worker is gone.
+
+    A running job is reclaimed at once if its owner was a process on this
+    host that has exited; otherwise only once its heartbeat is older than
+    PIPELINE_JOB_LEASE_SECONDS, so jobs other live processes are working
+    on are left alone.
+    """
+    db = SessionLocal()
+    try:
+        expired = datetime.utcnow() - timedelta(seconds=settings.PIPELINE_JOB_LEASE_SECONDS)
+        running = db.query(PipelineJob.id, PipelineJob.owner, PipelineJob.heartbeat_at).filter(
+            PipelineJob.state == "running"
+        ).all()
+        orphaned = [
+            job_id for job_id, owner, heartbeat_at in running
+            if heartbeat_at is None or heartbeat_at < expired or _owner_is_dead(owner)
+        ]
+        count = db.query(PipelineJob).filter(
+            or_(
+                PipelineJob.state == "interrupted",
+                and_(PipelineJob.state == "running", PipelineJob.id.in_(orphaned)),
+            )
+        ).update({"state": "queued", "owner": None}, synchronize_session=False)
+        db.commit()
+        if count:
+            logger.info(f"Resuming {count} unfinished pipeline job(s)")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Could not re-queue unfinished pipeline jobs: {e}")
+    finally:
+        db.close()
+
+
+def _worker_loop():
+    while not _stop.is_set():
+        # Also picks up jobs of workers that died while this one was running
+        _requeue_unfinished()
+        db = SessionLocal()
+        try:
+            job_id = _claim_next_job(db)
+        except Exception as e:
+            logger.error(f"Could not claim pipeline job: {e}")
+            job_id = None
+        finally:
+            db.close()
+
+        if job_id is None:
+            _wakeup.wait(timeout=5.0)
+            _wakeup.clear()
+            continue
+
+        _run_job(job_id)
+
+
+def start_job_worker():
+    """Start the background job worker thread (no-op if disabled or running)."""
+    global _worker
+
+    if not settings.PIPELINE_JOB_WORKER:
+        return
+
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _stop.clear()
+        _worker = threading.Thread(target=_worker_loop, name="pipeline-jobs", daemon=True)
+        _worker.start()
+        logger.info("Pipeline job worker started")
+
+
+def stop_job_worker(timeout: Optional[float] = None):
+    """Stop the worker; a running job is checkpointed as interrupted."""
+    global _worker
+
+    with _worker_lock:
+        _stop.set()
+        _wakeup.set()
+        if _worker is not None:
+            _worker.join(timeout)
+            _worker = None
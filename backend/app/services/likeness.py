@@ -0,0 +1,141 @@
+"""Vectorized MrBeast-likeness scoring over the columnar feature store."""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.feature_store import FeatureSnapshot
+
+
+# Thumbnail criteria: (name, feature path, op, threshold, default when missing)
+# The default mirrors the per-row .get() fallbacks; it only matters for
+# weight derivation, since every default fails its own threshold.
+THUMBNAIL_CRITERIA: List[Tuple[str, str, str, float, float]] = [
+    ("avg_brightness",          "color.avg_brightness",                  ">=", 0.60,  0.0),
+    ("face_count",              "face.face_count",                       ">=", 1,     0.0),
+    ("text_area_ratio",         "text.text_area_ratio",                  "<=", 0.005, 1.0),
+    ("smile_score",             "face.emotion_proxies.smile_score",      ">=", 0.40,  0.0),
+    ("mouth_open_score",        "face.emotion_proxies.mouth_open_score", ">=", 0.15,  0.0),
+    ("body_coverage",           "pose.body_coverage",                    ">=", 0.30,  0.0),
+    ("brow_raise_score",        "face.emotion_proxies.brow_raise_score", ">=", 0.30,  0.0),
+    ("largest_face_area_ratio", "face.largest_face_area_ratio",          ">=", 0.06,  0.0),
+]
+
+# Title criteria: (name, feature path, op, threshold); "true" = flag is set
+TITLE_CRITERIA: List[Tuple[str, str, str, Optional[float]]] = [
+    ("word_count",            "title.word_count",            "<=", 8),
+    ("char_count",            "title.char_count",            "<=", 50),
+    ("has_number",            "title.has_number",            "true", None),
+    ("has_large_number",      "title.has_large_number",      "true", None),
+    ("has_money_reference",   "title.has_money_reference",   "true", None),
+    ("first_person",          "title.first_person",          "true", None),
+    ("has_superlative",       "title.has_superlative",       "true", None),
+    ("has_challenge_framing", "title.has_challenge_framing", "true", None),
+    ("avg_word_length",       "title.avg_word_length",       "<=", 5.0),
+]
+
+THUMBNAIL_CRITERIA_NAMES = [c[0] for c in THUMBNAIL_CRITERIA]
+
+
+def _passes(values: np.ndarray, op: str, threshold: Optional[float]) -> np.ndarray:
+    """Evaluate one criterion over a vector; NaN (missing) never passes."""
+    with np.errstate(invalid="ignore"):
+        if op == ">=":
+            return values >= threshold
+        if op == "<=":
+            return values <= threshold
+        return np.nan_to_num(values, nan=0.0) != 0
+
+
+def thumbnail_criteria_matrix(snapshot: FeatureSnapshot, mask: np.ndarray) -> np.ndarray:
+    """Boolean (N, 8) matrix: row passes thumbnail criterion j."""
+    return np.column_stack([
+        _passes(snapshot.column(path)[mask], op, thresh)
+        for _, path, op, thresh, _ in THUMBNAIL_CRITERIA
+    ])
+
+
+def title_criteria_matrix(snapshot: FeatureSnapshot, mask: np.ndarray) -> np.ndarray:
+    """Boolean (N, 9) matrix: row passes title criterion j."""
+    return np.column_stack([
+        _passes(snapshot.column(path)[mask], op, thresh)
+        for _, path, op, thresh in TITLE_CRITERIA
+    ])
+
+
+def derive_feature_weights(snapshot: FeatureSnapshot, mask: np.ndarray) -> Dict[str, float]:
+    """
+    Compute |mrbeast_mean - panel_mean| / panel_std for each criterion feature.
+
+    Missing values take the criterion's default, as the per-row scorer did.
+    """
+    is_mb = snapshot.groups[mask] == "mrbeast"
+
+    weights = {}
+    for name, path, _, _, default in THUMBNAIL_CRITERIA:
+        values = np.nan_to_num(snapshot.column(path)[mask], nan=default)
+        mb = values[is_mb] if is_mb.any() else np.array([0.0])
+        pa = values[~is_mb] if (~is_mb).any() else np.array([0.0])
+        pa_std = float(np.std(pa)) if len(pa) > 1 else 1.0
+        if pa_std < 1e-6:
+            pa_std = 1e-6
+        weights[name] = round(abs(float(np.mean(mb)) - float(np.mean(pa))) / pa_std, 4)
+
+    return weights
+
+
+class LikenessScores:
+    """Per-thumbnail scores for the rows selected by a mask."""
+
+    def __init__(
+        self,
+        snapshot: FeatureSnapshot,
+        mask: np.ndarray,
+        thumbnail: np.ndarray,
+        title: np.ndarray,
+        weighted: Optional[np.ndarray],
+    ):
+        self.ids = snapshot.ids[mask]
+        self.groups = snapshot.groups[mask]
+        self.channels = snapshot.channels[mask]
+        self.thumbnail = thumbnail
+        self.title = title
+        self.combined = thumbnail + title
+        self.weighted = weighted
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def score_thumbnails(
+    snapshot: FeatureSnapshot,
+    mask: np.ndarray,
+    weights: Optional[Dict[str, float]] = None,
+) -> LikenessScores:
+    """
+    Score every selected thumbnail in one vectorized pass.
+
+    Args:
+        snapshot: Columnar feature snapshot
+        mask: Boolean row mask selecting thumbnails to score
+        weights: Optional per-criterion weights for the weighted score
+
+    Returns:
+        LikenessScores with thumbnail (0-8), title (0-9), combined (0-17)
+        and, if weights were given, weighted scores
+    """
+    thumb_passed = thumbnail_criteria_matrix(snapshot, mask)
+    title_passed = title_criteria_matrix(snapshot, mask)
+
+    weighted = None
+    if weights is not None:
+        weight_vec = np.array([weights.get(name, 1.0) for name in THUMBNAIL_CRITERIA_NAMES])
+        weighted = thumb_passed.astype(float) @ weight_vec
+
+    return LikenessScores(
+        snapshot,
+        mask,
+        thumbnail=thumb_passed.sum(axis=1).astype(np.int64),
+        title=title_passed.sum(axis=1).astype(np.int64),
+        weighted=weighted,
+    )
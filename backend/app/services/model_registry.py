@@ -0,0 +1,119 @@
+"""Process-wide registry of reusable inference tasks (MediaPipe, etc.)."""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPool:
+    """
+    A small pool of instances built from one factory.
+
+    MediaPipe tasks are not safe to call from several threads at once, so
+    each caller checks out an instance for the duration of one inference.
+    Instances are created lazily, up to max_size, and reused afterwards;
+    once the pool is full, callers wait for an instance to be returned.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_size: int):
+        self.name = name
+        self._factory = factory
+        self._max_size = max(1, max_size)
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._instances: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _try_create(self) -> Any:
+        """Create a new instance if the pool has room, else return None."""
+        with self._lock:
+            if len(self._instances) >= self._max_size:
+                return None
+            instance = self._factory()
+            self._instances.append(instance)
+            logger.debug(f"Created {self.name} instance #{len(self._instances)}")
+            return instance
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """Check out an instance for the duration of the with block."""
+        try:
+            instance = self._idle.get_nowait()
+        except queue.Empty:
+            instance = self._try_create()
+            if instance is None:
+                instance = self._idle.get()
+
+        try:
+            yield instance
+        finally:
+            self._idle.put(instance)
+
+    def close(self):
+        """Close every instance created by this pool."""
+        with self._lock:
+            for instance in self._instances:
+                close = getattr(instance, "close", None)
+                if close is None:
+                    continue
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error closing {self.name}: {e}")
+            self._instances = []
+            self._idle = queue.LifoQueue()
+
+
+# Global pool registry, one pool per task name
+_pools: Dict[str, TaskPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(
+    name: str, factory: Callable[[], Any], max_size: Optional[int] = None
+) -> TaskPool:
+    """
+    Return the pool for a task, creating it on first use.
+
+    Args:
+        name: Registry key for the task (e.g. "face_detector")
+        factory: Zero-argument callable that builds one task instance
+        max_size: Pool size when the pool is created
+            (default: settings.MODEL_POOL_SIZE)
+
+    Returns:
+        TaskPool shared by every caller in this process
+    """
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = TaskPool(name, factory, max_size or settings.MODEL_POOL_SIZE)
+            _pools[name] = pool
+        return pool
+
+
+@contextmanager
+def acquire(name: str, factory: Callable[[], Any]) -> Iterator[Any]:
+    """Check out a pooled instance of the named task."""
+    with get_pool(name, factory).acquire() as instance:
+        yield instance
+
+
+def close_all():
+    """Close all pooled tasks. Called on application shutdown."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
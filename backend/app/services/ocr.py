@@ -0,0 +1,155 @@
+"""
+OCR engine layer over Tesseract.
+
+With tesserocr installed, OCR runs on pooled in-process Tesseract APIs:
+language data is loaded once per instance and images are handed over as
+raw bytes, with no subprocess or temp file per call. Otherwise pytesseract
+runs the tesseract CLI per image. Both engines take the same PSM/OEM
+settings and return word boxes in pytesseract's image_to_data layout.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+try:
+    import tesserocr
+    from tesserocr import RIL, iterate_level
+
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import pytesseract
+    from pytesseract import Output
+
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+from app.core.config import settings
+from app.services import model_registry
+
+
+logger = logging.getLogger(__name__)
+
+# Word boxes as parallel lists: text, conf, left, top, width, height
+OcrData = Dict[str, List[Any]]
+
+
+def _engine_name() -> str:
+    """Resolve settings.OCR_ENGINE to an installed engine, or "" if none."""
+    requested = settings.OCR_ENGINE
+    if requested in ("auto", "tesserocr") and TESSEROCR_AVAILABLE:
+        return "tesserocr"
+    if requested in ("auto", "pytesseract") and PYTESSERACT_AVAILABLE:
+        return "pytesseract"
+    return ""
+
+
+def ocr_available() -> bool:
+    """True if an OCR engine is installed."""
+    return bool(_engine_name())
+
+
+def prepare_ocr_image(img: np.ndarray) -> np.ndarray:
+    """
+    Build the OCR input: optionally grayscale, at most OCR_IMAGE_SIZE.
+
+    Args:
+        img: BGR image array
+
+    Returns:
+        Contiguous grayscale (or BGR) image
+    """
+    height, width = img.shape[:2]
+    scale = settings.OCR_IMAGE_SIZE / max(height, width)
+    if scale < 1:
+        img = cv2.resize(
+            img,
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    if settings.OCR_GRAYSCALE and img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return np.ascontiguousarray(img)
+
+
+class _TesserocrEngine:
+    """One persistent Tesseract API; not safe for concurrent use."""
+
+    def __init__(self):
+        self._api = tesserocr.PyTessBaseAPI(
+            lang=settings.OCR_LANG,
+            psm=settings.OCR_PSM,
+            oem=settings.OCR_OEM,
+        )
+
+    def read(self, img: np.ndarray, psm: int) -> OcrData:
+        self._api.SetPageSegMode(psm)
+        if img.ndim == 2:
+            height, width = img.shape
+            channels = 1
+        else:
+            # Tesseract expects RGB byte order
+            img = np.ascontiguousarray(img[:, :, ::-1])
+            height, width, channels = img.shape
+        self._api.SetImageBytes(img.tobytes(), width, height, channels, width * channels)
+
+        data: OcrData = {key: [] for key in ("text", "conf", "left", "top", "width", "height")}
+        try:
+            self._api.Recognize()
+            for word in iterate_level(self._api.GetIterator(), RIL.WORD):
+                box = word.BoundingBox(RIL.WORD)
+                if box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data["text"].append(word.GetUTF8Text(RIL.WORD) or "")
+                data["conf"].append(word.Confidence(RIL.WORD))
+                data["left"].append(x1)
+                data["top"].append(y1)
+                data["width"].append(x2 - x1)
+                data["height"].append(y2 - y1)
+        finally:
+            self._api.Clear()
+        return data
+
+    def close(self):
+        self._api.End()
+
+
+def _pytesseract_read(img: np.ndarray, psm: int) -> OcrData:
+    config = f"--psm {psm} --oem {settings.OCR_OEM}"
+    return pytesseract.image_to_data(
+        img, lang=settings.OCR_LANG, config=config, output_type=Output.DICT
+    )
+
+
+def run_ocr(img: np.ndarray, psm: Optional[int] = None) -> OcrData:
+    """
+    Recognize words in a prepared image (see prepare_ocr_image).
+
+    Safe to call from several threads; each tesserocr call checks out its
+    own pooled API instance.
+
+    Args:
+        img: Grayscale or BGR image
+        psm: Page segmentation mode (default: settings.OCR_PSM)
+
+    Raises:
+        RuntimeError: If no OCR engine is installed
+    """
+    engine = _engine_name()
+    psm = settings.OCR_PSM if psm is None else psm
+    if engine == "tesserocr":
+        pool = model_registry.get_pool(
+            "tesseract", _TesserocrEngine, max_size=settings.OCR_WORKERS
+        )
+        with pool.acquire() as api:
+            return api.read(img, psm)
+    if engine == "pytesseract":
+        return _pytesseract_read(img, psm)
+    raise RuntimeError("no OCR engine available (install tesserocr or pytesseract)")
@@ -0,0 +1,185 @@
+"""
+Dominant-palette extraction backends.
+
+Every backend returns palette colors as BGR centers with their pixel
+counts, and pixel sampling is seeded, so the same image always yields the
+same palette.
+
+Backends:
+- kmeans: the original KMeans with ten restarts (reference quality)
+- minibatch: MiniBatchKMeans with a single k-means++ initialization
+- median_cut: median-cut quantization of a downsampled image
+- warm_start: Lloyd iterations seeded from a fixed global palette
+"""
+
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+from app.core.config import settings
+from app.utils.math import rgb_to_hex
+
+
+# Pixels sampled by the reference backend (its historical budget)
+_KMEANS_SAMPLE_SIZE = 10000
+
+# Seed colors for warm_start (BGR): greys plus the hue wheel at two depths
+_GLOBAL_PALETTE_BGR = np.array([
+    [0, 0, 0], [64, 64, 64], [128, 128, 128], [192, 192, 192], [255, 255, 255],
+    [0, 0, 255], [0, 128, 255], [0, 255, 255], [0, 255, 0],
+    [255, 255, 0], [255, 0, 0], [255, 0, 255],
+    [0, 0, 128], [0, 64, 128], [0, 128, 128], [0, 128, 0],
+    [128, 128, 0], [128, 0, 0], [128, 0, 128],
+], dtype=np.float32)
+
+# Palette centers (BGR float32, k x 3) and their pixel counts
+Palette = Tuple[np.ndarray, np.ndarray]
+
+
+def sample_pixels(img: np.ndarray, max_pixels: int, seed: int) -> np.ndarray:
+    """
+    Deterministically sample up to max_pixels BGR pixels as float32 rows.
+
+    Args:
+        img: BGR image array
+        max_pixels: Sample size cap
+        seed: Random seed for the sample
+
+    Returns:
+        Array of shape (n, 3)
+    """
+    pixels = img.reshape(-1, 3)
+    if len(pixels) > max_pixels:
+        rng = np.random.default_rng(seed)
+        pixels = pixels[rng.choice(len(pixels), max_pixels, replace=False)]
+    return pixels.astype(np.float32)
+
+
+def downsample(img: np.ndarray, max_pixels: int) -> np.ndarray:
+    """Area-downsample an image to at most max_pixels pixels."""
+    height, width = img.shape[:2]
+    if height * width <= max_pixels:
+        return img
+    scale = np.sqrt(max_pixels / (height * width))
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def _label_counts(labels: np.ndarray, k: int) -> np.ndarray:
+    return np.bincount(labels, minlength=k)
+
+
+def _kmeans_palette(img: np.ndarray, k: int, seed: int) -> Palette:
+    pixels = sample_pixels(img, _KMEANS_SAMPLE_SIZE, seed)
+    kmeans = KMeans(n_clusters=k, n_init=10, max_iter=100, random_state=seed)
+    kmeans.fit(pixels)
+    return kmeans.cluster_centers_, _label_counts(kmeans.labels_, k)
+
+
+def _minibatch_palette(img: np.ndarray, k: int, seed: int) -> Palette:
+    pixels = sample_pixels(img, settings.COLOR_PALETTE_SAMPLE_SIZE, seed)
+    kmeans = MiniBatchKMeans(
+        n_clusters=k,
+        init="k-means++",
+        n_init=1,
+        batch_size=1024,
+        max_iter=100,
+        random_state=seed,
+    )
+    kmeans.fit(pixels)
+    return kmeans.cluster_centers_, _label_counts(kmeans.labels_, k)
+
+
+def _median_cut_palette(img: np.ndarray, k: int, seed: int) -> Palette:
+    """Split the box with the widest channel range at its median until k boxes."""
+    pixels = downsample(img, settings.COLOR_PALETTE_SAMPLE_SIZE).reshape(-1, 3)
+    boxes = [pixels]
+    while len(boxes) < k:
+        ranges = [
+            (box.max(axis=0).astype(int) - box.min(axis=0)) if len(box) > 1 else np.zeros(3, int)
+            for box in boxes
+        ]
+        widest = int(np.argmax([r.max() for r in ranges]))
+        if ranges[widest].max() == 0:
+            # Every box is a single color; nothing left to split
+            break
+        box = boxes.pop(widest)
+        channel = int(np.argmax(ranges[widest]))
+        order = np.argsort(box[:, channel], kind="stable")
+        middle = len(box) // 2
+        boxes.extend([box[order[:middle]], box[order[middle:]]])
+
+    centers = np.array([box.mean(axis=0) for box in boxes], dtype=np.float32)
+    counts = np.array([len(box) for box in boxes])
+    return centers, counts
+
+
+def _assign(pixels: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Index of the nearest center for every pixel."""
+    distances = (
+        (pixels ** 2).sum(axis=1)[:, None]
+        - 2.0 * pixels @ centers.T
+        + (centers ** 2).sum(axis=1)[None, :]
+    )
+    return np.argmin(distances, axis=1)
+
+
+def _warm_start_palette(img: np.ndarray, k: int, seed: int) -> Palette:
+    """
+    Seed k-means with the k global palette colors covering most pixels.
+
+    Starting near the answer, a few Lloyd iterations converge without any
+    random restarts.
+    """
+    pixels = sample_pixels(img, settings.COLOR_PALETTE_SAMPLE_SIZE, seed)
+    seed_counts = _label_counts(_assign(pixels, _GLOBAL_PALETTE_BGR), len(_GLOBAL_PALETTE_BGR))
+    order = np.argsort(-seed_counts, kind="stable")
+    centers = _GLOBAL_PALETTE_BGR[order[:k]].copy()
+
+    for _ in range(settings.COLOR_PALETTE_MAX_ITER):
+        labels = _assign(pixels, centers)
+        moved = 0.0
+        for i in range(len(centers)):
+            members = pixels[labels == i]
+            if len(members):
+                updated = members.mean(axis=0)
+                moved = max(moved, float(np.abs(updated - centers[i]).max()))
+                centers[i] = updated
+        if moved < 0.5:
+            break
+
+    labels = _assign(pixels, centers)
+    return centers, _label_counts(labels, len(centers))
+
+
+PALETTE_BACKENDS: Dict[str, Callable[[np.ndarray, int, int], Palette]] = {
+    "kmeans": _kmeans_palette,
+    "minibatch": _minibatch_palette,
+    "median_cut": _median_cut_palette,
+    "warm_start": _warm_start_palette,
+}
+
+
+def compute_palette(img: np.ndarray, k: int, backend: str) -> Palette:
+    """
+    Compute palette centers and pixel counts with the named backend.
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend not in PALETTE_BACKENDS:
+        raise ValueError(f"Unknown palette backend: {backend}")
+    return PALETTE_BACKENDS[backend](img, k, settings.COLOR_PALETTE_SEED)
+
+
+def palette_to_hex(centers: np.ndarray, counts: np.ndarray) -> List[str]:
+    """Hex colors for a palette, most frequent first; empty clusters dropped."""
+    colors = []
+    for idx in np.argsort(-counts, kind="stable"):
+        if counts[idx] == 0:
+            continue
+        b, g, r = np.clip(centers[idx], 0, 255).astype(int)
+        colors.append(rgb_to_hex((int(r), int(g), int(b))))
+    return colors
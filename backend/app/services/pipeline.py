@@ -1,17 +1,32 @@
 """Feature extraction pipeline orchestration."""
 
-from typing import Dict, Any, List, Optional, Set
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+import multiprocessing
 import time
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.models.feature_payloads import validate_feature_payload
 from app.models.thumbnail import Thumbnail
-from app.services.features_color import extract_color_features
-from app.services.features_text import extract_text_features
+from app.services.cache import bump_dataset_version
+from app.utils.images import ImageSource, as_image_context, compute_image_hashes
+from app.services.features_color import (
+    extract_color_features,
+    extract_color_features_batch,
+)
+from app.services.features_text import (
+    extract_text_features,
+    extract_text_features_batch,
+)
 from app.services.features_face import extract_face_features
 from app.services.features_pose import extract_pose_features
-from app.services.features_depth import extract_depth_features
+from app.services.features_depth import (
+    extract_depth_features,
+    extract_depth_features_batch,
+)
 from app.services.features_title import extract_title_features
 
 
@@ -25,28 +40,34 @@ FEATURE_EXTRACTORS = {
     "title": extract_title_features,
 }
 
-# Extractors that use DB metadata (title, channel) instead of image_path
+# Extractors that use DB metadata (title, channel) instead of the image
 METADATA_EXTRACTORS = {"title"}
 
 ALL_FEATURES = set(FEATURE_EXTRACTORS.keys())
 
 
 def extract_all_features(
-    image_path: str,
+    image: ImageSource,
     features: Optional[Set[str]] = None,
     save_depth_map: bool = False,
     title: Optional[str] = None,
     channel: Optional[str] = None,
+    precomputed: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Extract all (or selected) features from an image.
 
+    The image is decoded once into an ImageContext and every image
+    extractor works from that shared decode.
+
     Args:
-        image_path: Path to the image file
+        image: Path to the image file, or an existing ImageContext
         features: Set of feature types to extract (default: all)
         save_depth_map: If True, save depth map visualization
         title: Video title (for title feature extraction)
         channel: Channel name (for title cleaning)
+        precomputed: Feature results already computed elsewhere (e.g. by a
+            batched extractor), keyed by feature name
 
     Returns:
         Dictionary with all extracted features
@@ -54,6 +75,7 @@ def extract_all_features(
     if features is None:
         features = ALL_FEATURES
 
+    ctx = as_image_context(image)
     result = {}
     errors = []
 
@@ -65,15 +87,20 @@ def extract_all_features(
         extractor = FEATURE_EXTRACTORS[feature_name]
 
         try:
-            if feature_name in METADATA_EXTRACTORS:
+            if precomputed and feature_name in precomputed:
+                feature_data = precomputed[feature_name]
+            elif feature_name in METADATA_EXTRACTORS:
                 feature_data = extractor(title or "", channel=channel)
             elif feature_name == "depth":
-                feature_data = extractor(image_path, save_depth_map=save_depth_map)
+                feature_data = extractor(ctx, save_depth_map=save_depth_map)
             else:
-                feature_data = extractor(image_path)
+                feature_data = extractor(ctx)
 
             if feature_data:
                 result[feature_name] = feature_data
+                problem = validate_feature_payload(feature_name, feature_data)
+                if problem:
+                    errors.append(f"{feature_name}: invalid payload: {problem}")
         except Exception as e:
             errors.append(f"{feature_name}: {str(e)}")
             result[feature_name] = {"error": str(e)}
@@ -84,6 +111,300 @@ def extract_all_features(
     return result
 
 
+def extract_features_batch(
+    jobs: List[Dict[str, Any]],
+    save_depth_map: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Extract features for several thumbnails, batching depth, color and OCR.
+
+    Depth runs once for every job that requests it, as batched MiDaS
+    forward passes, color statistics come from one stacked pass over the
+    chunk, and OCR runs concurrently across the chunk; every other
+    extractor runs per image on the shared ImageContext.
+
+    Args:
+        jobs: One dict per thumbnail with keys "image" (path or
+            ImageContext), "features", "title", "channel" and optionally
+            "precomputed" (feature results to reuse instead of extracting)
+        save_depth_map: If True, save depth map visualizations
+
+    Returns:
+        List of feature dictionaries, in job order
+    """
+    contexts = [as_image_context(job["image"]) for job in jobs]
+
+    def wanted(name: str) -> List[int]:
+        return [
+            i for i, job in enumerate(jobs)
+            if name in job["features"] and name not in (job.get("precomputed") or {})
+        ]
+
+    depth_results: Dict[int, Dict[str, Any]] = {}
+    depth_indices = wanted("depth")
+    if depth_indices:
+        try:
+            batch = extract_depth_features_batch(
+                [contexts[i] for i in depth_indices],
+                save_depth_map=save_depth_map,
+            )
+            depth_results = dict(zip(depth_indices, batch))
+        except Exception:
+            # Fall back to per-image depth extraction below
+            depth_results = {}
+
+    color_results: Dict[int, Dict[str, Any]] = {}
+    color_indices = wanted("color")
+    if color_indices:
+        try:
+            batch = extract_color_features_batch([contexts[i] for i in color_indices])
+            color_results = dict(zip(color_indices, batch))
+        except Exception:
+            # Fall back to per-image color extraction below
+            color_results = {}
+
+    text_results: Dict[int, Dict[str, Any]] = {}
+    text_indices = wanted("text")
+    if text_indices:
+        try:
+            batch = extract_text_features_batch([contexts[i] for i in text_indices])
+            text_results = dict(zip(text_indices, batch))
+        except Exception:
+            # Fall back to per-image OCR below
+            text_results = {}
+
+    results = []
+    for i, job in enumerate(jobs):
+        precomputed = dict(job.get("precomputed") or {})
+        if i in depth_results:
+            precomputed["depth"] = depth_results[i]
+        if color_results.get(i):
+            precomputed["color"] = color_results[i]
+        if text_results.get(i):
+            precomputed["text"] = text_results[i]
+        results.append(extract_all_features(
+            contexts[i],
+            features=job["features"],
+            save_depth_map=save_depth_map,
+            title=job.get("title"),
+            channel=job.get("channel"),
+            precomputed=precomputed,
+        ))
+
+    return results
+
+
+def _features_to_extract(
+    thumbnail: Thumbnail,
+    features: Set[str],
+    force: bool,
+) -> Optional[Set[str]]:
+    """
+    Work out which features still need extracting for a thumbnail.
+
+    Args:
+        thumbnail: Thumbnail record to inspect
+        features: Requested feature types
+        force: If True, re-extract everything requested
+
+    Returns:
+        Set of feature types to extract, or None if nothing is missing
+    """
+    if thumbnail.features_extracted and not force:
+        existing = thumbnail.get_features()
+        # Check if all requested features are present
+        missing = features - set(existing.keys())
+        if not missing:
+            return None
+        # Only process missing features
+        return missing
+    return features
+
+
+def _image_features(features: Dict[str, Any], names: Set[str]) -> Dict[str, Dict[str, Any]]:
+    """Successful image (non-metadata) feature results among names."""
+    return {
+        name: features[name]
+        for name in names - METADATA_EXTRACTORS
+        if isinstance(features.get(name), dict) and "error" not in features[name]
+    }
+
+
+def _ensure_hashes(thumbnail: Thumbnail):
+    """Compute hashes missing from a thumbnail; saved with its features."""
+    if thumbnail.content_hash is None:
+        thumbnail.content_hash, thumbnail.phash = compute_image_hashes(thumbnail.file_path)
+
+
+def _reusable_features(
+    db: Session,
+    thumbnail: Thumbnail,
+    to_extract: Set[str],
+    force: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Image features copied from an already-processed identical thumbnail.
+
+    Rows are matched on content hash, or on perceptual hash when
+    PIPELINE_REUSE_PERCEPTUAL is set. Missing hashes are computed here
+    and saved with the thumbnail's features. Metadata features (title)
+    are never copied since they depend on the row, not the image.
+
+    A forced run re-extracts on purpose (e.g. after an extractor changed),
+    so stored features are never reused then; duplicates within the run
+    are handled by _DuplicateTracker instead.
+
+    Returns:
+        Feature results keyed by feature name (empty if no match)
+    """
+    _ensure_hashes(thumbnail)
+    if force:
+        return {}
+
+    candidates = [(Thumbnail.content_hash, thumbnail.content_hash)]
+    if settings.PIPELINE_REUSE_PERCEPTUAL:
+        candidates.append((Thumbnail.phash, thumbnail.phash))
+
+    for column, value in candidates:
+        if value is None:
+            continue
+        donor = db.query(Thumbnail).filter(
+            column == value,
+            Thumbnail.id != thumbnail.id,
+            Thumbnail.features_extracted == True,
+        ).first()
+        if donor is None:
+            continue
+        return _image_features(donor.get_features(), to_extract)
+
+    return {}
+
+
+class _DuplicateTracker:
+    """
+    Thumbnails of one run that share a content hash.
+
+    The first thumbnail with a given hash (the leader) is extracted; later
+    ones whose image features it covers follow it and copy its results
+    instead of being extracted again. This also covers duplicates that
+    cannot reuse a stored donor: those in the same uncommitted batch, in
+    chunks planned before any result was written (parallel runs), and
+    every duplicate of a forced run.
+    """
+
+    def __init__(self):
+        # content hash -> (leader id, image features the leader extracts)
+        self._leaders: Dict[str, Tuple[int, Set[str]]] = {}
+        # leader id -> followers waiting for its result
+        self._waiting: Dict[int, List[Tuple[Thumbnail, Set[str]]]] = {}
+        # content hash -> finished leader's image features
+        self._finished: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def plan(
+        self, thumbnail: Thumbnail, to_extract: Set[str]
+    ) -> Tuple[bool, Dict[str, Dict[str, Any]]]:
+        """
+        Register a thumbnail about to be extracted.
+
+        Returns:
+            Tuple of (deferred, precomputed): deferred is True if the
+            thumbnail waits for a leader that has not finished yet;
+            precomputed holds a finished leader's features to reuse
+        """
+        content_hash = thumbnail.content_hash
+        if content_hash is None:
+            return False, {}
+        if content_hash in self._finished:
+            return False, _image_features(self._finished[content_hash], to_extract)
+
+        leader = self._leaders.get(content_hash)
+        if leader is None or leader[0] not in self._waiting:
+            # First with this hash, or the previous leader failed
+            self._leaders[content_hash] = (thumbnail.id, to_extract - METADATA_EXTRACTORS)
+            self._waiting[thumbnail.id] = []
+            return False, {}
+        leader_id, leader_features = leader
+        if not (to_extract - METADATA_EXTRACTORS) <= leader_features:
+            # Needs image features the leader does not compute
+            return False, {}
+        self._waiting[leader_id].append((thumbnail, to_extract))
+        return True, {}
+
+    def finish(
+        self, leader: Thumbnail, extracted: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Thumbnail, Set[str]]]:
+        """
+        Record a leader's result (None if it failed) and release its followers.
+
+        Returns:
+            The followers that were waiting for it, with their feature sets
+        """
+        followers = self._waiting.pop(leader.id, None)
+        if followers is None:
+            return []
+        if extracted is not None:
+            self._finished[leader.content_hash] = _image_features(
+                extracted, set(extracted.keys())
+            )
+        return followers
+
+    def follower_results(
+        self, leader: Thumbnail, followers: List[Tuple[Thumbnail, Set[str]]]
+    ) -> List[Dict[str, Any]]:
+        """Feature dictionaries for followers, reusing the leader's image features."""
+        reused = self._finished.get(leader.content_hash, {})
+        return [
+            extract_all_features(
+                thumbnail.file_path,
+                features=to_extract,
+                title=thumbnail.title,
+                channel=thumbnail.channel,
+                precomputed={n: reused[n] for n in to_extract if n in reused},
+            )
+            for thumbnail, to_extract in followers
+        ]
+
+
+def _extracted_result(
+    thumbnail: Thumbnail,
+    extracted: Dict[str, Any],
+    processing_time: float,
+) -> Dict[str, Any]:
+    """Build the process_thumbnail result for applied features."""
+    return {
+        "status": "processed",
+        "thumbnail_id": thumbnail.id,
+        "features_extracted": list(extracted.keys()),
+        "processing_time": round(processing_time, 2),
+        "errors": extracted.get("_errors", []),
+    }
+
+
+def _apply_extracted(
+    db: Session,
+    thumbnail: Thumbnail,
+    extracted: Dict[str, Any],
+    processing_time: float,
+) -> Dict[str, Any]:
+    """
+    Store extracted features on a thumbnail and commit.
+
+    Args:
+        db: Database session
+        thumbnail: Thumbnail record to update
+        extracted: Feature dictionary from extract_all_features
+        processing_time: Extraction time in seconds
+
+    Returns:
+        Dictionary with processing status
+    """
+    thumbnail.update_features(extracted)
+    bump_dataset_version(db)
+    db.commit()
+
+    return _extracted_result(thumbnail, extracted, processing_time)
+
+
 def process_thumbnail(
     db: Session,
     thumbnail: Thumbnail,
@@ -108,74 +429,454 @@ def process_thumbnail(
         features = ALL_FEATURES
 
     # Check if already processed (unless force)
-    if thumbnail.features_extracted and not force:
-        existing = thumbnail.get_features()
-        # Check if all requested features are present
-        missing = features - set(existing.keys())
-        if not missing:
-            return {
-                "status": "skipped",
-                "reason": "already processed",
-                "thumbnail_id": thumbnail.id,
-            }
-        # Only process missing features
-        features = missing
+    to_extract = _features_to_extract(thumbnail, features, force)
+    if to_extract is None:
+        return {
+            "status": "skipped",
+            "reason": "already processed",
+            "thumbnail_id": thumbnail.id,
+        }
 
     # Extract features
     start_time = time.time()
     extracted = extract_all_features(
         thumbnail.file_path,
-        features=features,
+        features=to_extract,
         save_depth_map=save_depth_map,
         title=thumbnail.title,
         channel=thumbnail.channel,
+        precomputed=_reusable_features(db, thumbnail, to_extract, force),
     )
     processing_time = time.time() - start_time
 
     # Update database
-    thumbnail.update_features(extracted)
-    db.commit()
+    return _apply_extracted(db, thumbnail, extracted, processing_time)
+
+
+def _init_worker():
+    """
+    Initialize a pipeline worker process.
+
+    The MiDaS model and the pooled MediaPipe tasks are cached per process,
+    so every worker loads them once on first use and reuses them for the
+    rest of the run. Torch is limited to one intra-op thread per worker so
+    N workers do not oversubscribe the CPU.
+    """
+    try:
+        import torch
+
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
+def _extract_in_worker(
+    jobs: List[Dict[str, Any]],
+    save_depth_map: bool,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Extract features for one chunk of thumbnails inside a worker process.
+
+    Args:
+        jobs: Chunk of extraction jobs (see extract_features_batch)
+        save_depth_map: If True, save depth map visualizations
+
+    Returns:
+        Tuple of (feature dictionaries in job order, processing time)
+    """
+    start_time = time.time()
+    results = extract_features_batch(jobs, save_depth_map=save_depth_map)
+    return results, time.time() - start_time
+
+
+def _record_result(
+    stats: Dict[str, Any], thumbnail_id: int, result: Dict[str, Any]
+):
+    """Fold a process_thumbnail-style result into pipeline stats."""
+    if result["status"] == "processed":
+        stats["processed"] += 1
+    else:
+        stats["skipped"] += 1
+
+    if result.get("errors"):
+        stats["error_details"].extend([
+            {"thumbnail_id": thumbnail_id, "error": e}
+            for e in result["errors"]
+        ])
+
+
+def _record_error(stats: Dict[str, Any], thumbnail_id: int, error: Exception):
+    """Record a thumbnail that failed outright."""
+    stats["errors"] += 1
+    stats["error_details"].append({
+        "thumbnail_id": thumbnail_id,
+        "error": str(error),
+    })
+
+
+# Callback invoked with (thumbnails done, total) after every chunk
+ProgressCallback = Callable[[int, int], None]
+
+
+def _log_progress(
+    before: int,
+    after: int,
+    total: int,
+    progress: Optional[ProgressCallback] = None,
+):
+    """Print progress each time another 10 thumbnails are done."""
+    if after // 10 > before // 10:
+        print(f"Processed {after}/{total} thumbnails...")
+    if progress is not None:
+        progress(after, total)
+
+
+def _stop_requested(should_stop: Optional[Callable[[], bool]], stats: Dict[str, Any]) -> bool:
+    """Check the caller's stop flag, marking the run as cancelled."""
+    if should_stop is not None and should_stop():
+        stats["cancelled"] = True
+        return True
+    return False
+
 
+def _plan_chunk(
+    db: Session,
+    chunk: List[Thumbnail],
+    features: Set[str],
+    force: bool,
+    stats: Dict[str, Any],
+    tracker: _DuplicateTracker,
+) -> Tuple[List[Thumbnail], List[Dict[str, Any]]]:
+    """
+    Build extraction jobs for a chunk, recording skipped thumbnails.
+
+    Features available from an identical thumbnail, either stored or
+    already extracted in this run, are attached as precomputed results
+    so they are not extracted again. Duplicates of a thumbnail still
+    being extracted in this run get no job; they are completed from its
+    result by _finish_chunk.
+
+    Returns:
+        Tuple of (thumbnails to extract, matching jobs)
+    """
+    pending = []
+    jobs = []
+    for thumbnail in chunk:
+        to_extract = _features_to_extract(thumbnail, features, force)
+        if to_extract is None:
+            _record_result(stats, thumbnail.id, {"status": "skipped"})
+            continue
+        _ensure_hashes(thumbnail)
+        deferred, reused = tracker.plan(thumbnail, to_extract)
+        if deferred:
+            continue
+        reused = reused or _reusable_features(db, thumbnail, to_extract, force)
+        if reused:
+            stats["reused"] += 1
+        pending.append(thumbnail)
+        jobs.append({
+            "image": thumbnail.file_path,
+            "features": to_extract,
+            "title": thumbnail.title,
+            "channel": thumbnail.channel,
+            "precomputed": reused,
+        })
+    return pending, jobs
+
+
+def _finish_chunk(
+    writer: "_ResultWriter",
+    tracker: _DuplicateTracker,
+    stats: Dict[str, Any],
+    pending: List[Thumbnail],
+    extracted_list: Optional[List[Dict[str, Any]]],
+    processing_time: float,
+    error: Optional[Exception] = None,
+):
+    """
+    Queue a chunk's results, plus those of in-run duplicates waiting on it.
+
+    Args:
+        extracted_list: Results in pending order, or None if the chunk
+            failed with error (its duplicates then fail with it)
+    """
+    if extracted_list is None:
+        for thumbnail in pending:
+            _record_error(stats, thumbnail.id, error)
+            for follower, _ in tracker.finish(thumbnail, None):
+                _record_error(stats, follower.id, error)
+        return
+
+    writer.add_chunk(pending, extracted_list, processing_time)
+    for thumbnail, extracted in zip(pending, extracted_list):
+        followers = tracker.finish(thumbnail, extracted)
+        if not followers:
+            continue
+        start_time = time.time()
+        try:
+            results = tracker.follower_results(thumbnail, followers)
+        except Exception as e:
+            for follower, _ in followers:
+                _record_error(stats, follower.id, e)
+            continue
+        stats["reused"] += len(followers)
+        writer.add_chunk(
+            [follower for follower, _ in followers], results, time.time() - start_time
+        )
+
+
+class _ResultWriter:
+    """
+    Buffer extraction results and write them in batches.
+
+    Results are merged into their thumbnails and committed together once
+    settings.PIPELINE_COMMIT_BATCH have accumulated, with a single dataset
+    version bump per batch. Nothing touches the database until a flush, so
+    the write transaction stays short and a crash loses at most the
+    buffered batch; those thumbnails are still unprocessed and the next
+    run picks them up again.
+    """
+
+    def __init__(self, db: Session, stats: Dict[str, Any]):
+        self._db = db
+        self._stats = stats
+        self._batch_size = max(1, settings.PIPELINE_COMMIT_BATCH)
+        self._buffer: List[Tuple[Thumbnail, Dict[str, Any], float]] = []
+
+    def add_chunk(
+        self,
+        pending: List[Thumbnail],
+        extracted_list: List[Dict[str, Any]],
+        processing_time: float,
+    ):
+        """Queue a chunk of extraction results, flushing full batches."""
+        per_thumbnail = processing_time / max(len(pending), 1)
+        for thumbnail, extracted in zip(pending, extracted_list):
+            self._buffer.append((thumbnail, extracted, per_thumbnail))
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered results in one transaction."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+
+        try:
+            results = []
+            for thumbnail, extracted, per_thumbnail in batch:
+                thumbnail.update_features(extracted)
+                results.append(
+                    _extracted_result(thumbnail, extracted, per_thumbnail)
+                )
+            bump_dataset_version(self._db)
+            self._db.commit()
+        except Exception:
+            # One bad row should not cost the whole batch: retry one by one
+            self._db.rollback()
+            for thumbnail, extracted, per_thumbnail in batch:
+                try:
+                    result = _apply_extracted(
+                        self._db, thumbnail, extracted, per_thumbnail
+                    )
+                    _record_result(self._stats, thumbnail.id, result)
+                except Exception as e:
+                    self._db.rollback()
+                    _record_error(self._stats, thumbnail.id, e)
+        else:
+            for (thumbnail, _, _), result in zip(batch, results):
+                _record_result(self._stats, thumbnail.id, result)
+
+
+def _chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most size items."""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run_serial(
+    db: Session,
+    thumbnails: List[Thumbnail],
+    features: Set[str],
+    force: bool,
+    save_depth_maps: bool,
+    stats: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+):
+    """Process thumbnails chunk by chunk in the current process."""
+    writer = _ResultWriter(db, stats)
+    tracker = _DuplicateTracker()
+    done = 0
+    for chunk in _chunked(thumbnails, settings.DEPTH_BATCH_SIZE):
+        if _stop_requested(should_stop, stats):
+            break
+
+        pending, jobs = _plan_chunk(db, chunk, features, force, stats, tracker)
+
+        if jobs:
+            start_time = time.time()
+            try:
+                extracted_list = extract_features_batch(
+                    jobs, save_depth_map=save_depth_maps
+                )
+            except Exception as e:
+                _finish_chunk(writer, tracker, stats, pending, None, 0.0, error=e)
+            else:
+                _finish_chunk(
+                    writer, tracker, stats, pending, extracted_list,
+                    time.time() - start_time,
+                )
+
+        _log_progress(done, done + len(chunk), len(thumbnails), progress)
+        done += len(chunk)
+        stats["last_thumbnail_id"] = chunk[-1].id
+
+    writer.flush()
+
+
+def _run_parallel(
+    db: Session,
+    thumbnails: List[Thumbnail],
+    features: Set[str],
+    force: bool,
+    save_depth_maps: bool,
+    stats: Dict[str, Any],
+    workers: int,
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+):
+    """
+    Spread extraction over a process pool; write results from this process.
+
+    Workers only extract features, one chunk of DEPTH_BATCH_SIZE thumbnails
+    per task so depth inference stays batched. All database reads and
+    writes stay in the calling process, so SQLite only ever sees a single
+    writer.
+    """
+    # Spawn rather than fork: torch and MediaPipe do not survive a fork
+    # of a process that has already initialized them.
+    context = multiprocessing.get_context("spawn")
+    writer = _ResultWriter(db, stats)
+    tracker = _DuplicateTracker()
+    done = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+    ) as executor:
+        chunks = _chunked(thumbnails, settings.DEPTH_BATCH_SIZE)
+        finished = [False] * len(chunks)
+        resume_at = 0
+
+        def mark_finished(index: int):
+            # Resuming is only safe after the longest fully finished prefix
+            nonlocal resume_at
+            finished[index] = True
+            while resume_at < len(chunks) and finished[resume_at]:
+                stats["last_thumbnail_id"] = chunks[resume_at][-1].id
+                resume_at += 1
+
+        futures = {}
+        for index, chunk in enumerate(chunks):
+            pending, jobs = _plan_chunk(db, chunk, features, force, stats, tracker)
+            done += len(chunk) - len(pending)
+            if jobs:
+                future = executor.submit(_extract_in_worker, jobs, save_depth_maps)
+                futures[future] = (index, pending)
+            else:
+                mark_finished(index)
+
+        for future in as_completed(futures):
+            if _stop_requested(should_stop, stats):
+                # Drop queued chunks; chunks already running finish unused
+                for queued in futures:
+                    queued.cancel()
+                break
+
+            index, pending = futures[future]
+            try:
+                extracted_list, processing_time = future.result()
+            except Exception as e:
+                _finish_chunk(writer, tracker, stats, pending, None, 0.0, error=e)
+            else:
+                _finish_chunk(writer, tracker, stats, pending, extracted_list, processing_time)
+            mark_finished(index)
+
+            _log_progress(done, done + len(pending), len(thumbnails), progress)
+            done += len(pending)
+
+    writer.flush()
+
+
+def _new_stats(total: int) -> Dict[str, Any]:
     return {
-        "status": "processed",
-        "thumbnail_id": thumbnail.id,
-        "features_extracted": list(extracted.keys()),
-        "processing_time": round(processing_time, 2),
-        "errors": extracted.get("_errors", []),
+        "total": total,
+        "processed": 0,
+        "skipped": 0,
+        "reused": 0,
+        "errors": 0,
+        "error_details": [],
+        "cancelled": False,
+        "total_time": 0,
     }
 
 
-def run_pipeline(
+def process_thumbnails(
     db: Session,
-    group: Optional[str] = None,
+    thumbnails: List[Thumbnail],
     features: Optional[Set[str]] = None,
     force: bool = False,
-    limit: Optional[int] = None,
     save_depth_maps: bool = False,
 ) -> Dict[str, Any]:
     """
-    Run the feature extraction pipeline on thumbnails.
+    Process a given list of thumbnails in batches in this process.
 
     Args:
-        db: Database session
-        group: Filter by group (default: all groups)
+        db: Database session the thumbnails belong to
+        thumbnails: Thumbnail records to process
         features: Set of feature types to extract (default: all)
-        force: If True, reprocess all thumbnails
-        limit: Maximum number of thumbnails to process
+        force: If True, reprocess even if already processed
         save_depth_maps: If True, save depth map visualizations
 
     Returns:
         Dictionary with pipeline statistics
     """
-    if features is None:
-        features = ALL_FEATURES
+    stats = _new_stats(len(thumbnails))
+    start_time = time.time()
+    _run_serial(db, thumbnails, features or ALL_FEATURES, force, save_depth_maps, stats)
+    stats["total_time"] = round(time.time() - start_time, 2)
+    return stats
 
-    # Build query
-    query = db.query(Thumbnail)
+
+def pipeline_query(
+    db: Session,
+    group: Optional[str] = None,
+    force: bool = False,
+    after_id: int = 0,
+):
+    """
+    Query for the thumbnails a pipeline run would visit, in id order.
+
+    Args:
+        db: Database session
+        group: Filter by group (default: all groups)
+        force: If True, include already-processed thumbnails
+        after_id: Only thumbnails with a greater id (for resuming)
+
+    Returns:
+        SQLAlchemy query ordered by Thumbnail.id
+    """
+    # Stale rows have no file left to extract from
+    query = db.query(Thumbnail).filter(Thumbnail.is_stale == False)
 
     if group:
         query = query.filter(Thumbnail.group == group)
 
+    if after_id:
+        query = query.filter(Thumbnail.id > after_id)
+
     if not force:
         # Only get unprocessed or partially processed
         query = query.filter(
@@ -183,53 +884,65 @@ def run_pipeline(
             (Thumbnail.features_json == None)
         )
 
-    if limit:
-        query = query.limit(limit)
+    return query.order_by(Thumbnail.id)
 
-    thumbnails = query.all()
 
-    stats = {
-        "total": len(thumbnails),
-        "processed": 0,
-        "skipped": 0,
-        "errors": 0,
-        "error_details": [],
-        "total_time": 0,
-    }
+def run_pipeline(
+    db: Session,
+    group: Optional[str] = None,
+    features: Optional[Set[str]] = None,
+    force: bool = False,
+    limit: Optional[int] = None,
+    save_depth_maps: bool = False,
+    workers: int = 1,
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    after_id: int = 0,
+) -> Dict[str, Any]:
+    """
+    Run the feature extraction pipeline on thumbnails.
 
-    start_time = time.time()
+    Args:
+        db: Database session
+        group: Filter by group (default: all groups)
+        features: Set of feature types to extract (default: all)
+        force: If True, reprocess all thumbnails
+        limit: Maximum number of thumbnails to process
+        save_depth_maps: If True, save depth map visualizations
+        workers: Number of extraction processes (1 = run in this process)
+        progress: Called with (thumbnails done, total) after every chunk
+        should_stop: Polled between chunks; returning True ends the run early
+        after_id: Only visit thumbnails with a greater id (for resuming)
 
-    for i, thumbnail in enumerate(thumbnails):
-        try:
-            result = process_thumbnail(
-                db,
-                thumbnail,
-                features=features,
-                force=force,
-                save_depth_map=save_depth_maps,
-            )
+    Returns:
+        Dictionary with pipeline statistics
+    """
+    if features is None:
+        features = ALL_FEATURES
 
-            if result["status"] == "processed":
-                stats["processed"] += 1
-            else:
-                stats["skipped"] += 1
+    query = pipeline_query(db, group=group, force=force, after_id=after_id)
+    if limit:
+        query = query.limit(limit)
 
-            if result.get("errors"):
-                stats["error_details"].extend([
-                    {"thumbnail_id": thumbnail.id, "error": e}
-                    for e in result["errors"]
-                ])
+    thumbnails = query.all()
 
-            # Progress logging
-            if (i + 1) % 10 == 0:
-                print(f"Processed {i + 1}/{len(thumbnails)} thumbnails...")
+    stats = _new_stats(len(thumbnails))
+    # Advanced as chunks finish, so a stopped run resumes after the last
+    # thumbnail that was actually handled
+    stats["last_thumbnail_id"] = after_id
 
-        except Exception as e:
-            stats["errors"] += 1
-            stats["error_details"].append({
-                "thumbnail_id": thumbnail.id,
-                "error": str(e),
-            })
+    start_time = time.time()
+
+    if workers > 1 and len(thumbnails) > 1:
+        _run_parallel(
+            db, thumbnails, features, force, save_depth_maps, stats, workers,
+            progress=progress, should_stop=should_stop,
+        )
+    else:
+        _run_serial(
+            db, thumbnails, features, force, save_depth_maps, stats,
+            progress=progress, should_stop=should_stop,
+        )
 
     stats["total_time"] = round(time.time() - start_time, 2)
 
@@ -0,0 +1,250 @@
+"""Incremental directory scanning backed by a persisted file manifest."""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.serialization import dumps, loads
+from app.utils.images import SUPPORTED_EXTENSIONS, file_content_hash
+
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+
+
+def default_manifest_path() -> Path:
+    """Manifest location: settings.SCAN_MANIFEST_PATH, else next to the SQLite DB."""
+    if settings.SCAN_MANIFEST_PATH is not None:
+        return Path(settings.SCAN_MANIFEST_PATH)
+    database = make_url(settings.DATABASE_URL).database
+    if database and database != ":memory:":
+        db_path = Path(database)
+        return db_path.with_name(db_path.name + ".scan_manifest.json")
+    return settings.DATA_DIR / "scan_manifest.json"
+
+
+class ScanResult:
+    """Outcome of scanning one group directory against the manifest."""
+
+    def __init__(self):
+        self.added: List[Path] = []
+        self.modified: List[Path] = []
+        self.removed: List[Path] = []
+        self.total_found = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+class ScanManifest:
+    """
+    Per-group record of directory mtimes and (size, mtime_ns, hash) per file.
+
+    A directory whose mtime is unchanged has had no entries added, removed
+    or renamed, so its file list is reused without listing it. Files in
+    changed directories are re-stat'ed; a size/mtime change is confirmed
+    with a content hash before the file counts as modified. In-place
+    rewrites that keep the directory mtime are picked up by the watcher,
+    or by a scan with verify=True.
+
+    The manifest records the identity of the database it was built
+    against (see bind_database); pointed at a different database it starts
+    over, since none of its files are known there.
+
+    Layout on disk:
+        {"version": 1, "database_id": id,
+         "groups": {group: {dir: [mtime_ns, [subdirs],
+                                  {name: [size, mtime_ns, hash]}]}}}
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_manifest_path()
+        self._lock = threading.Lock()
+        self._database_id: Optional[str] = None
+        self._groups: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            data = loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scan manifest {self.path}: {e}")
+            return {}
+        if data.get("version") != _MANIFEST_VERSION:
+            return {}
+        self._database_id = data.get("database_id")
+        return data.get("groups", {})
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        with self._lock:
+            payload = dumps({
+                "version": _MANIFEST_VERSION,
+                "database_id": self._database_id,
+                "groups": self._groups,
+            })
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self.path)
+
+    def bind_database(self, database_id: Optional[str]):
+        """
+        Tie the manifest to a database, forgetting every group if it changed.
+
+        Args:
+            database_id: Identity of the database being ingested into
+                (None if unknown, which leaves the manifest as is)
+        """
+        if database_id is None:
+            return
+        with self._lock:
+            if database_id == self._database_id:
+                return
+            if self._groups:
+                logger.info("Scan manifest was built for another database; rescanning all groups")
+            self._groups = {}
+            self._database_id = database_id
+
+    def forget(self, group: str):
+        """Drop a group so its next scan is a full one."""
+        with self._lock:
+            self._groups.pop(group, None)
+
+    def file_count(self, group: str) -> int:
+        """Number of files the manifest currently records for a group."""
+        with self._lock:
+            dirs = self._groups.get(group, {})
+            return sum(len(files) for _, _, files in dirs.values())
+
+    def scan(self, group: str, directory: Path, verify: bool = False) -> Tuple[ScanResult, dict]:
+        """
+        Scan a group directory and diff it against the manifest.
+
+        The manifest is not updated until commit() is called with the
+        returned state, so a failed database write can be retried.
+
+        Args:
+            group: Group name (manifest key)
+            directory: Group directory to scan
+            verify: Re-stat every file even in unchanged directories
+
+        Returns:
+            Tuple of (ScanResult, new group state for commit())
+        """
+        with self._lock:
+            old_dirs: Dict[str, list] = self._groups.get(group, {})
+
+        new_dirs: Dict[str, list] = {}
+        result = ScanResult()
+
+        root = str(Path(directory).resolve())
+        stack = [root] if os.path.isdir(root) else []
+
+        while stack:
+            current = stack.pop()
+            try:
+                dir_mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+
+            previous = old_dirs.get(current)
+            old_files = previous[2] if previous is not None else {}
+
+            if previous is not None and previous[0] == dir_mtime and not verify:
+                # Entries unchanged: reuse the known files and subdirectories
+                subdirs, files = previous[1], old_files
+            else:
+                subdirs, files = [], {}
+                try:
+                    entries = list(os.scandir(current))
+                except OSError:
+                    entries = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=True):
+                            subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=True):
+                            continue
+                        if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+
+                    known = old_files.get(entry.name)
+                    if known is not None and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+                        files[entry.name] = known
+                        continue
+
+                    content_hash = file_content_hash(entry.path)
+                    if known is None:
+                        result.added.append(Path(entry.path))
+                    elif content_hash != known[2]:
+                        result.modified.append(Path(entry.path))
+                    files[entry.name] = [st.st_size, st.st_mtime_ns, content_hash]
+
+                result.removed.extend(
+                    Path(current) / name for name in old_files if name not in files
+                )
+
+            new_dirs[current] = [dir_mtime, subdirs, files]
+            result.total_found += len(files)
+            stack.extend(subdirs)
+
+        # Directories that disappeared take their files with them
+        for dir_path, (_, _, files) in old_dirs.items():
+            if dir_path not in new_dirs:
+                result.removed.extend(Path(dir_path) / name for name in files)
+
+        result.added.sort()
+        result.modified.sort()
+        result.removed.sort()
+
+        return result, new_dirs
+
+    def commit(self, group: str, state: dict):
+        """Record a scanned group state (call save() to persist)."""
+        with self._lock:
+            self._groups[group] = state
+
+
+def state_files(state: dict) -> List[Path]:
+    """Every file recorded in a scanned group state, sorted."""
+    return sorted(
+        Path(dir_path) / name
+        for dir_path, (_, _, files) in state.items()
+        for name in files
+    )
+
+
+def state_hashes(state: dict) -> Dict[str, str]:
+    """Content hash of every file in a scanned group state, keyed by path."""
+    return {
+        str(Path(dir_path) / name): entry[2]
+        for dir_path, (_, _, files) in state.items()
+        for name, entry in files.items()
+        if entry[2] is not None
+    }
+
+
+_manifest: Optional[ScanManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_scan_manifest() -> ScanManifest:
+    """Process-wide manifest, loaded on first use."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = ScanManifest()
+        return _manifest
@@ -1,18 +1,22 @@
 """File watcher service for automatic thumbnail ingestion and processing."""
 
 import logging
+import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent
+from watchdog.events import FileSystemEventHandler
 
 from app.core.config import settings
 from app.core.db import SessionLocal
-from app.services.ingest import ingest_thumbnail
-from app.services.pipeline import process_thumbnail
-from app.utils.images import is_image_file
+from app.services.cache import bump_dataset_version
+from app.services.ingest import ingest_thumbnail, mark_files_modified, mark_files_stale
+from app.services.pipeline import process_thumbnails
+from app.utils.images import file_content_hash, is_image_file
 
 
 logger = logging.getLogger(__name__)
@@ -20,81 +24,237 @@ logger = logging.getLogger(__name__)
 # Global observer instance
 _observer: Optional[Observer] = None
 _observer_lock = threading.Lock()
+_queue: Optional["SettleQueue"] = None
+
+
+def _get_group_from_path(file_path: Path) -> Optional[str]:
+    """Extract group name from file path."""
+    # Expected structure: .../thumbnails/{group}/image.jpg
+    try:
+        parent = file_path.parent.name.lower()
+        if parent in settings.VALID_GROUPS:
+            return parent
+    except Exception:
+        pass
+    return None
+
+
+class _Pending:
+    """A path waiting for its size and mtime to stop changing."""
+
+    __slots__ = ("group", "last_event", "signature")
+
+    def __init__(self, group: str):
+        self.group = group
+        self.last_event = time.monotonic()
+        self.signature: Optional[Tuple[int, int]] = None
+
+
+class SettleQueue:
+    """
+    Deduplicating queue of changed image files, drained by a worker pool.
+
+    Repeated events for a path collapse into one entry. An entry becomes
+    ready once no event has arrived for settings.WATCHER_SETTLE_SECONDS
+    and two consecutive polls see the same (size, mtime), so files that
+    are still being written are never read. Ready files are processed in
+    batches of DEPTH_BATCH_SIZE by a fixed pool of WATCHER_WORKERS threads.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, _Pending] = {}
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.WATCHER_WORKERS),
+            thread_name_prefix="watcher",
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="watcher-dispatch", daemon=True
+        )
+
+    def start(self):
+        self._dispatcher.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop dispatching; batches already handed to workers finish."""
+        self._stop.set()
+        self._dispatcher.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def push(self, file_path: Path, group: str):
+        """Record an event for a file, restarting its settle timer."""
+        key = str(file_path)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = _Pending(group)
+            else:
+                entry.group = group
+                entry.last_event = time.monotonic()
+
+    def discard(self, file_path: Path):
+        """Forget a pending file (e.g. it was moved away or deleted)."""
+        with self._lock:
+            self._pending.pop(str(file_path), None)
+
+    def _collect_ready(self) -> List[Tuple[str, str]]:
+        """Pop settled entries as (path, group) pairs."""
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for key, entry in list(self._pending.items()):
+                if key in self._in_flight:
+                    continue
+                if now - entry.last_event < settings.WATCHER_SETTLE_SECONDS:
+                    continue
+                try:
+                    st = os.stat(key)
+                except OSError:
+                    # Vanished before it settled
+                    del self._pending[key]
+                    continue
+                signature = (st.st_size, st.st_mtime_ns)
+                if entry.signature != signature or st.st_size == 0:
+                    # Still changing: check again after another settle period
+                    entry.signature = signature
+                    entry.last_event = now
+                    continue
+                del self._pending[key]
+                self._in_flight.add(key)
+                ready.append((key, entry.group))
+        return ready
+
+    def _dispatch_loop(self):
+        poll = max(0.05, settings.WATCHER_SETTLE_SECONDS / 4)
+        while not self._stop.wait(poll):
+            ready = self._collect_ready()
+            if not ready:
+                continue
+            batch_size = max(1, settings.DEPTH_BATCH_SIZE)
+            for i in range(0, len(ready), batch_size):
+                self._executor.submit(self._run_batch, ready[i:i + batch_size])
+
+    def _run_batch(self, batch: List[Tuple[str, str]]):
+        try:
+            _ingest_and_process(batch)
+        finally:
+            with self._lock:
+                for key, _ in batch:
+                    self._in_flight.discard(key)
+
+
+def _ingest_and_process(batch: List[Tuple[str, str]]):
+    """Ingest a batch of settled files and extract their features together."""
+    db = SessionLocal()
+    try:
+        to_process = []
+        for key, group in batch:
+            file_path = Path(key)
+            try:
+                thumbnail, was_created = ingest_thumbnail(db, file_path, group)
+                if was_created:
+                    logger.info(f"Ingested new thumbnail: {file_path}")
+                else:
+                    if thumbnail.is_stale:
+                        thumbnail.is_stale = False
+                        bump_dataset_version(db)
+                        db.commit()
+                    if (
+                        thumbnail.content_hash is not None
+                        and file_content_hash(file_path) != thumbnail.content_hash
+                    ):
+                        logger.info(f"Thumbnail changed on disk: {file_path}")
+                        mark_files_modified(db, [file_path])
+                        db.refresh(thumbnail)
+                to_process.append(thumbnail)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error ingesting {file_path}: {e}")
+
+        if to_process:
+            # Already-processed thumbnails are skipped by the pipeline
+            stats = process_thumbnails(db, to_process, save_depth_maps=True)
+            if stats["processed"]:
+                logger.info(
+                    f"Processed {stats['processed']} thumbnail(s) in {stats['total_time']}s"
+                )
+            for detail in stats["error_details"]:
+                logger.error(f"Error processing thumbnail {detail['thumbnail_id']}: {detail['error']}")
+    except Exception as e:
+        logger.error(f"Error processing watcher batch: {e}")
+    finally:
+        db.close()
+
+
+def _mark_removed(file_path: Path):
+    db = SessionLocal()
+    try:
+        if mark_files_stale(db, [file_path]):
+            logger.info(f"Thumbnail removed from disk: {file_path}")
+    except Exception as e:
+        logger.error(f"Error marking {file_path} stale: {e}")
+    finally:
+        db.close()
 
 
 class ThumbnailEventHandler(FileSystemEventHandler):
-    """Handle file system events for new thumbnails."""
+    """Feed file system events for thumbnails into the settle queue."""
 
-    def on_created(self, event: FileCreatedEvent):
-        """Handle new file creation events."""
-        if event.is_directory:
-            return
+    def __init__(self, queue: SettleQueue):
+        super().__init__()
+        self._queue = queue
 
-        file_path = Path(event.src_path)
+    def _enqueue(self, path: str):
+        file_path = Path(path)
 
         # Check if it's an image file
         if not is_image_file(file_path):
             return
 
         # Determine group from parent folder
-        group = self._get_group_from_path(file_path)
+        group = _get_group_from_path(file_path)
         if not group:
             logger.warning(f"Could not determine group for: {file_path}")
             return
 
-        logger.info(f"New thumbnail detected: {file_path} (group: {group})")
+        logger.debug(f"Thumbnail event: {file_path} (group: {group})")
+        self._queue.push(file_path, group)
 
-        # Process in a separate thread to avoid blocking the watcher
-        thread = threading.Thread(
-            target=self._ingest_and_process,
-            args=(file_path, group),
-            daemon=True,
-        )
-        thread.start()
+    def _remove(self, path: str):
+        file_path = Path(path)
+        if not is_image_file(file_path):
+            return
+        self._queue.discard(file_path)
+        _mark_removed(file_path)
 
-    def _get_group_from_path(self, file_path: Path) -> Optional[str]:
-        """Extract group name from file path."""
-        # Expected structure: .../thumbnails/{group}/image.jpg
-        try:
-            parent = file_path.parent.name.lower()
-            if parent in settings.VALID_GROUPS:
-                return parent
-        except Exception:
-            pass
-        return None
-
-    def _ingest_and_process(self, file_path: Path, group: str):
-        """Ingest and process a single thumbnail."""
-        db = SessionLocal()
-        try:
-            # Ingest the thumbnail
-            thumbnail, was_created = ingest_thumbnail(db, file_path, group)
-
-            if was_created:
-                logger.info(f"Ingested new thumbnail: {file_path}")
-
-                # Process features
-                result = process_thumbnail(
-                    db,
-                    thumbnail,
-                    force=False,
-                    save_depth_map=True,
-                )
-                logger.info(
-                    f"Processed thumbnail {thumbnail.id}: {result.get('status')}"
-                )
-            else:
-                logger.debug(f"Thumbnail already exists: {file_path}")
+    def on_created(self, event):
+        """Handle new file creation events."""
+        if not event.is_directory:
+            self._enqueue(event.src_path)
 
-        except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
-        finally:
-            db.close()
+    def on_modified(self, event):
+        """Handle writes to existing files (also fired while a file is written)."""
+        if not event.is_directory:
+            self._enqueue(event.src_path)
+
+    def on_moved(self, event):
+        """Treat a move as removal of the source and creation of the destination."""
+        if event.is_directory:
+            return
+        self._remove(event.src_path)
+        self._enqueue(event.dest_path)
+
+    def on_deleted(self, event):
+        """Mark deleted thumbnails stale."""
+        if not event.is_directory:
+            self._remove(event.src_path)
 
 
 def start_watcher():
     """Start the file system watcher."""
-    global _observer
+    global _observer, _queue
 
     with _observer_lock:
         if _observer is not None:
@@ -107,8 +267,11 @@ def start_watcher():
             watch_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created thumbnails directory: {watch_path}")
 
+        _queue = SettleQueue()
+        _queue.start()
+
         _observer = Observer()
-        event_handler = ThumbnailEventHandler()
+        event_handler = ThumbnailEventHandler(_queue)
 
         # Watch the thumbnails directory recursively
         _observer.schedule(event_handler, str(watch_path), recursive=True)
@@ -119,7 +282,7 @@ def start_watcher():
 
 def stop_watcher():
     """Stop the file system watcher."""
-    global _observer
+    global _observer, _queue
 
     with _observer_lock:
         if _observer is None:
@@ -129,4 +292,8 @@ def stop_watcher():
         _observer.join(timeout=5)
         _observer = None
 
+        if _queue is not None:
+            _queue.stop(timeout=5)
+            _queue = None
+
         logger.info("File watcher stopped")
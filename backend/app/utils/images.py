@@ -1,7 +1,8 @@
 """Image loading and processing utilities."""
 
+import hashlib
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional, Union
 
 import cv2
 import numpy as np
@@ -106,6 +107,61 @@ def get_image_dimensions(path: str | Path) -> Optional[Tuple[int, int]]:
         return None
 
 
+def file_content_hash(path: str | Path, chunk_size: int = 1 << 20) -> Optional[str]:
+    """
+    Hash a file's bytes (BLAKE2b, 128-bit hex digest).
+
+    Args:
+        path: Path to the file
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def perceptual_hash(path: str | Path) -> Optional[str]:
+    """
+    64-bit difference hash (dHash) of an image as 16 hex characters.
+
+    The image is reduced to a 9x8 grayscale grid and each bit records
+    whether a cell is brighter than its right neighbour, so re-encodes and
+    resizes of the same picture hash identically or within a few bits.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        Hex string, or None if the image cannot be decoded
+    """
+    # Only a 9x8 grid is needed: let the decoder downscale (JPEG skips most
+    # of the IDCT work at 1/8 scale) and fall back for tiny images
+    gray = cv2.imread(str(path), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if gray is None or gray.shape[0] < 8 or gray.shape[1] < 9:
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    grid = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (grid[:, 1:] > grid[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return f"{value:016x}"
+
+
+def compute_image_hashes(path: str | Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return (content_hash, perceptual_hash) for an image file."""
+    return file_content_hash(path), perceptual_hash(path)
+
+
 def convert_to_hsv(img: np.ndarray) -> np.ndarray:
     """Convert BGR image to HSV color space."""
     return cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
@@ -119,3 +175,88 @@ def convert_to_rgb(img: np.ndarray) -> np.ndarray:
 def get_image_area(img: np.ndarray) -> int:
     """Get the total pixel area of an image."""
     return img.shape[0] * img.shape[1]
+
+
+class ImageContext:
+    """
+    A thumbnail decoded once and shared across feature extractors.
+
+    The file is read and decoded on first access. Resized and color-converted
+    views are derived lazily from that single decode and cached, so every
+    extractor working on the same thumbnail reuses the same arrays.
+
+    Returned arrays are shared between callers and must not be modified
+    in place.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self._bgr: Optional[np.ndarray] = None
+        self._loaded = False
+        self._views: Dict[Tuple[str, Optional[int]], np.ndarray] = {}
+
+    @property
+    def bgr(self) -> Optional[np.ndarray]:
+        """Full-resolution BGR image, or None if the file cannot be decoded."""
+        if not self._loaded:
+            self._bgr = load_image(self.path)
+            self._loaded = True
+        return self._bgr
+
+    def _view(self, kind: str, max_size: Optional[int]) -> Optional[np.ndarray]:
+        key = (kind, max_size)
+        if key in self._views:
+            return self._views[key]
+
+        if kind == "bgr":
+            if max_size is None:
+                return self.bgr
+            base = self.bgr
+            view = resize_for_processing(base, max_size) if base is not None else None
+        else:
+            base = self._view("bgr", max_size)
+            if base is None:
+                view = None
+            elif kind == "rgb":
+                view = convert_to_rgb(base)
+            else:
+                view = convert_to_hsv(base)
+
+        if view is not None:
+            self._views[key] = view
+        return view
+
+    def bgr_at(self, max_size: Optional[int] = None) -> Optional[np.ndarray]:
+        """BGR view with the largest dimension at most max_size."""
+        return self._view("bgr", max_size)
+
+    def rgb_at(self, max_size: Optional[int] = None) -> Optional[np.ndarray]:
+        """RGB view with the largest dimension at most max_size."""
+        return self._view("rgb", max_size)
+
+    def hsv_at(self, max_size: Optional[int] = None) -> Optional[np.ndarray]:
+        """HSV view with the largest dimension at most max_size."""
+        return self._view("hsv", max_size)
+
+    @property
+    def rgb(self) -> Optional[np.ndarray]:
+        """Full-resolution RGB image."""
+        return self.rgb_at(None)
+
+    @property
+    def hsv(self) -> Optional[np.ndarray]:
+        """Full-resolution HSV image."""
+        return self.hsv_at(None)
+
+    def __repr__(self):
+        return f"<ImageContext(path={self.path})>"
+
+
+ImageSource = Union[ImageContext, str, Path]
+
+
+def as_image_context(image: ImageSource) -> ImageContext:
+    """Wrap a path in an ImageContext, passing existing contexts through."""
+    if isinstance(image, ImageContext):
+        return image
+    return ImageContext(image)
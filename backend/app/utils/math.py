@@ -1,6 +1,6 @@
 """Mathematical utilities for feature extraction."""
 
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 import numpy as np
 
 
@@ -54,3 +54,25 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
     if denominator == 0:
         return float(default)
     return float(numerator / denominator)
+
+
+def group_positions(labels: np.ndarray) -> Dict[Any, np.ndarray]:
+    """
+    Row positions for each distinct label, in order of first appearance.
+
+    Args:
+        labels: 1-D array of hashable, sortable labels
+
+    Returns:
+        Dictionary mapping label -> array of row indices
+    """
+    if len(labels) == 0:
+        return {}
+
+    uniq, first, inverse, counts = np.unique(
+        labels, return_index=True, return_inverse=True, return_counts=True
+    )
+    by_label = np.argsort(inverse, kind="stable")
+    splits = np.split(by_label, np.cumsum(counts)[:-1])
+
+    return {uniq[i]: splits[i] for i in np.argsort(first)}
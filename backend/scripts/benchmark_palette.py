@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark dominant-palette backends for speed and fidelity."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.services.palette import PALETTE_BACKENDS, compute_palette, sample_pixels
+from app.utils.images import is_image_file, load_image
+
+
+def _to_lab(colors_bgr: np.ndarray) -> np.ndarray:
+    """Convert BGR float colors (n x 3) to CIELAB."""
+    bgr = np.clip(colors_bgr, 0, 255).astype(np.float32).reshape(-1, 1, 3) / 255.0
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB).reshape(-1, 3)
+
+
+def _quantization_error(pixels_lab: np.ndarray, centers_lab: np.ndarray) -> float:
+    """Mean CIELAB distance from each pixel to its nearest palette color."""
+    distances = np.linalg.norm(pixels_lab[:, None, :] - centers_lab[None, :, :], axis=2)
+    return float(distances.min(axis=1).mean())
+
+
+def _palette_distance(
+    ref_lab: np.ndarray, ref_counts: np.ndarray, lab: np.ndarray
+) -> float:
+    """Frequency-weighted CIELAB distance from reference colors to the nearest candidate."""
+    distances = np.linalg.norm(ref_lab[:, None, :] - lab[None, :, :], axis=2).min(axis=1)
+    weights = ref_counts / max(ref_counts.sum(), 1)
+    return float((distances * weights).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare palette backends against the reference k-means output"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Images or directories (default: the thumbnails directory)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=200,
+        help="Maximum number of images (default: 200)",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=list(PALETTE_BACKENDS),
+        default=list(PALETTE_BACKENDS),
+        help="Backends to benchmark (default: all)",
+    )
+    args = parser.parse_args()
+
+    images = []
+    for root in args.paths or [settings.THUMBNAILS_DIR]:
+        candidates = [root] if root.is_file() else sorted(root.rglob("*"))
+        images.extend(p for p in candidates if is_image_file(p))
+    images = images[:args.limit]
+    if not images:
+        print("No images found")
+        return
+
+    k = settings.COLOR_KMEANS_CLUSTERS
+    backends = [b for b in args.backends if b != "kmeans"]
+    timings = {b: 0.0 for b in ["kmeans"] + backends}
+    quant_error = {b: 0.0 for b in timings}
+    palette_error = {b: 0.0 for b in backends}
+    n = 0
+
+    for path in images:
+        img = load_image(path, max_size=settings.MAX_IMAGE_SIZE)
+        if img is None:
+            continue
+        n += 1
+        pixels_lab = _to_lab(sample_pixels(img, 5000, seed=0))
+
+        start = time.perf_counter()
+        ref_centers, ref_counts = compute_palette(img, k, "kmeans")
+        timings["kmeans"] += time.perf_counter() - start
+        ref_lab = _to_lab(ref_centers)
+        quant_error["kmeans"] += _quantization_error(pixels_lab, ref_lab)
+
+        for backend in backends:
+            start = time.perf_counter()
+            centers, _ = compute_palette(img, k, backend)
+            timings[backend] += time.perf_counter() - start
+            lab = _to_lab(centers)
+            quant_error[backend] += _quantization_error(pixels_lab, lab)
+            palette_error[backend] += _palette_distance(ref_lab, ref_counts, lab)
+
+    if n == 0:
+        print("No readable images")
+        return
+
+    print(f"\nPALETTE BENCHMARK ({n} images, k={k})")
+    print("=" * 68)
+    print(f"{'Backend':<12} {'ms/image':>10} {'speedup':>9} {'quant. error':>13} {'vs kmeans':>11}")
+    for backend in timings:
+        ms = timings[backend] / n * 1000
+        speedup = timings["kmeans"] / timings[backend] if timings[backend] else float("inf")
+        drift = palette_error.get(backend)
+        print(
+            f"{backend:<12} {ms:>10.2f} {speedup:>8.1f}x {quant_error[backend] / n:>13.2f} "
+            f"{(drift / n if drift is not None else 0.0):>11.2f}"
+        )
+    print("\nErrors are mean CIELAB distances (lower is better; ~2.3 is a just-noticeable difference).")
+
+
+if __name__ == "__main__":
+    main()
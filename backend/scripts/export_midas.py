@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""CLI script to package MiDaS_small weights for offline depth extraction.
+
+Run once on a machine with network access; copy the resulting file to
+backend/models/ on air-gapped nodes.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.services.features_depth import _letterbox_batch, _midas_input_shape
+
+# Thumbnail sizes the exported model is checked against: 16:9 (the shape
+# traced), 4:3, and a letterboxed batch mixing both
+VERIFY_SIZES = [(720, 1280), (480, 640)]
+
+
+def _verify(name, run, model, torch, tolerance: float) -> bool:
+    """
+    Compare an exported model against the hub model on non-square inputs.
+
+    Each verification input is letterboxed exactly as predict_depth_maps
+    does, so a trace that baked in the example shape shows up here.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    inputs = [
+        rng.standard_normal((3, *_midas_input_shape(h, w))).astype(np.float32)
+        for h, w in VERIFY_SIZES
+    ]
+    batches = [_letterbox_batch([x]) for x in inputs] + [_letterbox_batch(inputs)]
+
+    ok = True
+    for batch in batches:
+        with torch.no_grad():
+            expected = model(torch.from_numpy(batch)).numpy()
+        actual = np.asarray(run(batch))
+        if actual.shape != expected.shape:
+            print(f"  {name} {batch.shape}: output shape {actual.shape} != {expected.shape}")
+            ok = False
+            continue
+        scale = max(float(np.abs(expected).max()), 1e-6)
+        diff = float(np.abs(actual - expected).max()) / scale
+        status = "ok" if diff <= tolerance else "MISMATCH"
+        print(f"  {name} {tuple(batch.shape)}: max relative diff {diff:.2e} {status}")
+        ok = ok and diff <= tolerance
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export MiDaS_small to TorchScript (and optionally ONNX)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=str(settings.DEPTH_MODEL_PATH.with_suffix(".pt")),
+        help="TorchScript output path (default: backend/models/midas_small.pt)",
+    )
+    parser.add_argument(
+        "--onnx",
+        action="store_true",
+        help="Also export an ONNX model next to the TorchScript file",
+    )
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=17,
+        help="ONNX opset version (default: 17)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1e-3,
+        help="Maximum relative difference from the hub model (default: 1e-3)",
+    )
+
+    args = parser.parse_args()
+
+    import torch
+
+    print("Loading MiDaS_small from torch.hub...")
+    model = torch.hub.load("intel-isl/MiDaS", "MiDaS_small", trust_repo=True)
+    model.eval()
+
+    # Trace at the letterboxed shape predict_depth_maps feeds for 16:9
+    # thumbnails rather than a square input
+    example = torch.randn(1, 3, *_midas_input_shape(*VERIFY_SIZES[0]))
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Tracing TorchScript model at {tuple(example.shape)} -> {output_path}")
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+
+    print("Verifying TorchScript output against the hub model...")
+    if not _verify(
+        "torchscript",
+        lambda batch: traced(torch.from_numpy(batch)).detach().numpy(),
+        model,
+        torch,
+        args.tolerance,
+    ):
+        print("TorchScript export does not match the hub model; not saving it.")
+        sys.exit(1)
+    traced.save(str(output_path))
+
+    if args.onnx:
+        onnx_path = output_path.with_suffix(".onnx")
+        print(f"Exporting ONNX model -> {onnx_path}")
+        torch.onnx.export(
+            model,
+            example,
+            str(onnx_path),
+            input_names=["input"],
+            output_names=["depth"],
+            dynamic_axes={
+                "input": {0: "batch", 2: "height", 3: "width"},
+                "depth": {0: "batch", 1: "height", 2: "width"},
+            },
+            opset_version=args.opset,
+        )
+
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            print("onnxruntime not installed; skipping ONNX verification.")
+        else:
+            print("Verifying ONNX output against the hub model...")
+            session = ort.InferenceSession(
+                str(onnx_path), providers=["CPUExecutionProvider"]
+            )
+            input_name = session.get_inputs()[0].name
+            if not _verify(
+                "onnx",
+                lambda batch: session.run(None, {input_name: batch})[0],
+                model,
+                torch,
+                args.tolerance,
+            ):
+                onnx_path.unlink()
+                print("ONNX export does not match the hub model; removed it.")
+                sys.exit(1)
+        print("Set DEPTH_MODEL_PATH to the .onnx file to use onnxruntime.")
+
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import argparse
 import csv
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -12,7 +13,70 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.core.config import settings
 from app.core.db import init_db, SessionLocal
-from app.services.ingest import ingest_all_groups, ingest_directory, ingest_thumbnail
+from app.services.ingest import (
+    backfill_image_hashes,
+    extract_metadata_from_path,
+    ingest_all_groups,
+    ingest_directory,
+    upsert_thumbnail_rows,
+)
+
+
+class _DirectoryListingCache:
+    """Answer file-existence checks from one os.listdir per directory."""
+
+    def __init__(self):
+        self._listings = {}
+
+    def exists(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        if directory not in self._listings:
+            try:
+                self._listings[directory] = set(os.listdir(directory))
+            except OSError:
+                self._listings[directory] = set()
+        return name in self._listings[directory]
+
+
+def _row_to_metadata(row: dict) -> dict:
+    """Build thumbnail metadata from one CSV row."""
+    metadata = {
+        "channel": row.get("channel") or None,
+        "title": row.get("title") or None,
+        "url": f"https://youtube.com/watch?v={row['video_id']}" if row.get("video_id") else None,
+    }
+
+    # Parse views
+    views_str = row.get("views", "")
+    if views_str:
+        try:
+            metadata["views"] = int(views_str)
+        except ValueError:
+            pass
+
+    # Parse publish_date
+    publish_str = row.get("publish_date", "")
+    if publish_str:
+        try:
+            metadata["publish_date"] = datetime.fromisoformat(
+                publish_str.replace("Z", "+00:00")
+            )
+            metadata["year"] = metadata["publish_date"].year
+        except ValueError:
+            pass
+
+    return metadata
+
+
+def _iter_chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
 def ingest_from_csv(db, csv_path: Path, force: bool = False) -> dict:
@@ -21,6 +85,9 @@ def ingest_from_csv(db, csv_path: Path, force: bool = False) -> dict:
     CSV expected columns: file_path, channel, title, video_id, views,
     publish_date, duration, group
 
+    The CSV is streamed in chunks of settings.INGEST_BATCH_SIZE rows; each
+    chunk is upserted with a single statement and committed once.
+
     Args:
         db: Database session
         csv_path: Path to the CSV file
@@ -37,72 +104,49 @@ def ingest_from_csv(db, csv_path: Path, force: bool = False) -> dict:
         "errors": 0,
         "error_files": [],
     }
+    listing = _DirectoryListingCache()
 
     with open(csv_path, "r") as f:
         reader = csv.DictReader(f)
-        for row in reader:
-            stats["total_found"] += 1
-
-            file_path = Path(row.get("file_path", ""))
-            if not file_path.exists():
-                stats["errors"] += 1
-                stats["error_files"].append({
-                    "path": str(file_path),
-                    "error": "File not found",
-                })
-                continue
-
-            group = row.get("group", "")
-            if not group:
-                stats["errors"] += 1
-                stats["error_files"].append({
-                    "path": str(file_path),
-                    "error": "Missing group",
-                })
-                continue
-
-            # Build metadata from CSV columns
-            metadata = {
-                "channel": row.get("channel") or None,
-                "title": row.get("title") or None,
-                "url": f"https://youtube.com/watch?v={row['video_id']}" if row.get("video_id") else None,
-            }
-
-            # Parse views
-            views_str = row.get("views", "")
-            if views_str:
-                try:
-                    metadata["views"] = int(views_str)
-                except ValueError:
-                    pass
-
-            # Parse publish_date
-            publish_str = row.get("publish_date", "")
-            if publish_str:
-                try:
-                    metadata["publish_date"] = datetime.fromisoformat(
-                        publish_str.replace("Z", "+00:00")
-                    )
-                    metadata["year"] = metadata["publish_date"].year
-                except ValueError:
-                    pass
+        for chunk in _iter_chunks(reader, settings.INGEST_BATCH_SIZE):
+            rows = []
+            for row in chunk:
+                stats["total_found"] += 1
+
+                file_path = os.path.abspath(row.get("file_path", ""))
+                if not listing.exists(file_path):
+                    stats["errors"] += 1
+                    stats["error_files"].append({
+                        "path": row.get("file_path", ""),
+                        "error": "File not found",
+                    })
+                    continue
+
+                group = row.get("group", "")
+                if not group:
+                    stats["errors"] += 1
+                    stats["error_files"].append({
+                        "path": file_path,
+                        "error": "Missing group",
+                    })
+                    continue
+
+                # Path-derived metadata, overridden by CSV values
+                metadata = extract_metadata_from_path(Path(file_path), group)
+                metadata.update({k: v for k, v in _row_to_metadata(row).items() if v is not None})
+                rows.append(metadata)
 
             try:
-                thumbnail, was_created = ingest_thumbnail(
-                    db, file_path, group, metadata=metadata, force=force,
-                )
-                if was_created:
-                    stats["created"] += 1
-                elif force:
-                    stats["updated"] += 1
-                else:
-                    stats["skipped"] += 1
+                created, updated, skipped = upsert_thumbnail_rows(db, rows, force=force)
+                stats["created"] += created
+                stats["updated"] += updated
+                stats["skipped"] += skipped
             except Exception as e:
-                stats["errors"] += 1
-                stats["error_files"].append({
-                    "path": str(file_path),
-                    "error": str(e),
-                })
+                db.rollback()
+                stats["errors"] += len(rows)
+                stats["error_files"].extend(
+                    {"path": row["file_path"], "error": str(e)} for row in rows
+                )
 
     return stats
 
@@ -128,6 +172,11 @@ def main():
         action="store_true",
         help="Force update existing records",
     )
+    parser.add_argument(
+        "--hashes",
+        action="store_true",
+        help="Compute missing content/perceptual hashes for existing thumbnails",
+    )
     parser.add_argument(
         "--from-csv",
         type=str,
@@ -143,6 +192,11 @@ def main():
 
     db = SessionLocal()
     try:
+        if args.hashes:
+            print("Computing missing image hashes...")
+            print(f"  Hashed: {backfill_image_hashes(db)}")
+            return
+
         if args.csv_path:
             # CSV-based ingestion
             csv_path = Path(args.csv_path)
@@ -208,6 +262,8 @@ def main():
                 print(f"  Found:   {stats['total_found']}")
                 print(f"  Created: {stats['created']}")
                 print(f"  Skipped: {stats['skipped']}")
+                print(f"  Changed: {stats.get('modified', 0)}")
+                print(f"  Removed: {stats.get('removed', 0)}")
                 print(f"  Errors:  {stats['errors']}")
 
                 if stats.get("warning"):
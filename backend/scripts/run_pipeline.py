@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from app.core.config import settings
 from app.core.db import init_db, SessionLocal
 from app.services.pipeline import run_pipeline, get_pipeline_status, ALL_FEATURES
+from app.services import model_registry
 
 
 def main():
@@ -45,6 +46,12 @@ def main():
         action="store_true",
         help="Save depth map visualizations to outputs/depth_maps/",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of parallel extraction processes (default: 1)",
+    )
     parser.add_argument(
         "--status",
         action="store_true",
@@ -80,6 +87,7 @@ def main():
         print(f"Force:          {args.force}")
         print(f"Limit:          {args.limit or 'none'}")
         print(f"Save depth maps: {args.save_depth_maps}")
+        print(f"Workers:        {args.workers}")
         print()
 
         # Run pipeline
@@ -90,6 +98,7 @@ def main():
             force=args.force,
             limit=args.limit,
             save_depth_maps=args.save_depth_maps,
+            workers=args.workers,
         )
 
         # Print results
@@ -116,6 +125,7 @@ def main():
 
     finally:
         db.close()
+        model_registry.close_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the backend package importable."""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,189 @@
+"""Vectorized likeness scoring must match the original per-row scorers."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from app.models.features import NUMERIC_FEATURE_PATHS, resolve_feature_value
+from app.services.feature_store import FeatureSnapshot
+from app.services.likeness import derive_feature_weights, score_thumbnails
+
+
+# (group, channel, features) rows covering thresholds, gaps and empty blobs
+FIXTURE = [
+    ("mrbeast", "MrBeast", {
+        "color": {"avg_brightness": 0.72},
+        "face": {
+            "face_count": 2,
+            "largest_face_area_ratio": 0.12,
+            "emotion_proxies": {"smile_score": 0.8, "mouth_open_score": 0.4, "brow_raise_score": 0.35},
+        },
+        "text": {"text_area_ratio": 0.001},
+        "pose": {"body_coverage": 0.5},
+        "title": {
+            "word_count": 6, "char_count": 38, "has_number": True, "has_large_number": True,
+            "has_money_reference": True, "first_person": True, "has_superlative": False,
+            "has_challenge_framing": True, "avg_word_length": 4.2,
+        },
+    }),
+    ("mrbeast", "MrBeast", {
+        # Exactly on every threshold
+        "color": {"avg_brightness": 0.60},
+        "face": {
+            "face_count": 1,
+            "largest_face_area_ratio": 0.06,
+            "emotion_proxies": {"smile_score": 0.40, "mouth_open_score": 0.15, "brow_raise_score": 0.30},
+        },
+        "text": {"text_area_ratio": 0.005},
+        "pose": {"body_coverage": 0.30},
+        "title": {"word_count": 8, "char_count": 50, "avg_word_length": 5.0},
+    }),
+    ("2019", "MKBHD", {
+        "color": {"avg_brightness": 0.41},
+        "face": {"face_count": 0, "largest_face_area_ratio": 0.0},
+        "text": {"text_area_ratio": 0.2},
+        "title": {"word_count": 12, "char_count": 71, "has_number": False, "avg_word_length": 6.1},
+    }),
+    ("2019", "MKBHD", {
+        # Only some categories were extracted
+        "color": {"avg_brightness": 0.65},
+        "pose": {"body_coverage": 0.1},
+    }),
+    ("2021", "Veritasium", {
+        "face": {"face_count": 1, "emotion_proxies": {"smile_score": 0.2}},
+        "text": {},
+        "title": {},
+    }),
+    ("2021", "Veritasium", {}),
+]
+
+
+def _baseline_thumbnail_score(f: dict) -> int:
+    score = 0
+    if f.get("color", {}).get("avg_brightness", 0) >= 0.60:
+        score += 1
+    if f.get("face", {}).get("face_count", 0) >= 1:
+        score += 1
+    if f.get("text", {}).get("text_area_ratio", 1) <= 0.005:
+        score += 1
+    if f.get("face", {}).get("emotion_proxies", {}).get("smile_score", 0) >= 0.40:
+        score += 1
+    if f.get("face", {}).get("emotion_proxies", {}).get("mouth_open_score", 0) >= 0.15:
+        score += 1
+    if f.get("pose", {}).get("body_coverage", 0) >= 0.30:
+        score += 1
+    if f.get("face", {}).get("emotion_proxies", {}).get("brow_raise_score", 0) >= 0.30:
+        score += 1
+    if f.get("face", {}).get("largest_face_area_ratio", 0) >= 0.06:
+        score += 1
+    return score
+
+
+def _baseline_title_score(f: dict) -> int:
+    title = f.get("title", {})
+    if not title:
+        return 0
+    score = 0
+    if title.get("word_count", 99) <= 8:
+        score += 1
+    if title.get("char_count", 999) <= 50:
+        score += 1
+    for flag in ("has_number", "has_large_number", "has_money_reference",
+                 "first_person", "has_superlative", "has_challenge_framing"):
+        if title.get(flag, False):
+            score += 1
+    if title.get("avg_word_length", 99) <= 5.0:
+        score += 1
+    return score
+
+
+_BASELINE_CRITERIA = [
+    ("avg_brightness", lambda f: f.get("color", {}).get("avg_brightness", 0), ">=", 0.60),
+    ("face_count", lambda f: f.get("face", {}).get("face_count", 0), ">=", 1),
+    ("text_area_ratio", lambda f: f.get("text", {}).get("text_area_ratio", 1), "<=", 0.005),
+    ("smile_score", lambda f: f.get("face", {}).get("emotion_proxies", {}).get("smile_score", 0), ">=", 0.40),
+    ("mouth_open_score", lambda f: f.get("face", {}).get("emotion_proxies", {}).get("mouth_open_score", 0), ">=", 0.15),
+    ("body_coverage", lambda f: f.get("pose", {}).get("body_coverage", 0), ">=", 0.30),
+    ("brow_raise_score", lambda f: f.get("face", {}).get("emotion_proxies", {}).get("brow_raise_score", 0), ">=", 0.30),
+    ("largest_face_area_ratio", lambda f: f.get("face", {}).get("largest_face_area_ratio", 0), ">=", 0.06),
+]
+
+
+def _baseline_weights(rows) -> dict:
+    weights = {}
+    for name, extract, _, _ in _BASELINE_CRITERIA:
+        mb = [float(extract(f)) for group, _, f in rows if group == "mrbeast"] or [0.0]
+        pa = [float(extract(f)) for group, _, f in rows if group != "mrbeast"] or [0.0]
+        pa_std = float(np.std(pa)) if len(pa) > 1 else 1.0
+        pa_std = max(pa_std, 1e-6)
+        weights[name] = round(abs(float(np.mean(mb)) - float(np.mean(pa))) / pa_std, 4)
+    return weights
+
+
+def _baseline_weighted_score(f: dict, weights: dict) -> float:
+    score = 0.0
+    for name, extract, op, threshold in _BASELINE_CRITERIA:
+        value = float(extract(f))
+        if (value >= threshold) if op == ">=" else (value <= threshold):
+            score += weights.get(name, 1.0)
+    return score
+
+
+def _snapshot(rows) -> FeatureSnapshot:
+    def column(path):
+        values = [resolve_feature_value(f, path) for _, _, f in rows]
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+    return FeatureSnapshot(
+        ids=np.arange(1, len(rows) + 1, dtype=np.int64),
+        groups=np.array([group for group, _, _ in rows], dtype=object),
+        channels=np.array([channel for _, channel, _ in rows], dtype=object),
+        years=np.full(len(rows), np.nan),
+        views=np.full(len(rows), np.nan),
+        ctr=np.full(len(rows), np.nan),
+        extracted=np.ones(len(rows), dtype=bool),
+        columns={path: column(path) for path in NUMERIC_FEATURE_PATHS},
+    )
+
+
+@pytest.fixture
+def snapshot():
+    return _snapshot(FIXTURE)
+
+
+def test_scores_match_per_row_baseline(snapshot):
+    scores = score_thumbnails(snapshot, np.ones(len(snapshot), dtype=bool))
+
+    assert scores.thumbnail.tolist() == [_baseline_thumbnail_score(f) for _, _, f in FIXTURE]
+    assert scores.title.tolist() == [_baseline_title_score(f) for _, _, f in FIXTURE]
+    assert scores.combined.tolist() == [
+        _baseline_thumbnail_score(f) + _baseline_title_score(f) for _, _, f in FIXTURE
+    ]
+    assert scores.weighted is None
+
+
+def test_on_threshold_values_pass(snapshot):
+    scores = score_thumbnails(snapshot, np.ones(len(snapshot), dtype=bool))
+    assert scores.thumbnail[1] == 8
+
+
+def test_mask_selects_rows(snapshot):
+    mask = snapshot.groups != "mrbeast"
+    scores = score_thumbnails(snapshot, mask)
+
+    selected = [row for row in FIXTURE if row[0] != "mrbeast"]
+    assert scores.ids.tolist() == snapshot.ids[mask].tolist()
+    assert scores.channels.tolist() == [channel for _, channel, _ in selected]
+    assert scores.thumbnail.tolist() == [_baseline_thumbnail_score(f) for _, _, f in selected]
+
+
+def test_weights_and_weighted_scores_match_baseline(snapshot):
+    mask = np.ones(len(snapshot), dtype=bool)
+    weights = derive_feature_weights(snapshot, mask)
+    assert weights == pytest.approx(_baseline_weights(FIXTURE))
+
+    scores = score_thumbnails(snapshot, mask, weights=weights)
+    expected = [_baseline_weighted_score(f, weights) for _, _, f in FIXTURE]
+    assert scores.weighted.tolist() == pytest.approx(expected)
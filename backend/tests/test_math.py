@@ -0,0 +1,43 @@
+"""Tests for app.utils.math helpers."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.utils.math import group_positions
+
+
+def _baseline(labels):
+    """Dict-of-lists grouping, as the per-row loops did it."""
+    grouped = {}
+    for i, label in enumerate(labels):
+        grouped.setdefault(label, []).append(i)
+    return grouped
+
+
+@pytest.mark.parametrize("labels", [
+    np.array(["2019", "mrbeast", "2019", "2021", "mrbeast", "2019"], dtype=object),
+    np.array(["MKBHD", "Veritasium", "MrBeast", "MKBHD"], dtype=object),
+    np.array([3, 1, 3, 2, 1, 1, 3]),
+    np.array(["only"] * 4, dtype=object),
+    np.array(["single"], dtype=object),
+])
+def test_group_positions_matches_baseline(labels):
+    result = group_positions(labels)
+    expected = _baseline(labels.tolist())
+
+    # Same labels, in order of first appearance, with the same row indices
+    assert list(result) == list(expected)
+    assert {label: rows.tolist() for label, rows in result.items()} == expected
+
+
+def test_group_positions_indexes_parallel_arrays():
+    labels = np.array(["b", "a", "b", "a"], dtype=object)
+    values = np.array([10.0, 20.0, 30.0, 40.0])
+
+    grouped = {label: values[rows].tolist() for label, rows in group_positions(labels).items()}
+    assert grouped == {"b": [10.0, 30.0], "a": [20.0, 40.0]}
+
+
+def test_group_positions_empty():
+    assert group_positions(np.array([], dtype=object)) == {}
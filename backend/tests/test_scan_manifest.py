@@ -0,0 +1,148 @@
+"""Tests for incremental directory scans against the scan manifest."""
+
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("PIL")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+pytest.importorskip("pydantic_settings")
+
+from app.services.scan_manifest import ScanManifest, state_files, state_hashes
+from app.utils.images import file_content_hash
+
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def _touch_dir(path):
+    """Move a directory's mtime forward so coarse timestamps cannot hide a change."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "thumbs"
+    _write(root / "a.jpg", b"a" * 10)
+    _write(root / "b.png", b"b" * 20)
+    _write(root / "notes.txt", b"not an image")
+    _write(root / "sub" / "c.jpg", b"c" * 30)
+    return root.resolve()
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return ScanManifest(tmp_path / "manifest.json")
+
+
+def _scan_and_commit(manifest, root, **kwargs):
+    result, state = manifest.scan("g", root, **kwargs)
+    manifest.commit("g", state)
+    return result, state
+
+
+def test_first_scan_adds_every_image(manifest, tree):
+    result, state = manifest.scan("g", tree)
+
+    expected = [tree / "a.jpg", tree / "b.png", tree / "sub" / "c.jpg"]
+    assert result.added == expected
+    assert result.modified == [] and result.removed == []
+    assert result.total_found == 3
+    assert state_files(state) == expected
+    assert state_hashes(state)[str(tree / "a.jpg")] == file_content_hash(tree / "a.jpg")
+
+
+def test_scan_without_commit_changes_nothing(manifest, tree):
+    manifest.scan("g", tree)
+    result, _ = manifest.scan("g", tree)
+    assert len(result.added) == 3
+    assert manifest.file_count("g") == 0
+
+
+def test_unchanged_tree_has_no_changes(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    result, _ = manifest.scan("g", tree)
+    assert not result.changed
+    assert result.total_found == 3
+
+
+def test_added_file(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    _write(tree / "sub" / "d.jpg", b"d" * 5)
+    _touch_dir(tree / "sub")
+
+    result, _ = manifest.scan("g", tree)
+    assert result.added == [tree / "sub" / "d.jpg"]
+    assert result.modified == [] and result.removed == []
+    assert result.total_found == 4
+
+
+def test_modified_file_needs_new_content(manifest, tree):
+    _scan_and_commit(manifest, tree)
+
+    # New mtime, same bytes: not a modification
+    st = os.stat(tree / "a.jpg")
+    os.utime(tree / "a.jpg", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    # New bytes
+    _write(tree / "b.png", b"B" * 25)
+
+    result, _ = manifest.scan("g", tree, verify=True)
+    assert result.modified == [tree / "b.png"]
+    assert result.added == [] and result.removed == []
+
+
+def test_in_place_rewrite_needs_verify(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    dir_stat = os.stat(tree)
+    _write(tree / "a.jpg", b"z" * 11)
+    os.utime(tree, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    assert not manifest.scan("g", tree)[0].changed
+    assert manifest.scan("g", tree, verify=True)[0].modified == [tree / "a.jpg"]
+
+
+def test_removed_file_and_directory(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    (tree / "a.jpg").unlink()
+    (tree / "sub" / "c.jpg").unlink()
+    (tree / "sub").rmdir()
+    _touch_dir(tree)
+
+    result, state = manifest.scan("g", tree)
+    assert result.removed == [tree / "a.jpg", tree / "sub" / "c.jpg"]
+    assert result.added == [] and result.modified == []
+    assert state_files(state) == [tree / "b.png"]
+
+
+def test_save_and_reload(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    manifest.bind_database("db-1")
+    manifest.save()
+
+    reloaded = ScanManifest(manifest.path)
+    assert reloaded.file_count("g") == 3
+    assert not reloaded.scan("g", tree)[0].changed
+
+
+def test_other_database_forgets_groups(manifest, tree):
+    manifest.bind_database("db-1")
+    _scan_and_commit(manifest, tree)
+
+    manifest.bind_database("db-1")
+    assert manifest.file_count("g") == 3
+
+    manifest.bind_database("db-2")
+    assert manifest.file_count("g") == 0
+    assert len(manifest.scan("g", tree)[0].added) == 3
+
+
+def test_forget_forces_full_scan(manifest, tree):
+    _scan_and_commit(manifest, tree)
+    manifest.forget("g")
+    assert len(manifest.scan("g", tree)[0].added) == 3
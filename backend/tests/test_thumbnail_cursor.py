@@ -0,0 +1,116 @@
+"""Tests for keyset (cursor) pagination of the thumbnail list."""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+pytest.importorskip("pydantic_settings")
+
+from fastapi import HTTPException
+from sqlalchemy import asc, create_engine, desc
+from sqlalchemy.orm import sessionmaker
+
+from app.api.thumbnails import _decode_cursor, _encode_cursor, _keyset_condition
+from app.core.db import Base
+from app.models.thumbnail import Thumbnail
+
+
+# Years with NULLs and ties, in insertion (id) order
+YEARS = [2020, None, 2019, 2020, None, 2021, 2019, None]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    for i, year in enumerate(YEARS):
+        session.add(Thumbnail(group="2020", file_path=f"/thumbs/{i}.jpg", year=year))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _paginate(db, descending: bool, page_size: int):
+    """Walk every page through encoded cursors, returning the ids seen."""
+    direction = desc if descending else asc
+    order = "desc" if descending else "asc"
+    ids = []
+    cursor = None
+    while True:
+        query = db.query(Thumbnail).order_by(direction(Thumbnail.year), direction(Thumbnail.id))
+        if cursor is not None:
+            value, last_id = _decode_cursor(cursor, "year", order)
+            query = query.filter(_keyset_condition(Thumbnail.year, descending, value, last_id))
+        page = query.limit(page_size).all()
+        if not page:
+            return ids
+        ids.extend(thumb.id for thumb in page)
+        cursor = _encode_cursor("year", order, page[-1].year, page[-1].id)
+
+
+@pytest.mark.parametrize("value", [2020, 0.125, "MrBeast", None, datetime(2021, 3, 4, 5, 6, 7)])
+def test_cursor_round_trip(value):
+    cursor = _encode_cursor("year", "desc", value, 42)
+    assert _decode_cursor(cursor, "year", "desc") == (value, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = _encode_cursor("title", "asc", "?&/+= " * 5, 7)
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+def test_cursor_rejects_other_sort_order():
+    cursor = _encode_cursor("year", "asc", 2020, 1)
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor, "year", "desc")
+    assert exc_info.value.status_code == 400
+
+
+def _raw_cursor(payload) -> str:
+    raw = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    "",
+    "W10",
+    _raw_cursor(["year", "asc", None, 1, None]),
+    _raw_cursor(["year", "asc", None, 1, "x"]),
+    _raw_cursor(["year", "asc", None, 1, 2.5]),
+    _raw_cursor(["year", "asc", "blob", 1, 3]),
+    _raw_cursor(["year", "asc", "dt", "not a date", 3]),
+])
+def test_cursor_rejects_garbage(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor, "year", "asc")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("page_size", [1, 2, 3, len(YEARS)])
+def test_keyset_pages_match_full_ordering_with_nulls(db, descending, page_size):
+    direction = desc if descending else asc
+    expected = [
+        thumb.id
+        for thumb in db.query(Thumbnail).order_by(direction(Thumbnail.year), direction(Thumbnail.id))
+    ]
+    assert _paginate(db, descending, page_size) == expected
+
+
+def test_keyset_after_null_boundary(db):
+    # Ascending, NULLs sort first: after the last NULL row come all non-NULL rows
+    last_null_id = max(i + 1 for i, year in enumerate(YEARS) if year is None)
+    rows = db.query(Thumbnail).filter(
+        _keyset_condition(Thumbnail.year, False, None, last_null_id)
+    ).all()
+    assert {thumb.id for thumb in rows} == {i + 1 for i, year in enumerate(YEARS) if year is not None}
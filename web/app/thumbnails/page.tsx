@@ -44,7 +44,7 @@ export default function ThumbnailsPage() {
 
         const response = await getThumbnails(params as Parameters<typeof getThumbnails>[0])
         setThumbnails(response.items)
-        setTotal(response.total)
+        setTotal(response.total ?? 0)
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to fetch data')
       } finally {
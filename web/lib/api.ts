@@ -7,6 +7,7 @@ import type {
   ClusterPoint,
   ClusteringResult,
   PipelineStatus,
+  PipelineJob,
   MrBeastSimilarityResponse,
   TitleLikenessResponse,
   CombinedLikenessResponse,
@@ -44,6 +45,9 @@ export async function getThumbnails(params?: {
   order?: 'asc' | 'desc';
   page?: number;
   page_size?: number;
+  pagination?: 'offset' | 'cursor';
+  cursor?: string;
+  include_total?: boolean;
 }): Promise<ThumbnailListResponse> {
   const searchParams = new URLSearchParams();
   if (params) {
@@ -70,13 +74,25 @@ export async function runPipeline(params?: {
   features?: string[];
   force?: boolean;
   limit?: number;
-}): Promise<{ status: string; stats: Record<string, number> }> {
+}): Promise<{ status: string; job: PipelineJob }> {
   return fetchAPI('/thumbnails/pipeline/run', {
     method: 'POST',
     body: JSON.stringify(params || {}),
   });
 }
 
+export async function getPipelineJob(id: number): Promise<PipelineJob> {
+  return fetchAPI<PipelineJob>(`/thumbnails/pipeline/jobs/${id}`);
+}
+
+export async function cancelPipelineJob(id: number): Promise<PipelineJob> {
+  return fetchAPI<PipelineJob>(`/thumbnails/pipeline/jobs/${id}/cancel`, { method: 'POST' });
+}
+
+export async function resumePipelineJob(id: number): Promise<PipelineJob> {
+  return fetchAPI<PipelineJob>(`/thumbnails/pipeline/jobs/${id}/resume`, { method: 'POST' });
+}
+
 export async function ingestThumbnails(force = false): Promise<{ status: string; results: Record<string, unknown> }> {
   return fetchAPI(`/thumbnails/ingest?force=${force}`, {
     method: 'POST',
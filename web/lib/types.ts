@@ -60,15 +60,28 @@ export interface TextFeatures {
   detected_text?: string[];
 }
 
+export interface EmotionProxies {
+  smile_score: number;
+  mouth_open_score: number;
+  brow_raise_score: number;
+}
+
+export interface FaceDetail {
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+  area_ratio: number;
+  confidence: number;
+  emotion_proxies: EmotionProxies | null;
+}
+
 export interface FaceFeatures {
   face_count: number;
   largest_face_area_ratio: number;
   avg_face_area_ratio: number;
-  emotion_proxies: {
-    smile_score: number;
-    mouth_open_score: number;
-    brow_raise_score: number;
-  };
+  emotion_proxies: EmotionProxies;
+  faces?: FaceDetail[];
 }
 
 export interface PoseFeatures {
@@ -91,9 +104,10 @@ export interface DepthFeatures {
 // API Response types
 export interface ThumbnailListResponse {
   items: Thumbnail[];
-  total: number;
+  total: number | null;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface OverviewStats {
@@ -167,6 +181,24 @@ export interface PipelineStatus {
   completion_percentage: number;
 }
 
+export interface PipelineJob {
+  id: number;
+  state: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled' | 'interrupted';
+  params: Record<string, unknown>;
+  total: number;
+  processed: number;
+  skipped: number;
+  reused: number;
+  errors: number;
+  error_details: { thumbnail_id?: number; error: string }[];
+  last_thumbnail_id: number;
+  progress_percentage: number;
+  elapsed_seconds: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface MrBeastSimilarityResponse {
   feature_names: string[];
   mrbeast_centroid: Record<string, number>;